@@ -1,19 +1,42 @@
-from fastapi import APIRouter, HTTPException, Query, Header
-from typing import List, Optional
-from datetime import date
+from fastapi import APIRouter, HTTPException, Query, Header, Depends, Request, Response
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import date, datetime, timezone
+from urllib.parse import urlencode
 import logging
 from app.services.session_manager import session_manager
-from app.models.chart import BurnChartResponse, ChartDataModel
-from app.utils.issue_filters import apply_unified_filters, apply_scope_filters
-from app.utils.shared_filters import apply_advanced_filters, sort_issues
+from app.models.chart import (
+    BatchChartRequest,
+    BatchChartResponse,
+    BurnChartResponse,
+    ChartColumnsModel,
+    ChartImageTokenResponse,
+    ChartSeriesModel,
+    CumulativeFlowResponse,
+    CumulativeFlowSeriesModel,
+    DashboardChartResponse,
+    FlowTimeResponse,
+    ForecastResponse,
+    MilestoneChartModel,
+    MilestoneChartResponse,
+    PeriodChartModel,
+    ScopeChangeColumnsModel,
+    ScopeChangeModel
+)
+from app.models.issue import IssueModel
+from app.utils.issue_filters import apply_chart_filters
+from app.utils.issue_query import IssueQuery, execute_issue_query
+from app.utils.chart_sampling import GRANULARITIES, resolve_granularity
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.get("/burn-down", response_model=BurnChartResponse)
-async def get_burn_down_data(
-    start_date: date = Query(...),
-    end_date: date = Query(...),
+# チャートデータのレスポンス形式（rows: ChartDataModelのリスト / columnar: 列形式）
+CHART_FORMATS = ['rows', 'columnar']
+
+# 複数期間チャートで一度に指定できる期間数の上限
+MAX_BATCH_PERIODS = 20
+
+def chart_filter_params(
     milestone: Optional[str] = Query(None),
     service: Optional[str] = Query(None),
     assignee: Optional[str] = Query(None),
@@ -26,10 +49,53 @@ async def get_burn_down_data(
     created_after: Optional[date] = Query(None),
     created_before: Optional[date] = Query(None),
     completed_after: Optional[date] = Query(None),
-    completed_before: Optional[date] = Query(None),
-    x_session_id: Optional[str] = Header(None)
-):
-    """Burn-downチャートデータ取得"""
+    completed_before: Optional[date] = Query(None)
+) -> Dict[str, Any]:
+    """チャート共通のフィルタパラメータ（apply_advanced_filtersの引数形式）"""
+    return {
+        'min_point': point_min,
+        'max_point': point_max,
+        'search': search,
+        'kanban_status': kanban_status,
+        'is_epic': is_epic,
+        'state': state,
+        'created_after': created_after,
+        'created_before': created_before,
+        'completed_after': completed_after,
+        'completed_before': completed_before,
+        'assignee': assignee,
+        'service': service,
+        'milestone': milestone
+    }
+
+def chart_sampling_params(
+    granularity: str = Query('day', description="出力粒度（day / week / month / auto）"),
+    max_points: Optional[int] = Query(None, ge=3, le=10000, description="最大点数（超える場合は形状を保って間引く）")
+) -> Dict[str, Any]:
+    """チャート系列の粒度・間引きパラメータ"""
+    if granularity not in GRANULARITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"granularityには {', '.join(GRANULARITIES)} のいずれかを指定してください"
+        )
+    return {
+        'granularity': granularity,
+        'max_points': max_points
+    }
+
+def chart_format_param(
+    format: str = Query('rows', description="レスポンス形式（rows / columnar）")
+) -> str:
+    """チャートデータのレスポンス形式パラメータ"""
+    if format not in CHART_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"formatには {', '.join(CHART_FORMATS)} のいずれかを指定してください"
+        )
+    return format
+
+def _get_session_client(x_session_id: Optional[str]):
+    """セッションIDからGitLabクライアントを取得"""
     if not x_session_id:
         raise HTTPException(status_code=401, detail="セッションIDが必要です")
     
@@ -37,94 +103,322 @@ async def get_burn_down_data(
     if not gitlab_client:
         raise HTTPException(status_code=404, detail="セッションが見つかりません")
     
+    return gitlab_client
+
+def _validate_period(start_date: date, end_date: date) -> None:
+    """チャート期間の検証"""
     if start_date >= end_date:
         raise HTTPException(
             status_code=400,
             detail="終了日は開始日より後の日付を指定してください"
         )
+
+def _validate_as_of(as_of: Optional[date]) -> None:
+    """再構築基準日の検証"""
+    if as_of and as_of > datetime.now(timezone.utc).date():
+        raise HTTPException(
+            status_code=400,
+            detail="as_ofには今日以前の日付を指定してください"
+        )
+
+async def _fetch_chart_issues(
+    gitlab_client,
+    as_of: Optional[date] = None,
+    refresh: bool = False
+) -> List[IssueModel]:
+    """チャート用の分析済みIssue取得（全状態、プロジェクト単位のIssueストアから差分同期）
     
-    # issue_serviceとchart_analyzerをセッション用に作成
-    from app.services.issue_service import IssueService
-    from app.services.chart_analyzer import ChartAnalyzer
-    issue_service = IssueService()
-    issue_service.client = gitlab_client
-    chart_analyzer = ChartAnalyzer()
+    差分同期はissue_store_sync_secondsごとのため、refresh未指定時は直前のGitLabの変更が
+    反映されていない場合がある。as_of指定時はラベルイベントから基準日時点のラベルを再構築して分析し直す
+    """
+    from app.services.issue_store import issue_store
+    issues = await issue_store.get_issues(gitlab_client, force=refresh)
+    if as_of is None:
+        return issues
     
-    try:
-        # Issue取得・分析（全状態で取得）
-        issues, _ = await issue_service.get_analyzed_issues(
-            state='all',  # チャートでは全状態のイシューを取得
-            analyze=True
+    from app.services.label_event_service import label_event_service
+    issues, _ = await label_event_service.get_issues_as_of(gitlab_client, issues, as_of)
+    return issues
+
+async def _load_chart_issues(
+    gitlab_client,
+    start_date: date,
+    end_date: date,
+    filters: Dict[str, Any],
+    as_of: Optional[date] = None,
+    refresh: bool = False
+) -> Tuple[List[IssueModel], List[Dict[str, Any]]]:
+    """チャート用Issue取得・フィルタリング
+    
+    Returns:
+        Tuple[List[IssueModel], List[Dict[str, Any]]]: (フィルタ済みIssue, 警告情報リスト)
+    """
+    issues = await _fetch_chart_issues(gitlab_client, as_of, refresh)
+    index = None
+    if as_of is None:
+        # ストアのissueはストアの日付インデックスでスコープ判定
+        from app.services.issue_store import issue_store
+        index = issue_store.get_store(gitlab_client).get_index()
+    return apply_chart_filters(issues, start_date, end_date, filters, index)
+
+async def _load_period_snapshot(
+    gitlab_client,
+    start_date: date,
+    end_date: date,
+    filters: Dict[str, Any],
+    recompute: bool = False,
+    as_of: Optional[date] = None,
+    refresh: bool = False
+) -> Dict[str, Any]:
+    """期間の日別累積値・ベロシティ・警告を取得
+    
+    終了済みの期間は保存済みスナップショットを返す。未保存またはrecompute指定時は
+    Issueストアの差分更新済み累積値から取得し、終了済みの期間であれば保存する。
+    Issueストアの差分同期はissue_store_sync_secondsごとのため、最大でその秒数前のissueから
+    計算した値になる（refresh指定時は同期間隔に関わらず差分同期してから計算する）。
+    as_of指定時は基準日時点のラベルで再構築したissueから計算し、基準日が過去であれば
+    結果が再現可能なためスナップショットとして保存する
+    
+    Returns:
+        Dict[str, Any]: counters / velocity / warnings / created_at / source（'snapshot' or 'live'）
+    """
+    from app.services.chart_snapshot_store import chart_snapshot_store
+    from app.services.issue_store import issue_store, project_store_key
+    from app.services.incremental_chart_service import incremental_chart_service, IncrementalChartState
+    
+    closed = chart_snapshot_store.is_closed(end_date)
+    snapshot_filters = filters
+    if as_of is not None:
+        closed = closed or chart_snapshot_store.is_closed(as_of)
+        snapshot_filters = {**filters, 'as_of': as_of}
+    key = chart_snapshot_store.make_key(project_store_key(gitlab_client), start_date, end_date, snapshot_filters)
+    if closed and not recompute:
+        snapshot = chart_snapshot_store.load(key)
+        if snapshot is not None:
+            snapshot['source'] = 'snapshot'
+            return snapshot
+    
+    if as_of is not None:
+        state = IncrementalChartState(start_date, end_date, filters)
+        state.build(await _fetch_chart_issues(gitlab_client, as_of, refresh))
+    else:
+        # Issueストアを同期し、変更されたissueの差分だけ累積値に反映
+        store = issue_store.get_store(gitlab_client)
+        await issue_store.sync(store, force=refresh)
+        state = incremental_chart_service.get_state(store, start_date, end_date, filters)
+    
+    snapshot = {
+        'counters': state.counters(),
+        'velocity': state.velocity(),
+        'warnings': _format_warnings(state.warnings()),
+        'created_at': datetime.now(timezone.utc)
+    }
+    if closed:
+        chart_snapshot_store.save(key, snapshot)
+    
+    snapshot['source'] = 'live'
+    return snapshot
+
+def _build_snapshot_metadata(
+    snapshot: Dict[str, Any],
+    start_date: date,
+    end_date: date,
+    filters: Dict[str, Any],
+    sampling: Dict[str, Any]
+) -> Dict[str, Any]:
+    """スナップショットからメタデータ構築"""
+    counters = snapshot['counters']
+    metadata = _build_chart_metadata(
+        counters['total_issues'], counters['total_points'], start_date, end_date, filters, sampling
+    )
+    metadata['source'] = snapshot['source']
+    metadata['computed_at'] = snapshot['created_at'].isoformat()
+    return metadata
+
+def _build_chart_metadata(
+    total_issues: int,
+    total_points: float,
+    start_date: date,
+    end_date: date,
+    filters: Dict[str, Any],
+    sampling: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """メタデータ・統計情報"""
+    metadata = {
+        'total_issues': total_issues,
+        'total_points': total_points,
+        'milestone': filters.get('milestone'),
+        'date_range': {
+            'start': start_date.isoformat(),
+            'end': end_date.isoformat()
+        }
+    }
+    if sampling:
+        metadata['granularity'] = resolve_granularity(start_date, end_date, sampling['granularity'])
+        metadata['max_points'] = sampling['max_points']
+    return metadata
+
+def _validate_group_by(group_by: Optional[str]) -> None:
+    """グループ化項目の検証"""
+    from app.services.chart_analyzer import GROUP_BY_FIELDS
+    if group_by and group_by not in GROUP_BY_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"group_byには {', '.join(GROUP_BY_FIELDS)} のいずれかを指定してください"
         )
-        
-        # 統一されたフィルタリングパイプライン
-        # 1. 日付補正適用
-        issues = apply_unified_filters(issues, start_date)
-        
-        # 2. スコープフィルタ適用（期間が指定されている場合）
-        warnings = []
-        issues, warnings = apply_scope_filters(issues, start_date, end_date)
-        
-        # 3. 追加フィルタ適用（共通関数を使用）
-        issues = apply_advanced_filters(
-            issues,
-            min_point=point_min,
-            max_point=point_max,
-            search=search,
-            kanban_status=kanban_status,
-            is_epic=is_epic,
-            state=state,
-            created_after=created_after,
-            created_before=created_before,
-            completed_after=completed_after,
-            completed_before=completed_before,
-            assignee=assignee,
-            service=service,
-            milestone=milestone
+
+async def _build_burn_chart_response(
+    chart_analyzer,
+    gitlab_client,
+    start_date: date,
+    end_date: date,
+    filters: Dict[str, Any],
+    chart_type: str,
+    group_by: Optional[str],
+    sampling: Dict[str, Any],
+    chart_format: str = 'rows',
+    recompute: bool = False,
+    as_of: Optional[date] = None,
+    refresh: bool = False
+) -> BurnChartResponse:
+    """Burn-down/Burn-upチャートのレスポンス構築
+    
+    系列は列形式で生成し、format=rowsの場合のみ行形式（ChartDataModel）に変換する。
+    group_by指定時は現在のissueから計算し、それ以外は期間スナップショットを使用する
+    """
+    groups = None
+    if group_by:
+        issues, warnings = await _load_chart_issues(
+            gitlab_client, start_date, end_date, filters, as_of, refresh
         )
         
-        # チャートデータ生成（事前フィルタリング済みのissuesを渡す）
-        chart_data = chart_analyzer.generate_burn_down_data(
-            issues, start_date, end_date
+        # 合計とグループ別の系列を一度の走査で生成
+        columns, grouped_columns = chart_analyzer.generate_grouped_chart_columns(
+            issues, start_date, end_date, group_by, chart_type, **sampling
         )
+        groups = [
+            ChartSeriesModel(
+                key=key,
+                total_issues=series['total_issues'][-1] if series['dates'] else 0,
+                total_points=series['total'][-1] if series['dates'] else 0.0,
+                statistics=_calculate_chart_statistics(series, chart_type),
+                **_chart_payload(chart_analyzer, series, chart_format, 'chart_data', 'columns')
+            )
+            for key, series in sorted(grouped_columns.items(), key=lambda item: (item[0] is None, item[0] or ''))
+        ]
         
-        # メタデータ・統計情報
-        metadata = {
-            'total_issues': len(issues),
-            'total_points': sum(i.point for i in issues if i.point),
-            'milestone': milestone,
-            'date_range': {
-                'start': start_date.isoformat(),
-                'end': end_date.isoformat()
-            }
-        }
-        
-        statistics = _calculate_chart_statistics(chart_data, 'burn_down')
-        
-        # 警告情報をレスポンス形式に変換
-        formatted_warnings = []
-        for warning in warnings:
-            formatted_warnings.append({
-                'issue': {
-                    'id': warning['issue'].id,
-                    'iid': warning['issue'].iid,
-                    'title': warning['issue'].title,
-                    'web_url': warning['issue'].web_url,
-                    'kanban_status': warning['issue'].kanban_status,
-                    'due_date': warning['issue'].due_date.isoformat() if warning['issue'].due_date else None,
-                    'completed_at': warning['issue'].completed_at.isoformat() if warning['issue'].completed_at else None,
-                    'created_at': warning['issue'].created_at.isoformat() if warning['issue'].created_at else None
-                },
-                'reason': warning['reason']
-            })
-        
-        return BurnChartResponse(
-            chart_data=chart_data,
-            metadata=metadata,
-            statistics=statistics,
-            warnings=formatted_warnings
+        metadata = _build_chart_metadata(
+            len(issues), sum(i.point for i in issues if i.point), start_date, end_date, filters, sampling
         )
+        metadata['group_by'] = group_by
+        formatted_warnings = _format_warnings(warnings)
+    else:
+        snapshot = await _load_period_snapshot(
+            gitlab_client, start_date, end_date, filters, recompute, as_of, refresh
+        )
+        burn_down, burn_up = chart_analyzer.generate_burn_chart_columns_from_counters(
+            snapshot['counters'], start_date, end_date, **sampling
+        )
+        columns = burn_down if chart_type == 'burn_down' else burn_up
         
+        metadata = _build_snapshot_metadata(snapshot, start_date, end_date, filters, sampling)
+        formatted_warnings = snapshot['warnings']
+    
+    metadata['format'] = chart_format
+    metadata['as_of'] = as_of.isoformat() if as_of else None
+    
+    return BurnChartResponse(
+        metadata=metadata,
+        statistics=_calculate_chart_statistics(columns, chart_type),
+        warnings=formatted_warnings,
+        groups=groups,
+        **_chart_payload(chart_analyzer, columns, chart_format, 'chart_data', 'columns')
+    )
+
+async def _build_scope_changes(
+    chart_analyzer,
+    gitlab_client,
+    start_date: date,
+    end_date: date,
+    filters: Dict[str, Any],
+    refresh: bool = False
+) -> ScopeChangeModel:
+    """ラベル履歴によるスコープ変化の構築（除外ルールで外れたissueも対象）"""
+    from app.services.issue_store import issue_store
+    from app.services.scope_change_service import scope_change_service
+    
+    store = issue_store.get_store(gitlab_client)
+    await issue_store.sync(store, force=refresh)
+    scope_events, fetched = await scope_change_service.analyze(
+        gitlab_client, store.get_issues(include_excluded=True), start_date, end_date, filters
+    )
+    columns, summary = chart_analyzer.generate_scope_change_columns(scope_events, start_date, end_date)
+    summary['fetched_label_events'] = fetched
+    return ScopeChangeModel(columns=ScopeChangeColumnsModel(**columns), summary=summary)
+
+def _chart_payload(
+    chart_analyzer,
+    columns: Dict[str, List[Any]],
+    chart_format: str,
+    rows_field: str,
+    columns_field: str
+) -> Dict[str, Any]:
+    """レスポンス形式に応じたチャートデータのフィールドを構築
+    
+    columnarの場合は行ごとのモデル生成を行わず、列データをそのまま返す
+    """
+    if chart_format == 'columnar':
+        return {columns_field: ChartColumnsModel(**columns)}
+    return {rows_field: chart_analyzer.columns_to_rows(columns)}
+
+def _format_warnings(warnings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """警告情報をレスポンス形式に変換"""
+    formatted_warnings = []
+    for warning in warnings:
+        issue = warning['issue']
+        formatted_warnings.append({
+            'issue': {
+                'id': issue.id,
+                'iid': issue.iid,
+                'title': issue.title,
+                'web_url': issue.web_url,
+                'kanban_status': issue.kanban_status,
+                'due_date': issue.due_date.isoformat() if issue.due_date else None,
+                'completed_at': issue.completed_at.isoformat() if issue.completed_at else None,
+                'created_at': issue.created_at.isoformat() if issue.created_at else None
+            },
+            'reason': warning['reason']
+        })
+    return formatted_warnings
+
+@router.get("/burn-down", response_model=BurnChartResponse)
+async def get_burn_down_data(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    filters: Dict[str, Any] = Depends(chart_filter_params),
+    sampling: Dict[str, Any] = Depends(chart_sampling_params),
+    group_by: Optional[str] = Query(None, description="グループ別系列（service / assignee / milestone）"),
+    chart_format: str = Depends(chart_format_param),
+    recompute: bool = Query(False, description="終了済み期間もスナップショットを使わずに再計算して保存し直す"),
+    as_of: Optional[date] = Query(None, description="ラベル履歴から再構築する基準日（指定日終了時点のラベルで集計）"),
+    refresh: bool = Query(False, description="同期間隔に関わらずGitLabと差分同期してから計算するか"),
+    x_session_id: Optional[str] = Header(None)
+):
+    """Burn-downチャートデータ取得"""
+    gitlab_client = _get_session_client(x_session_id)
+    _validate_period(start_date, end_date)
+    _validate_group_by(group_by)
+    _validate_as_of(as_of)
+    
+    from app.services.chart_analyzer import ChartAnalyzer
+    chart_analyzer = ChartAnalyzer()
+    
+    try:
+        return await _build_burn_chart_response(
+            chart_analyzer, gitlab_client, start_date, end_date,
+            filters, 'burn_down', group_by, sampling, chart_format, recompute, as_of, refresh
+        )
+    
     except Exception as e:
         logger.error(f"Burn-downチャートAPI失敗: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -133,118 +427,574 @@ async def get_burn_down_data(
 async def get_burn_up_data(
     start_date: date = Query(...),
     end_date: date = Query(...),
-    milestone: Optional[str] = Query(None),
-    service: Optional[str] = Query(None),
-    assignee: Optional[str] = Query(None),
-    kanban_status: Optional[str] = Query(None),
-    state: Optional[str] = Query(None),
-    is_epic: Optional[str] = Query(None),
-    point_min: Optional[float] = Query(None),
-    point_max: Optional[float] = Query(None),
-    search: Optional[str] = Query(None),
-    created_after: Optional[date] = Query(None),
-    created_before: Optional[date] = Query(None),
-    completed_after: Optional[date] = Query(None),
-    completed_before: Optional[date] = Query(None),
+    filters: Dict[str, Any] = Depends(chart_filter_params),
+    sampling: Dict[str, Any] = Depends(chart_sampling_params),
+    group_by: Optional[str] = Query(None, description="グループ別系列（service / assignee / milestone）"),
+    chart_format: str = Depends(chart_format_param),
+    recompute: bool = Query(False, description="終了済み期間もスナップショットを使わずに再計算して保存し直す"),
+    as_of: Optional[date] = Query(None, description="ラベル履歴から再構築する基準日（指定日終了時点のラベルで集計）"),
+    scope_changes: bool = Query(False, description="ラベル履歴によるスコープ変化（追加・削除・再見積もりポイント）を含める"),
+    refresh: bool = Query(False, description="同期間隔に関わらずGitLabと差分同期してから計算するか"),
     x_session_id: Optional[str] = Header(None)
 ):
     """Burn-upチャートデータ取得"""
-    if not x_session_id:
-        raise HTTPException(status_code=401, detail="セッションIDが必要です")
+    gitlab_client = _get_session_client(x_session_id)
+    _validate_period(start_date, end_date)
+    _validate_group_by(group_by)
+    _validate_as_of(as_of)
     
-    gitlab_client = session_manager.get_gitlab_client(x_session_id)
-    if not gitlab_client:
-        raise HTTPException(status_code=404, detail="セッションが見つかりません")
+    from app.services.chart_analyzer import ChartAnalyzer
+    chart_analyzer = ChartAnalyzer()
     
-    if start_date >= end_date:
+    try:
+        response = await _build_burn_chart_response(
+            chart_analyzer, gitlab_client, start_date, end_date,
+            filters, 'burn_up', group_by, sampling, chart_format, recompute, as_of, refresh
+        )
+        if scope_changes:
+            response.scope_changes = await _build_scope_changes(
+                chart_analyzer, gitlab_client, start_date, end_date, filters, refresh
+            )
+        return response
+    
+    except Exception as e:
+        logger.error(f"Burn-upチャートAPI失敗: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _render_chart_image(
+    chart_type: str,
+    image_format: str,
+    start_date: date,
+    end_date: date,
+    filters: Dict[str, Any],
+    sampling: Dict[str, Any],
+    width: int,
+    height: int,
+    request: Request,
+    token: Optional[str],
+    x_session_id: Optional[str],
+    if_none_match: Optional[str]
+) -> Response:
+    """チャート画像（SVG/PNG）のレスポンス構築
+    
+    描画入力のハッシュをETagとして返し、一致する場合は描画せずに304を返す
+    """
+    from app.services.chart_renderer import chart_renderer, IMAGE_FORMATS
+    
+    _validate_image_format(image_format)
+    gitlab_client = _get_session_client(
+        x_session_id or _resolve_image_token(token, chart_type, image_format, request)
+    )
+    _validate_period(start_date, end_date)
+    
+    from app.services.chart_analyzer import ChartAnalyzer
+    chart_analyzer = ChartAnalyzer()
+    
+    try:
+        snapshot = await _load_period_snapshot(
+            gitlab_client, start_date, end_date, filters
+        )
+        burn_down, burn_up = chart_analyzer.generate_burn_chart_columns_from_counters(
+            snapshot['counters'], start_date, end_date, **sampling
+        )
+        columns = burn_down if chart_type == 'burn_down' else burn_up
+        
+        etag = f'"{chart_renderer.content_hash(columns, chart_type, image_format, width, height)}"'
+        headers = {'ETag': etag, 'Cache-Control': 'private, max-age=300'}
+        if if_none_match == etag:
+            return Response(status_code=304, headers=headers)
+        
+        image, _ = await chart_renderer.render(columns, chart_type, image_format, width, height)
+        return Response(content=image, media_type=IMAGE_FORMATS[image_format], headers=headers)
+    
+    except Exception as e:
+        logger.error(f"チャート画像API失敗 ({chart_type}.{image_format}): {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _validate_image_format(image_format: str) -> None:
+    """画像形式の検証"""
+    from app.services.chart_renderer import IMAGE_FORMATS
+    if image_format not in IMAGE_FORMATS:
         raise HTTPException(
-            status_code=400,
-            detail="終了日は開始日より後の日付を指定してください"
+            status_code=404,
+            detail=f"画像形式には {', '.join(IMAGE_FORMATS)} のいずれかを指定してください"
         )
+
+def _resolve_image_token(
+    token: Optional[str],
+    chart_type: str,
+    image_format: str,
+    request: Request
+) -> Optional[str]:
+    """埋め込み用トークンのセッションID（トークン未指定時はNone）"""
+    if not token:
+        return None
+    
+    from app.services.chart_image_token import chart_image_tokens, image_scope
+    session_id = chart_image_tokens.resolve(
+        token, image_scope(chart_type, image_format, request.query_params.multi_items())
+    )
+    if session_id is None:
+        raise HTTPException(status_code=401, detail="トークンが無効か期限切れです")
+    return session_id
+
+def _issue_image_token(
+    chart_type: str,
+    image_format: str,
+    request: Request,
+    x_session_id: Optional[str]
+) -> ChartImageTokenResponse:
+    """埋め込み用トークン発行（リクエストと同じクエリパラメータの画像のみ取得可能）"""
+    from app.services.chart_image_token import chart_image_tokens, image_scope
+    
+    _validate_image_format(image_format)
+    _get_session_client(x_session_id)
+    params = [(key, value) for key, value in request.query_params.multi_items() if key != 'token']
+    token, expires_at = chart_image_tokens.issue(
+        x_session_id, image_scope(chart_type, image_format, params)
+    )
+    image_path = request.url.path[:-len('/token')]
+    return ChartImageTokenResponse(
+        token=token,
+        url=f"{image_path}?{urlencode(params + [('token', token)])}",
+        expires_at=expires_at
+    )
+
+@router.post("/burn-down.{image_format}/token", response_model=ChartImageTokenResponse)
+async def create_burn_down_image_token(
+    image_format: str,
+    request: Request,
+    x_session_id: Optional[str] = Header(None)
+):
+    """Burn-downチャート画像の埋め込み用トークン発行（クエリパラメータは画像取得と同じ）"""
+    return _issue_image_token('burn_down', image_format, request, x_session_id)
+
+@router.post("/burn-up.{image_format}/token", response_model=ChartImageTokenResponse)
+async def create_burn_up_image_token(
+    image_format: str,
+    request: Request,
+    x_session_id: Optional[str] = Header(None)
+):
+    """Burn-upチャート画像の埋め込み用トークン発行（クエリパラメータは画像取得と同じ）"""
+    return _issue_image_token('burn_up', image_format, request, x_session_id)
+
+@router.get("/burn-down.{image_format}")
+async def get_burn_down_image(
+    image_format: str,
+    request: Request,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    filters: Dict[str, Any] = Depends(chart_filter_params),
+    sampling: Dict[str, Any] = Depends(chart_sampling_params),
+    width: int = Query(1600, ge=320, le=4000, description="画像幅（px）"),
+    height: int = Query(900, ge=240, le=4000, description="画像高さ（px）"),
+    token: Optional[str] = Query(None, description="埋め込み用トークン（ヘッダーを付与できない<img>埋め込み用、/tokenで発行）"),
+    if_none_match: Optional[str] = Header(None),
+    x_session_id: Optional[str] = Header(None)
+):
+    """Burn-downチャート画像取得（svg / png）"""
+    return await _render_chart_image(
+        'burn_down', image_format, start_date, end_date, filters, sampling,
+        width, height, request, token, x_session_id, if_none_match
+    )
+
+@router.get("/burn-up.{image_format}")
+async def get_burn_up_image(
+    image_format: str,
+    request: Request,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    filters: Dict[str, Any] = Depends(chart_filter_params),
+    sampling: Dict[str, Any] = Depends(chart_sampling_params),
+    width: int = Query(1600, ge=320, le=4000, description="画像幅（px）"),
+    height: int = Query(900, ge=240, le=4000, description="画像高さ（px）"),
+    token: Optional[str] = Query(None, description="埋め込み用トークン（ヘッダーを付与できない<img>埋め込み用、/tokenで発行）"),
+    if_none_match: Optional[str] = Header(None),
+    x_session_id: Optional[str] = Header(None)
+):
+    """Burn-upチャート画像取得（svg / png）"""
+    return await _render_chart_image(
+        'burn_up', image_format, start_date, end_date, filters, sampling,
+        width, height, request, token, x_session_id, if_none_match
+    )
+
+@router.get("/dashboard", response_model=DashboardChartResponse)
+async def get_dashboard_data(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    filters: Dict[str, Any] = Depends(chart_filter_params),
+    sampling: Dict[str, Any] = Depends(chart_sampling_params),
+    chart_format: str = Depends(chart_format_param),
+    recompute: bool = Query(False, description="終了済み期間もスナップショットを使わずに再計算して保存し直す"),
+    as_of: Optional[date] = Query(None, description="ラベル履歴から再構築する基準日（指定日終了時点のラベルで集計）"),
+    refresh: bool = Query(False, description="同期間隔に関わらずGitLabと差分同期してから計算するか"),
+    x_session_id: Optional[str] = Header(None)
+):
+    """ダッシュボード用チャートデータ一括取得
+    
+    Issue取得・フィルタリングを一度だけ行い、Burn-down/Burn-up/ベロシティ・
+    警告・統計情報をまとめて返す（終了済み期間はスナップショットを使用）
+    """
+    gitlab_client = _get_session_client(x_session_id)
+    _validate_period(start_date, end_date)
+    _validate_as_of(as_of)
     
-    # issue_serviceとchart_analyzerをセッション用に作成
-    from app.services.issue_service import IssueService
     from app.services.chart_analyzer import ChartAnalyzer
-    issue_service = IssueService()
-    issue_service.client = gitlab_client
     chart_analyzer = ChartAnalyzer()
     
     try:
-        # Issue取得・分析（全状態で取得）
-        issues, _ = await issue_service.get_analyzed_issues(
-            state='all',  # チャートでは全状態のイシューを取得
-            analyze=True
+        snapshot = await _load_period_snapshot(
+            gitlab_client, start_date, end_date, filters, recompute, as_of, refresh
         )
         
-        # 統一されたフィルタリングパイプライン
-        # 1. 日付補正適用
-        issues = apply_unified_filters(issues, start_date)
+        burn_down, burn_up = chart_analyzer.generate_burn_chart_columns_from_counters(
+            snapshot['counters'], start_date, end_date, **sampling
+        )
+        velocity_data = snapshot['velocity']
         
-        # 2. スコープフィルタ適用（期間が指定されている場合）
-        warnings = []
-        issues, warnings = apply_scope_filters(issues, start_date, end_date)
+        metadata = _build_snapshot_metadata(snapshot, start_date, end_date, filters, sampling)
+        metadata['format'] = chart_format
+        metadata['as_of'] = as_of.isoformat() if as_of else None
         
-        # 3. 追加フィルタ適用（共通関数を使用）
-        issues = apply_advanced_filters(
-            issues,
-            min_point=point_min,
-            max_point=point_max,
-            search=search,
-            kanban_status=kanban_status,
-            is_epic=is_epic,
-            state=state,
-            created_after=created_after,
-            created_before=created_before,
-            completed_after=completed_after,
-            completed_before=completed_before,
-            assignee=assignee,
-            service=service,
-            milestone=milestone
+        return DashboardChartResponse(
+            velocity=velocity_data,
+            metadata=metadata,
+            statistics={
+                'burn_down': _calculate_chart_statistics(burn_down, 'burn_down'),
+                'burn_up': _calculate_chart_statistics(burn_up, 'burn_up'),
+                'average_velocity': sum(v['completed_points'] for v in velocity_data) / len(velocity_data) if len(velocity_data) > 0 else 0
+            },
+            warnings=snapshot['warnings'],
+            **_chart_payload(chart_analyzer, burn_down, chart_format, 'burn_down', 'burn_down_columns'),
+            **_chart_payload(chart_analyzer, burn_up, chart_format, 'burn_up', 'burn_up_columns')
         )
+    
+    except Exception as e:
+        logger.error(f"ダッシュボードチャートAPI失敗: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/batch", response_model=BatchChartResponse)
+async def get_batch_chart_data(
+    batch_request: BatchChartRequest,
+    filters: Dict[str, Any] = Depends(chart_filter_params),
+    sampling: Dict[str, Any] = Depends(chart_sampling_params),
+    chart_format: str = Depends(chart_format_param),
+    x_session_id: Optional[str] = Header(None)
+):
+    """複数期間のBurn-down/Burn-upチャートデータ一括取得（四半期比較用）
+    
+    Issue取得・分析は一度だけ行い、期間ごとのスコープ判定と系列生成は
+    共有の日別インデックスから計算する
+    """
+    gitlab_client = _get_session_client(x_session_id)
+    
+    periods = batch_request.periods
+    if not periods or len(periods) > MAX_BATCH_PERIODS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"期間は1件以上{MAX_BATCH_PERIODS}件以下で指定してください"
+        )
+    for period in periods:
+        _validate_period(period.start_date, period.end_date)
+    
+    from app.services.chart_analyzer import ChartAnalyzer
+    from app.utils.period_index import PeriodIssueIndex
+    chart_analyzer = ChartAnalyzer()
+    
+    try:
+        issues = await _fetch_chart_issues(gitlab_client)
+        index = PeriodIssueIndex(issues, filters)
+        
+        results = []
+        for period in periods:
+            records, warning_counts = index.select(period.start_date, period.end_date)
+            burn_down, burn_up = chart_analyzer.generate_period_chart_columns(
+                records, period.start_date, period.end_date, **sampling
+            )
+            results.append(PeriodChartModel(
+                label=period.label,
+                start_date=period.start_date,
+                end_date=period.end_date,
+                total_issues=len(records),
+                total_points=sum(point for _, _, point in records if point),
+                statistics={
+                    'burn_down': _calculate_chart_statistics(burn_down, 'burn_down'),
+                    'burn_up': _calculate_chart_statistics(burn_up, 'burn_up')
+                },
+                warning_counts=warning_counts,
+                **_chart_payload(chart_analyzer, burn_down, chart_format, 'burn_down', 'burn_down_columns'),
+                **_chart_payload(chart_analyzer, burn_up, chart_format, 'burn_up', 'burn_up_columns')
+            ))
         
-        # チャートデータ生成（事前フィルタリング済みのissuesを渡す）
-        chart_data = chart_analyzer.generate_burn_up_data(
-            issues, start_date, end_date
+        return BatchChartResponse(
+            periods=results,
+            metadata={
+                'fetched_issues': len(issues),
+                'milestone': filters.get('milestone'),
+                'granularity': sampling['granularity'],
+                'max_points': sampling['max_points'],
+                'format': chart_format
+            }
         )
+    
+    except Exception as e:
+        logger.error(f"複数期間チャートAPI失敗: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/milestones", response_model=MilestoneChartResponse)
+async def get_milestone_chart_data(
+    filters: Dict[str, Any] = Depends(chart_filter_params),
+    sampling: Dict[str, Any] = Depends(chart_sampling_params),
+    chart_format: str = Depends(chart_format_param),
+    include_series: bool = Query(False, description="Burn-down系列を含める（未指定時は概要のみ）"),
+    x_session_id: Optional[str] = Header(None)
+):
+    """アクティブなマイルストーン別のBurn-downチャート一括取得
+    
+    マイルストーンの開始日（未設定時は作成日）から期限日までを期間とし、
+    マイルストーンに紐づくissueをスコープとする。Issue取得・分析は一度だけ行い、
+    全マイルストーンを共有の日別インデックスから計算する。milestone指定時はそのマイルストーンのみ
+    """
+    gitlab_client = _get_session_client(x_session_id)
+    
+    from app.services.milestone_service import milestone_service
+    from app.services.chart_analyzer import ChartAnalyzer
+    from app.utils.period_index import PeriodIssueIndex
+    chart_analyzer = ChartAnalyzer()
+    
+    try:
+        milestones = await milestone_service.get_active_milestones(gitlab_client)
+        if filters.get('milestone'):
+            milestones = [m for m in milestones if m['title'] == filters['milestone']]
+        
+        issues = await _fetch_chart_issues(gitlab_client)
+        # スコープはマイルストーンで決めるため、milestoneフィルタはインデックスに渡さない
+        index = PeriodIssueIndex(issues, {**filters, 'milestone': None})
+        today = datetime.now(timezone.utc).date()
         
-        metadata = {
-            'total_issues': len(issues),
-            'total_points': sum(i.point for i in issues if i.point),
-            'milestone': milestone,
-            'date_range': {
-                'start': start_date.isoformat(),
-                'end': end_date.isoformat()
+        results = []
+        skipped = []
+        for milestone in milestones:
+            start_date = milestone['start_date'] or milestone['created_at']
+            end_date = milestone['due_date']
+            if not end_date or not start_date or start_date >= end_date:
+                skipped.append({
+                    'id': milestone['id'],
+                    'title': milestone['title'],
+                    'reason': 'no-due-date' if not end_date else 'invalid-period'
+                })
+                continue
+            
+            records, warning_counts = index.select(start_date, end_date, milestone=milestone['title'])
+            burn_down, _ = chart_analyzer.generate_period_chart_columns(records, start_date, end_date)
+            
+            # 概要は基準日（今日と期限日の早い方）時点の値
+            as_of_index = min(max((today - start_date).days, 0), len(burn_down['dates']) - 1)
+            burn_down_at = {key: burn_down[key][as_of_index] for key in ('completed', 'remaining', 'planned')}
+            statistics = _calculate_chart_statistics(burn_down, 'burn_down')
+            
+            series = {}
+            if include_series:
+                if sampling['granularity'] != 'day' or sampling['max_points']:
+                    burn_down, _ = chart_analyzer.generate_period_chart_columns(
+                        records, start_date, end_date, **sampling
+                    )
+                series = _chart_payload(chart_analyzer, burn_down, chart_format, 'burn_down', 'burn_down_columns')
+            
+            results.append(MilestoneChartModel(
+                id=milestone['id'],
+                iid=milestone['iid'],
+                title=milestone['title'],
+                start_date=start_date,
+                due_date=end_date,
+                web_url=milestone['web_url'],
+                total_issues=len(records),
+                total_points=sum(point for _, _, point in records if point),
+                completed_points=burn_down_at['completed'],
+                remaining_points=burn_down_at['remaining'],
+                planned_remaining_points=burn_down_at['planned'],
+                statistics=statistics,
+                warning_counts=warning_counts,
+                **series
+            ))
+        
+        return MilestoneChartResponse(
+            milestones=results,
+            skipped=skipped,
+            metadata={
+                'fetched_issues': len(issues),
+                'milestones': len(milestones),
+                'granularity': sampling['granularity'],
+                'max_points': sampling['max_points'],
+                'include_series': include_series,
+                'format': chart_format
             }
-        }
+        )
+    
+    except Exception as e:
+        logger.error(f"マイルストーン別チャートAPI失敗: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/forecast", response_model=ForecastResponse)
+async def get_forecast_data(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    filters: Dict[str, Any] = Depends(chart_filter_params),
+    unit: str = Query('day', description="スループットのサンプリング単位（day: 営業日 / week: 週）"),
+    history_weeks: int = Query(12, ge=1, le=52),
+    trials: int = Query(10000, ge=100, le=100000),
+    seed: Optional[int] = Query(None, description="乱数シード（指定時は結果が決定的になる）"),
+    as_of: Optional[date] = Query(None, description="予測基準日（デフォルト: 今日と期間終了日の早い方）"),
+    x_session_id: Optional[str] = Header(None)
+):
+    """モンテカルロ法による完了日予測
+    
+    過去のスループットから選択期間の残りスコープを消化する日付の分布を
+    シミュレーションし、P50/P85/P95の完了日を返す
+    """
+    gitlab_client = _get_session_client(x_session_id)
+    _validate_period(start_date, end_date)
+    
+    from app.services.forecast_service import completion_forecaster, FORECAST_UNITS
+    from app.services.chart_analyzer import ChartAnalyzer
+    chart_analyzer = ChartAnalyzer()
+    
+    if unit not in FORECAST_UNITS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"unitには {', '.join(FORECAST_UNITS)} のいずれかを指定してください"
+        )
+    
+    if as_of is None:
+        as_of = min(datetime.now(timezone.utc).date(), end_date)
+    if as_of < start_date:
+        as_of = start_date
+    
+    try:
+        all_issues = await _fetch_chart_issues(gitlab_client)
+        issues, _ = apply_chart_filters(all_issues, start_date, end_date, filters)
         
-        statistics = _calculate_chart_statistics(chart_data, 'burn_up')
+        # 基準日時点の残りスコープ（Burn-downの実績値）
+        burn_down = chart_analyzer.generate_burn_down_columns(issues, start_date, min(as_of, end_date))
+        remaining_points = burn_down['remaining'][-1] if burn_down['dates'] else 0.0
         
-        # 警告情報をレスポンス形式に変換
-        formatted_warnings = []
-        for warning in warnings:
-            formatted_warnings.append({
-                'issue': {
-                    'id': warning['issue'].id,
-                    'iid': warning['issue'].iid,
-                    'title': warning['issue'].title,
-                    'web_url': warning['issue'].web_url,
-                    'kanban_status': warning['issue'].kanban_status,
-                    'due_date': warning['issue'].due_date.isoformat() if warning['issue'].due_date else None,
-                    'completed_at': warning['issue'].completed_at.isoformat() if warning['issue'].completed_at else None,
-                    'created_at': warning['issue'].created_at.isoformat() if warning['issue'].created_at else None
-                },
-                'reason': warning['reason']
-            })
+        # スループット履歴は期間外の完了も含めて算出（スコープフィルタは適用しない）
+        history_issues = execute_issue_query(all_issues, IssueQuery.from_filters(filters)).matched
         
-        return BurnChartResponse(
-            chart_data=chart_data,
+        forecast = completion_forecaster.forecast(
+            history_issues,
+            remaining_points,
+            as_of,
+            end_date,
+            unit=unit,
+            history_weeks=history_weeks,
+            trials=trials,
+            seed=seed
+        )
+        forecast['metadata'] = _build_chart_metadata(
+            len(issues), sum(i.point for i in issues if i.point), start_date, end_date, filters
+        )
+        return ForecastResponse(**forecast)
+    
+    except Exception as e:
+        logger.error(f"完了予測API失敗: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cumulative-flow", response_model=CumulativeFlowResponse)
+async def get_cumulative_flow_data(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    filters: Dict[str, Any] = Depends(chart_filter_params),
+    x_session_id: Optional[str] = Header(None)
+):
+    """累積フロー図データ取得
+    
+    チャート対象のissueについてGitLabのラベルイベントからKanban Statusの遷移を取得し、
+    日別・Kanban Status別のissue数を返す
+    """
+    gitlab_client = _get_session_client(x_session_id)
+    _validate_period(start_date, end_date)
+    
+    from app.services.label_event_service import label_event_service
+    from app.services.chart_analyzer import ChartAnalyzer
+    chart_analyzer = ChartAnalyzer()
+    
+    try:
+        issues, warnings = await _load_chart_issues(
+            gitlab_client, start_date, end_date, filters
+        )
+        transitions, fetched = await label_event_service.get_status_transitions(gitlab_client, issues)
+        flow = chart_analyzer.generate_cumulative_flow_data(transitions, start_date, end_date)
+        
+        metadata = _build_chart_metadata(
+            len(issues), sum(i.point for i in issues if i.point), start_date, end_date, filters
+        )
+        metadata['statuses'] = flow['statuses']
+        metadata['fetched_label_events'] = fetched
+        
+        return CumulativeFlowResponse(
+            dates=flow['dates'],
+            series=[
+                CumulativeFlowSeriesModel(status=status, counts=flow['counts'][status])
+                for status in flow['statuses']
+            ],
             metadata=metadata,
-            statistics=statistics,
-            warnings=formatted_warnings
+            warnings=_format_warnings(warnings)
+        )
+    
+    except Exception as e:
+        logger.error(f"累積フロー図API失敗: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/flow-time", response_model=FlowTimeResponse)
+async def get_flow_time_data(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    filters: Dict[str, Any] = Depends(chart_filter_params),
+    bin_days: int = Query(1, ge=1, le=90, description="ヒストグラムの階級幅（日）"),
+    x_session_id: Optional[str] = Header(None)
+):
+    """リードタイム・サイクルタイム分析
+    
+    チャート対象のissueのうち期間内に完了したissueについて、リードタイム（作成→完了）と
+    サイクルタイム（最初の#作業中→#完了、ラベルイベントから算出）の
+    パーセンタイル・ヒストグラムを全体・service別・assignee別に返す
+    """
+    gitlab_client = _get_session_client(x_session_id)
+    _validate_period(start_date, end_date)
+    
+    from app.services.label_event_service import label_event_service
+    from app.services.flow_time_service import flow_time_analyzer
+    
+    try:
+        issues, warnings = await _load_chart_issues(
+            gitlab_client, start_date, end_date, filters
+        )
+        # 対象はチャートと同じissueとし、値は日付補正前のストアのissueから算出
+        # （補正後は期間開始前に作成されたissueの作成日が開始日になり、リードタイムが短くなるため）
+        from app.services.issue_store import issue_store
+        store = issue_store.get_store(gitlab_client)
+        completed = [
+            store.get_issue(issue.id) or issue
+            for issue in flow_time_analyzer.select_completed(issues, start_date, end_date)
+        ]
+        transitions, fetched = await label_event_service.get_status_transitions(gitlab_client, completed)
+        distributions = flow_time_analyzer.analyze(completed, transitions, bin_days)
+        
+        metadata = _build_chart_metadata(
+            len(completed), sum(i.point for i in completed if i.point), start_date, end_date, filters
         )
+        metadata['fetched_label_events'] = fetched
         
+        return FlowTimeResponse(
+            bin_days=bin_days,
+            **distributions,
+            metadata=metadata,
+            warnings=_format_warnings(warnings)
+        )
+    
     except Exception as e:
-        logger.error(f"Burn-upチャートAPI失敗: {e}")
+        logger.error(f"リードタイム・サイクルタイムAPI失敗: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/velocity")
@@ -253,12 +1003,7 @@ async def get_velocity_data(
     x_session_id: Optional[str] = Header(None)
 ):
     """ベロシティデータ取得"""
-    if not x_session_id:
-        raise HTTPException(status_code=401, detail="セッションIDが必要です")
-    
-    gitlab_client = session_manager.get_gitlab_client(x_session_id)
-    if not gitlab_client:
-        raise HTTPException(status_code=404, detail="セッションが見つかりません")
+    gitlab_client = _get_session_client(x_session_id)
     
     # issue_serviceとchart_analyzerをセッション用に作成
     from app.services.issue_service import IssueService
@@ -276,28 +1021,30 @@ async def get_velocity_data(
             'average_velocity': sum(v['completed_points'] for v in velocity_data) / len(velocity_data) if len(velocity_data) > 0 else 0,
             'weeks_analyzed': len(velocity_data)
         }
-        
+    
     except Exception as e:
         logger.error(f"ベロシティAPI失敗: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-def _calculate_chart_statistics(chart_data: List[ChartDataModel], chart_type: str) -> dict:
-    """チャート統計計算"""
-    if not chart_data:
+def _calculate_chart_statistics(columns: Dict[str, List[Any]], chart_type: str) -> dict:
+    """チャート統計計算（列形式のチャートデータから算出）"""
+    if not columns['dates']:
         return {}
     
-    final_data = chart_data[-1]
-    initial_data = chart_data[0]
+    # 粒度指定・間引き時も期間の日数を返す
+    days_analyzed = (columns['dates'][-1] - columns['dates'][0]).days + 1
     
     if chart_type == 'burn_down':
+        initial_actual = columns['actual'][0]
         return {
-            'completion_rate': (initial_data.actual_points - final_data.actual_points) / initial_data.actual_points if initial_data.actual_points > 0 else 0,
-            'final_remaining_points': final_data.remaining_points,
-            'days_analyzed': len(chart_data)
+            'completion_rate': (initial_actual - columns['actual'][-1]) / initial_actual if initial_actual > 0 else 0,
+            'final_remaining_points': columns['remaining'][-1],
+            'days_analyzed': days_analyzed
         }
     else:  # burn_up
+        final_total = columns['total'][-1]
         return {
-            'completion_rate': final_data.completed_points / final_data.total_points if final_data.total_points > 0 else 0,
-            'final_completed_points': final_data.completed_points,
-            'days_analyzed': len(chart_data)
-        }
\ No newline at end of file
+            'completion_rate': columns['completed'][-1] / final_total if final_total > 0 else 0,
+            'final_completed_points': columns['completed'][-1],
+            'days_analyzed': days_analyzed
+        }
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Query, Header
 from typing import List, Optional, Dict, Any
-from datetime import date, timezone
+from datetime import date
 from app.services.session_manager import session_manager
 from app.models.issue import (
     IssueResponse, 
@@ -9,116 +9,69 @@ from app.models.issue import (
     IssueSearchRequest,
     IssueModel,
     ExcludedIssue,
-    IssueListWithWarningsResponse
+    SearchMatch,
+    IssueListWithWarningsResponse,
+    EpicRollupModel,
+    EpicRollupResponse,
+    SuggestionModel,
+    SuggestResponse
 )
-from app.utils.issue_filters import apply_unified_filters, apply_scope_filters
+from app.utils.issue_query import IssueQuery, execute_issue_query
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-def _apply_scope_filter(
-    issues: List[IssueModel],
-    chart_start_date: Optional[date],
-    chart_end_date: Optional[date]
-) -> List[IssueModel]:
-    """シンプルなスコープフィルタを適用"""
-    if not chart_start_date or not chart_end_date:
-        return issues
-    
-    filtered = []
-    for issue in issues:
-        # completed_atがある場合のみチェック
-        if issue.completed_at:
-            # timezone-awareなdatetimeから、UTCのdateを取得
-            completed_date = issue.completed_at.astimezone(timezone.utc).date() if issue.completed_at.tzinfo else issue.completed_at.date()
-            
-            # 除外ルール1: completed_atが期間終了日より未来
-            if completed_date > chart_end_date:
-                continue
-            
-            # 除外ルール2: completed_atが期間開始日より過去
-            if completed_date < chart_start_date:
-                continue
-        
-        # 除外ルールに該当しなければ含める（未完了または期間内完了）
-        filtered.append(issue)
-    
-    return filtered
-
-def _apply_advanced_filters(
-    issues: List[IssueModel], 
-    min_point: Optional[float], 
-    max_point: Optional[float], 
-    search: Optional[str],
-    kanban_status: Optional[str],
-    is_epic: Optional[str]
-) -> List[IssueModel]:
-    """高度フィルタ適用（統一フィルタは事前適用済み）"""
-    filtered = issues
-    
-    # Point範囲フィルタ
-    if min_point is not None:
-        filtered = [i for i in filtered if i.point is not None and i.point >= min_point]
-    if max_point is not None:
-        filtered = [i for i in filtered if i.point is not None and i.point <= max_point]
-    
-    # テキスト検索
-    if search:
-        search_lower = search.lower()
-        filtered = [
-            i for i in filtered 
-            if search_lower in i.title.lower() or search_lower in i.description.lower()
-        ]
-    
-    # Kanbanステータスフィルタ（追加）
-    if kanban_status:
-        filtered = [i for i in filtered if i.kanban_status == kanban_status]
-    
-    # Epicフィルタ
-    if is_epic:
-        original_count = len(filtered)
-        if is_epic == 'epic':
-            # is_epic が True の場合のみ
-            filtered = [i for i in filtered if i.is_epic is True]
-        elif is_epic == 'normal':
-            # is_epic が False または None の場合
-            filtered = [i for i in filtered if i.is_epic is not True]
-    
-    return filtered
+def _collect_metadata(index, issues: List[IssueModel]) -> Dict[str, Any]:
+    """メタデータ収集（転置インデックスから絞り込み結果のファセットを算出）"""
+    facets = index.facets({issue.id for issue in issues})
+    return {
+        'milestones': list(facets['milestone']),
+        'assignees': list(facets['assignee']),
+        'services': list(facets['service']),
+        'quarters': list(facets['quarter']),
+        'kanban_statuses': list(facets['kanban_status']),
+        'facets': facets
+    }
 
-def _sort_issues(issues: List[IssueModel], sort_by: str, sort_order: str) -> List[IssueModel]:
-    """Issue ソート"""
-    reverse = sort_order == 'desc'
-    
-    if sort_by == 'created_at':
-        return sorted(issues, key=lambda x: x.created_at, reverse=reverse)
-    elif sort_by == 'updated_at':
-        return sorted(issues, key=lambda x: x.updated_at or x.created_at, reverse=reverse)
-    elif sort_by == 'point':
-        return sorted(issues, key=lambda x: x.point or 0, reverse=reverse)
-    elif sort_by == 'title':
-        return sorted(issues, key=lambda x: x.title.lower(), reverse=reverse)
-    elif sort_by == 'state':
-        return sorted(issues, key=lambda x: x.state, reverse=reverse)
-    else:
-        return sorted(issues, key=lambda x: x.created_at, reverse=reverse)
+async def _execute_store_query(gitlab_client, query: IssueQuery, refresh: bool = False):
+    """同期済みのIssueストアに対して、転置インデックスを使ってクエリを実行
+    
+    Args:
+        refresh: 同期間隔に関わらず差分同期してから実行する
+    
+    Returns:
+        Tuple[IssueQueryResult, IssueIndex]: (実行結果, ストアの転置インデックス)
+    """
+    from app.services.issue_store import issue_store
+    store = issue_store.get_store(gitlab_client)
+    await issue_store.sync(store, force=refresh)
+    index = store.get_index()
+    return execute_issue_query(store.get_issues(), query, index), index
 
-def _paginate_issues(issues: List[IssueModel], page: int, per_page: int) -> List[IssueModel]:
-    """ページネーション"""
-    start = (page - 1) * per_page
-    end = start + per_page
-    return issues[start:end]
+def _statistics_issues(issues: List[IssueModel], query: IssueQuery) -> List[IssueModel]:
+    """統計情報の集計対象（従来のGitLab APIの絞り込みと同じく、マイルストーン・担当者と
+    サービス・四半期・Kanbanステータスのラベルで絞り込む。state・スコープ・追加フィルタは適用しない）"""
+    labels = []
+    if query.service:
+        labels.append(f"s:{query.service}")
+    if query.quarter:
+        labels.append(f"@{query.quarter}")
+    if query.kanban_status:
+        labels.append(f"#{query.kanban_status}")
+    return [
+        issue for issue in issues
+        if (not query.milestone or issue.milestone == query.milestone)
+        and (not query.assignee or issue.assignee == query.assignee)
+        and all(label in issue.labels for label in labels)
+    ]
 
-def _collect_metadata(issues: List[IssueModel]) -> Dict[str, Any]:
-    """メタデータ収集"""
-    return {
-        'milestones': sorted(list(set(i.milestone for i in issues if i.milestone))),
-        'assignees': sorted(list(set(i.assignee for i in issues if i.assignee))),
-        'services': sorted(list(set(i.service for i in issues if i.service))),
-        'quarters': sorted(list(set(i.quarter for i in issues if i.quarter))),
-        'kanban_statuses': sorted(list(set(i.kanban_status for i in issues if i.kanban_status)))
-    }
+def _validate_cursor(query: IssueQuery) -> None:
+    """カーソルの検証（不正な場合、発行時と検索条件が異なる場合は400）"""
+    try:
+        query.decode_cursor()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 def _issue_to_response(issue: IssueModel) -> IssueResponse:
     """IssueModel → IssueResponse変換"""
@@ -161,9 +114,11 @@ async def get_issues(
     sort_by: Optional[str] = Query('created_at'),
     sort_order: Optional[str] = Query('desc'),
     page: Optional[int] = Query(1),
-    per_page: Optional[int] = Query(50)
+    per_page: Optional[int] = Query(50),
+    cursor: Optional[str] = Query(None),
+    refresh: bool = Query(False, description="同期間隔に関わらずGitLabと差分同期してから取得するか")
 ):
-    """高度なフィルタ・検索対応Issues一覧取得"""
+    """高度なフィルタ・検索対応Issues一覧取得（cursor指定時は前ページのnext_cursorの続きを返す）"""
     if not x_session_id:
         raise HTTPException(status_code=401, detail="セッションIDが必要です")
     
@@ -171,12 +126,10 @@ async def get_issues(
     if not gitlab_client:
         raise HTTPException(status_code=404, detail="セッションが見つかりません")
     
-    # issue_serviceとissue_analyzerをセッション用に作成
+    # issue_serviceをセッション用に作成
     from app.services.issue_service import IssueService
-    from app.services.issue_analyzer import IssueAnalyzer
     issue_service = IssueService()
     issue_service.client = gitlab_client
-    issue_analyzer = IssueAnalyzer()
     
     try:
         # パラメータ正規化
@@ -189,71 +142,62 @@ async def get_issues(
         normalized_search = search if search and search.strip() else None
         normalized_is_epic = is_epic if is_epic and is_epic.strip() else None
         
-        # フィルタ条件構築
-        labels = []
-        if normalized_service:
-            labels.append(f"s:{normalized_service}")
-        if normalized_quarter:
-            labels.append(f"@{normalized_quarter}")
-        if normalized_kanban_status:
-            labels.append(f"#{normalized_kanban_status}")
-        
-        # Issue取得・分析（全状態で取得）
-        issues, statistics = await issue_service.get_analyzed_issues(
-            state='all',  # チャートと同様に全状態で取得
+        # Issueストア（全状態）から、値の一致条件は転置インデックスで解決し
+        # スコープ・stateフィルタ・追加フィルタ・ソート・ページネーションを適用
+        query = IssueQuery(
             milestone=normalized_milestone,
             assignee=normalized_assignee,
-            labels=labels if labels else None,
-            analyze=True
+            service=normalized_service,
+            quarter=normalized_quarter,
+            kanban_status=normalized_kanban_status,
+            min_point=min_point,
+            max_point=max_point,
+            search=normalized_search,
+            is_epic=normalized_is_epic,
+            state=normalized_state,
+            chart_start_date=chart_start_date,
+            chart_end_date=chart_end_date,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            page=page,
+            per_page=per_page,
+            cursor=cursor
         )
+        _validate_cursor(query)
+        result, index = await _execute_store_query(gitlab_client, query, refresh=refresh)
         
-        # スコープフィルタ適用（警告情報も取得）
-        warnings = []
-        if chart_start_date and chart_end_date:
-            issues, warnings = apply_scope_filters(issues, chart_start_date, chart_end_date)
-        else:
-            # 期間指定がない場合は統一フィルタのみ適用
-            issues = apply_unified_filters(issues, chart_start_date)
-        
-        # stateフィルタを後から適用
-        if normalized_state and normalized_state != 'all':
-            issues = [i for i in issues if i.state == normalized_state]
-        
-        # 追加フィルタ適用
-        filtered_issues = _apply_advanced_filters(
-            issues, min_point, max_point, normalized_search, normalized_kanban_status, normalized_is_epic
+        # 統計情報（除外ルール適用済みの全状態のissueを、マイルストーン・担当者・ラベルのみで絞り込み）
+        statistics = issue_service.generate_statistics(
+            _statistics_issues(index.store.get_issues(), query)
         )
         
-        
-        # ソート
-        sorted_issues = _sort_issues(filtered_issues, sort_by, sort_order)
-        
-        # ページネーション
-        paginated_issues = _paginate_issues(sorted_issues, page, per_page)
-        
         # メタデータ収集
-        metadata = _collect_metadata(filtered_issues)
+        metadata = _collect_metadata(index, result.matched)
         
         # 警告情報をレスポンス形式に変換
         excluded_issues = []
-        for warning in warnings:
+        for warning in result.warnings:
             excluded_issues.append(ExcludedIssue(
                 issue=_issue_to_response(warning['issue']),
                 reason=warning['reason']
             ))
         
         return {
-            'issues': [_issue_to_response(issue) for issue in paginated_issues],
+            'issues': [_issue_to_response(issue) for issue in result.issues],
             'warnings': [excluded.dict() for excluded in excluded_issues],
-            'total_count': len(filtered_issues),
+            'total_count': result.total_count,
             'warning_count': len(excluded_issues),
             'page': page,
             'per_page': per_page,
-            'total_pages': (len(filtered_issues) + per_page - 1) // per_page,
+            'total_pages': result.total_pages,
+            'next_cursor': result.next_cursor,
+            'data_changed': result.data_changed,
             'metadata': metadata,
             'statistics': statistics
         }
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Issues一覧取得API失敗: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -326,7 +270,7 @@ async def get_analyzed_issues(
             response['statistics'] = statistics
         
         return response
-        
+    
     except Exception as e:
         logger.error(f"分析済みIssues取得API失敗: {e}")
         raise HTTPException(status_code=500, detail=f"分析済みIssues取得に失敗しました: {str(e)}")
@@ -381,7 +325,7 @@ async def validate_issues_data(
                 'validation_rate': round((total_issues - issues_with_errors) / total_issues, 4) if total_issues > 0 else 0
             }
         }
-        
+    
     except Exception as e:
         logger.error(f"Issue検証API失敗: {e}")
         raise HTTPException(status_code=500, detail=f"Issue検証に失敗しました: {str(e)}")
@@ -469,7 +413,7 @@ async def get_issues_statistics(
             }
         
         return detailed_statistics
-        
+    
     except Exception as e:
         logger.error(f"Issue統計API失敗: {e}")
         raise HTTPException(status_code=500, detail=f"Issue統計取得に失敗しました: {str(e)}")
@@ -479,7 +423,8 @@ async def search_issues(
     search_request: IssueSearchRequest,
     x_session_id: Optional[str] = Header(None),
     chart_start_date: Optional[date] = Query(None),
-    chart_end_date: Optional[date] = Query(None)
+    chart_end_date: Optional[date] = Query(None),
+    refresh: bool = Query(False, description="同期間隔に関わらずGitLabと差分同期してから検索するか")
 ):
     """高度検索API"""
     if not x_session_id:
@@ -489,97 +434,62 @@ async def search_issues(
     if not gitlab_client:
         raise HTTPException(status_code=404, detail="セッションが見つかりません")
     
-    # issue_serviceをセッション用に作成
-    from app.services.issue_service import IssueService
-    issue_service = IssueService()
-    issue_service.client = gitlab_client
-    
     try:
-        # 検索条件をクエリパラメータ形式に変換
-        labels = []
-        if search_request.service:
-            labels.append(f"s:{search_request.service}")
-        if search_request.quarter:
-            labels.append(f"@{search_request.quarter}")
-        if search_request.kanban_status:
-            labels.append(f"#{search_request.kanban_status}")
-        
-        # Issue取得・分析（全状態で取得）
-        issues, statistics = await issue_service.get_analyzed_issues(
-            state='all',  # チャートと同様に全状態で取得
+        # Issueストア（全状態）から、値の一致条件は転置インデックスで解決し
+        # スコープ（チャートと同条件）・stateフィルタ・日付範囲フィルタ・追加フィルタ・ソート・ページネーションを適用
+        query = IssueQuery(
             milestone=search_request.milestone,
             assignee=search_request.assignee,
-            labels=labels if labels else None,
-            analyze=True
-        )
-        
-        # まず統一フィルタを適用（除外ルールと日付補正）
-        # 期間開始日を渡して日付補正を適用
-        issues = apply_unified_filters(issues, chart_start_date)
-        
-        # スコープフィルタ適用（チャートと同条件）
-        if chart_start_date and chart_end_date:
-            issues = _apply_scope_filter(issues, chart_start_date, chart_end_date)
-        
-        # stateフィルタを後から適用
-        if search_request.state and search_request.state != 'all':
-            issues = [i for i in issues if i.state == search_request.state]
-        
-        # 日付範囲フィルタ
-        if search_request.date_from or search_request.date_to:
-            filtered_issues = []
-            for issue in issues:
-                issue_date = issue.created_at
-                # Ensure timezone consistency for comparison
-                if issue_date.tzinfo is None:
-                    issue_date = issue_date.replace(tzinfo=timezone.utc)
-                
-                if search_request.date_from:
-                    from_date = search_request.date_from
-                    if from_date.tzinfo is None:
-                        from_date = from_date.replace(tzinfo=timezone.utc)
-                    if issue_date < from_date:
-                        continue
-                
-                if search_request.date_to:
-                    to_date = search_request.date_to
-                    if to_date.tzinfo is None:
-                        to_date = to_date.replace(tzinfo=timezone.utc)
-                    if issue_date > to_date:
-                        continue
-                
-                filtered_issues.append(issue)
-            issues = filtered_issues
-        
-        # 追加フィルタ適用
-        filtered_issues = _apply_advanced_filters(
-            issues, search_request.min_point, search_request.max_point,
-            search_request.query, search_request.kanban_status, search_request.is_epic
-        )
-        
-        # ソート
-        sorted_issues = _sort_issues(
-            filtered_issues, search_request.sort_by, search_request.sort_order
-        )
-        
-        # ページネーション
-        paginated_issues = _paginate_issues(
-            sorted_issues, search_request.page, search_request.per_page
+            service=search_request.service,
+            quarter=search_request.quarter,
+            kanban_status=search_request.kanban_status,
+            min_point=search_request.min_point,
+            max_point=search_request.max_point,
+            search=search_request.query,
+            fuzzy=search_request.fuzzy,
+            is_epic=search_request.is_epic,
+            state=search_request.state,
+            created_from=search_request.date_from,
+            created_to=search_request.date_to,
+            chart_start_date=chart_start_date,
+            chart_end_date=chart_end_date,
+            sort_by=search_request.sort_by,
+            sort_order=search_request.sort_order,
+            page=search_request.page,
+            per_page=search_request.per_page,
+            cursor=search_request.cursor
         )
+        _validate_cursor(query)
+        result, index = await _execute_store_query(gitlab_client, query, refresh=refresh)
         
         # メタデータ収集
-        metadata = _collect_metadata(filtered_issues)
+        metadata = _collect_metadata(index, result.matched)
+        
+        # ページ内のIssueの関連度・ハイライト位置（テキストインデックスから算出）
+        matches = []
+        if search_request.query:
+            for issue in result.issues:
+                matches.append(SearchMatch(
+                    issue_id=issue.id,
+                    score=result.scores.get(issue.id),
+                    highlights=index.text.highlights(issue.id, search_request.query, fuzzy=search_request.fuzzy)
+                ))
         
         return {
-            'issues': [_issue_to_response(issue) for issue in paginated_issues],
-            'total_count': len(filtered_issues),
+            'issues': [_issue_to_response(issue) for issue in result.issues],
+            'matches': [match.dict() for match in matches],
+            'total_count': result.total_count,
             'page': search_request.page,
             'per_page': search_request.per_page,
-            'total_pages': (len(filtered_issues) + search_request.per_page - 1) // search_request.per_page,
+            'total_pages': result.total_pages,
+            'next_cursor': result.next_cursor,
+            'data_changed': result.data_changed,
             'metadata': metadata,
             'search_criteria': search_request.dict()
         }
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"高度検索API失敗: {e}")
         raise HTTPException(status_code=500, detail=f"高度検索に失敗しました: {str(e)}")
@@ -663,7 +573,7 @@ async def export_issues_csv(
             media_type='text/csv',
             headers={'Content-Disposition': 'attachment; filename="issues.csv"'}
         )
-        
+    
     except Exception as e:
         logger.error(f"CSV エクスポートAPI失敗: {e}")
         raise HTTPException(status_code=500, detail=f"CSV エクスポートに失敗しました: {str(e)}")
@@ -719,7 +629,7 @@ async def get_issues_by_milestone(
             milestones=[milestone_name],
             assignees=list(set(issue.assignee for issue in issues if issue.assignee))
         )
-        
+    
     except Exception as e:
         logger.error(f"マイルストーン別Issues取得API失敗 ({milestone_name}): {e}")
         raise HTTPException(
@@ -727,6 +637,110 @@ async def get_issues_by_milestone(
             detail=f"マイルストーン別Issues取得に失敗しました: {str(e)}"
         )
 
+@router.get("/epics", response_model=EpicRollupResponse)
+async def get_epic_rollups(
+    sort_by: str = Query('remaining_points', description="並び順（remaining_points / total_points / progress / created_at）"),
+    sort_order: str = Query('desc'),
+    x_session_id: Optional[str] = Header(None)
+):
+    """エピック別の子issue集計一覧
+    
+    エピックのissueリンクから子issueを特定し、子エピックを含む配下のポイント・
+    完了ポイント・残ポイントを集計する
+    """
+    if not x_session_id:
+        raise HTTPException(status_code=401, detail="セッションIDが必要です")
+    
+    gitlab_client = session_manager.get_gitlab_client(x_session_id)
+    if not gitlab_client:
+        raise HTTPException(status_code=404, detail="セッションが見つかりません")
+    
+    sort_fields = ['remaining_points', 'total_points', 'progress', 'created_at']
+    if sort_by not in sort_fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"sort_byには {', '.join(sort_fields)} のいずれかを指定してください"
+        )
+    
+    from app.services.issue_store import issue_store
+    from app.services.epic_rollup_service import epic_rollup_service
+    
+    try:
+        issues = await issue_store.get_issues(gitlab_client)
+        rollups, fetched = await epic_rollup_service.get_epic_rollups(gitlab_client, issues)
+        
+        if sort_by == 'created_at':
+            rollups.sort(key=lambda rollup: rollup['epic'].created_at, reverse=sort_order == 'desc')
+        else:
+            rollups.sort(key=lambda rollup: rollup[sort_by], reverse=sort_order == 'desc')
+        
+        return EpicRollupResponse(
+            epics=[
+                EpicRollupModel(
+                    **{key: value for key, value in rollup.items() if key != 'epic'},
+                    epic=_issue_to_response(rollup['epic'])
+                )
+                for rollup in rollups
+            ],
+            total_count=len(rollups),
+            metadata={
+                'fetched_links': fetched,
+                'sort_by': sort_by,
+                'sort_order': sort_order
+            }
+        )
+    
+    except Exception as e:
+        logger.error(f"エピック集計API失敗: {e}")
+        raise HTTPException(status_code=500, detail=f"エピック集計に失敗しました: {str(e)}")
+
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest_issue_values(
+    field: str = Query(..., description="候補の項目（title / assignee / milestone / label / service / quarter / kanban_status）"),
+    prefix: str = Query('', description="入力中の文字列（前方一致、全角・半角とカタカナ・ひらがなは区別しない）"),
+    limit: int = Query(10, ge=1, le=100),
+    x_session_id: Optional[str] = Header(None)
+):
+    """入力補完（フィルタのドロップダウン・検索ボックス用）
+    
+    Issueストアの前方一致用インデックスから、prefixで始まる値を正規化済みの値の昇順に返す。
+    titleはタイトル中の単語（日本語は各文字）から始まる部分に一致するissueを返す
+    """
+    if not x_session_id:
+        raise HTTPException(status_code=401, detail="セッションIDが必要です")
+    
+    gitlab_client = session_manager.get_gitlab_client(x_session_id)
+    if not gitlab_client:
+        raise HTTPException(status_code=404, detail="セッションが見つかりません")
+    
+    from app.services.suggest_index import SUGGEST_FIELDS
+    if field not in SUGGEST_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"fieldには {', '.join(SUGGEST_FIELDS)} のいずれかを指定してください"
+        )
+    
+    from app.services.issue_store import issue_store
+    
+    try:
+        store = issue_store.get_store(gitlab_client)
+        await issue_store.sync(store)
+        index = store.get_index()
+        
+        suggestions = []
+        for value, count in index.suggest.suggest(field, prefix, limit):
+            if field == 'title':
+                issue = store.get_issue(value)
+                suggestions.append(SuggestionModel(value=issue.title, issue_id=issue.id, iid=issue.iid))
+            else:
+                suggestions.append(SuggestionModel(value=value, count=count))
+        
+        return SuggestResponse(field=field, prefix=prefix, suggestions=suggestions)
+    
+    except Exception as e:
+        logger.error(f"入力補完API失敗: {e}")
+        raise HTTPException(status_code=500, detail=f"入力補完に失敗しました: {str(e)}")
+
 @router.get("/{issue_id}", response_model=IssueResponse)
 async def get_issue(
     issue_id: int,
@@ -771,7 +785,7 @@ async def get_issue(
             completed_at=issue.completed_at,
             is_epic=issue.is_epic
         )
-        
+    
     except HTTPException:
         raise
     except Exception as e:
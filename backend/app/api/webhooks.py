@@ -0,0 +1,71 @@
+from fastapi import APIRouter, HTTPException, Header, Request, BackgroundTasks
+from typing import Optional
+import hmac
+import logging
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Issueストアの同期対象とするWebhookイベント
+ISSUE_EVENT_KINDS = ['issue', 'work_item']
+
+# issue削除を表すWebhookのaction（差分同期では削除を検知できないため、ストアから直接削除する）
+ISSUE_DELETE_ACTIONS = ['delete']
+
+@router.post("/gitlab")
+async def receive_gitlab_webhook(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    x_gitlab_token: Optional[str] = Header(None)
+):
+    """GitLab Webhook受信
+    
+    Issueイベントを受信した場合、該当プロジェクトのIssueストアを差分同期する。
+    同期はレスポンス返却後にバックグラウンドで実行し、変更されたissueの差分だけ
+    チャートの累積値に反映される。削除イベントの場合はストアからissueを削除する。
+    
+    検証トークン（gitlab_webhook_secret）が未設定の場合は受信しない
+    """
+    if not settings.gitlab_webhook_secret:
+        raise HTTPException(status_code=503, detail="Webhookの検証トークンが設定されていません")
+    if not x_gitlab_token or not hmac.compare_digest(x_gitlab_token, settings.gitlab_webhook_secret):
+        raise HTTPException(status_code=401, detail="Webhookトークンが不正です")
+    
+    try:
+        payload = await request.json()
+    except Exception:
+        raise HTTPException(status_code=400, detail="Webhookの本文が不正です")
+    
+    object_kind = payload.get('object_kind')
+    project_id = (payload.get('project') or {}).get('id')
+    if object_kind not in ISSUE_EVENT_KINDS or project_id is None:
+        return {'status': 'ignored', 'object_kind': object_kind}
+    
+    from app.services.issue_store import issue_store
+    stores = [store for store in issue_store.find_stores(project_id) if store.is_loaded]
+    attributes = payload.get('object_attributes') or {}
+    issue_id = attributes.get('id')
+    deleted = attributes.get('action') in ISSUE_DELETE_ACTIONS and issue_id is not None
+    for store in stores:
+        if deleted:
+            background_tasks.add_task(_remove_issue, store, issue_id)
+        else:
+            background_tasks.add_task(_sync_store, store)
+    
+    logger.info(f"GitLab Webhook受信: {object_kind} (project: {project_id}, 同期対象: {len(stores)}件)")
+    return {'status': 'accepted', 'object_kind': object_kind, 'stores': len(stores), 'deleted': deleted}
+
+async def _sync_store(store) -> None:
+    """Webhook受信後のIssueストア差分同期"""
+    from app.services.issue_store import issue_store
+    try:
+        await issue_store.sync(store, force=True)
+    except Exception as e:
+        logger.error(f"Webhook差分同期失敗 ({store.project_key}): {e}")
+
+async def _remove_issue(store, issue_id: int) -> None:
+    """Webhook受信後のIssueストアからのissue削除"""
+    async with store.lock:
+        if store.remove(issue_id):
+            logger.info(f"Issueストアから削除: {store.project_key} (issue: {issue_id})")
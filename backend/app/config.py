@@ -17,6 +17,45 @@ class Settings(BaseSettings):
     api_host: str = "127.0.0.1"
     api_port: int = 8000
     
+    # チャート画像描画設定
+    chart_render_workers: int = 2
+    chart_render_cache_size: int = 128
+    
+    # チャート画像の埋め込み用トークン（有効期間・署名鍵、鍵の未設定時はプロセスごとの乱数）
+    chart_image_token_seconds: int = 300
+    chart_image_token_secret: Optional[str] = None
+    
+    # チャートスナップショット保存先（終了済み期間の日別累積値）
+    chart_snapshot_dir: str = "/tmp/chart_snapshots"
+    
+    # Issueストア設定（差分同期間隔・全件再取得間隔、秒）
+    issue_store_sync_seconds: int = 30
+    issue_store_refresh_seconds: int = 3600
+    
+    # issueごとのGitLab API（ラベルイベント・issueリンク）の同時取得数
+    gitlab_fetch_concurrency: int = 8
+    
+    # ラベルイベントのキャッシュ上限（プロジェクト数・プロジェクトごとのissue数）
+    label_event_cache_projects: int = 16
+    label_event_cache_issues: int = 5000
+    
+    # マイルストーンのキャッシュ期間（秒）・キャッシュするプロジェクト数の上限
+    milestone_cache_seconds: int = 300
+    milestone_cache_projects: int = 16
+    
+    # issueリンク（エピック集計用）のキャッシュ期間（秒）
+    issue_link_cache_seconds: int = 600
+    
+    # issueリンクのキャッシュ上限（プロジェクト数・プロジェクトごとのエピック数）
+    issue_link_cache_projects: int = 16
+    issue_link_cache_issues: int = 5000
+    
+    # Issue検索でCJK文字の2-gramをインデックスする（日本語の2文字の検索語を高速化）
+    search_cjk_bigrams: bool = True
+    
+    # GitLab Webhook設定（X-Gitlab-Tokenヘッダーの検証用、未設定時はWebhookを503で拒否）
+    gitlab_webhook_secret: Optional[str] = None
+    
     class Config:
         env_file = ".env"
 
@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import issues, charts, gitlab_config
+from app.api import issues, charts, gitlab_config, webhooks
 from app.config import settings
 import logging
 
@@ -27,6 +27,7 @@ app.add_middleware(
 app.include_router(issues.router, prefix="/api/issues", tags=["issues"])
 app.include_router(charts.router, prefix="/api/charts", tags=["charts"])
 app.include_router(gitlab_config.router, prefix="/api/gitlab", tags=["gitlab"])
+app.include_router(webhooks.router, prefix="/api/webhooks", tags=["webhooks"])
 
 @app.get("/")
 async def root():
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-from datetime import date
+from datetime import date, datetime
 
 class ChartDataModel(BaseModel):
     date: date
@@ -27,14 +27,179 @@ class BurnChartRequest(BaseModel):
     end_date: date
     chart_type: str  # 'burn_down' or 'burn_up'
 
+class ChartColumnsModel(BaseModel):
+    """列形式のチャートデータ（各リストはdatesと同じ長さ）"""
+    dates: List[date]
+    planned: List[float]
+    actual: List[float]
+    remaining: List[float]
+    completed: List[float]
+    total: List[float]
+    completed_issues: List[int]
+    total_issues: List[int]
+
+class ChartSeriesModel(BaseModel):
+    """グループ別チャート系列"""
+    key: Optional[str] = None  # グループ値（未設定のissueはNone）
+    chart_data: List[ChartDataModel] = []
+    columns: Optional[ChartColumnsModel] = None  # format=columnar指定時のみ
+    total_issues: int = 0
+    total_points: float = 0.0
+    statistics: dict = {}
+
+class ScopeChangeColumnsModel(BaseModel):
+    """日別のスコープ変化（各リストはdatesと同じ長さ）"""
+    dates: List[date]
+    added: List[float]  # スコープに追加されたポイント
+    removed: List[float]  # スコープから外れたポイント
+    reestimated: List[float]  # 再見積もりによるポイント増減
+    scope: List[float]  # 日末時点のスコープ
+
+class ScopeChangeModel(BaseModel):
+    """ラベル履歴によるスコープ変化"""
+    columns: ScopeChangeColumnsModel
+    summary: dict
+
 class BurnChartResponse(BaseModel):
-    chart_data: List[ChartDataModel]
+    chart_data: List[ChartDataModel] = []
     metadata: dict
     statistics: dict
     warnings: Optional[List[Dict[str, Any]]] = []
+    groups: Optional[List[ChartSeriesModel]] = None  # group_by指定時のみ
+    columns: Optional[ChartColumnsModel] = None  # format=columnar指定時のみ（chart_dataは空）
+    scope_changes: Optional[ScopeChangeModel] = None  # Burn-upでscope_changes指定時のみ
+
+class ChartImageTokenResponse(BaseModel):
+    """チャート画像の埋め込み用トークン"""
+    token: str
+    url: str  # トークン付きの画像URL
+    expires_at: datetime
 
 class VelocityDataModel(BaseModel):
     week_start: date
     week_end: date
     completed_points: float
-    completed_issues: int
\ No newline at end of file
+    completed_issues: int
+
+class DashboardChartResponse(BaseModel):
+    """ダッシュボード用チャート一括レスポンス"""
+    burn_down: List[ChartDataModel] = []
+    burn_up: List[ChartDataModel] = []
+    velocity: List[VelocityDataModel]
+    metadata: dict
+    statistics: dict
+    warnings: Optional[List[Dict[str, Any]]] = []
+    burn_down_columns: Optional[ChartColumnsModel] = None  # format=columnar指定時のみ
+    burn_up_columns: Optional[ChartColumnsModel] = None  # format=columnar指定時のみ
+
+class ChartPeriodModel(BaseModel):
+    """複数期間チャートの期間指定"""
+    start_date: date
+    end_date: date
+    label: Optional[str] = None  # 表示用ラベル（例: FY25Q1）
+
+class BatchChartRequest(BaseModel):
+    """複数期間チャート一括リクエスト"""
+    periods: List[ChartPeriodModel]
+
+class PeriodChartModel(BaseModel):
+    """期間別のBurn-down/Burn-upチャート"""
+    label: Optional[str] = None
+    start_date: date
+    end_date: date
+    burn_down: List[ChartDataModel] = []
+    burn_up: List[ChartDataModel] = []
+    burn_down_columns: Optional[ChartColumnsModel] = None  # format=columnar指定時のみ
+    burn_up_columns: Optional[ChartColumnsModel] = None  # format=columnar指定時のみ
+    total_issues: int = 0
+    total_points: float = 0.0
+    statistics: dict = {}
+    warning_counts: Dict[str, int] = {}  # スコープ外となった理由別の件数
+
+class BatchChartResponse(BaseModel):
+    """複数期間チャート一括レスポンス"""
+    periods: List[PeriodChartModel]
+    metadata: dict
+
+class MilestoneChartModel(BaseModel):
+    """マイルストーン別のBurn-downチャート概要"""
+    id: int
+    iid: int
+    title: str
+    start_date: date
+    due_date: date
+    web_url: Optional[str] = None
+    total_issues: int = 0
+    total_points: float = 0.0
+    completed_points: float = 0.0  # 基準日（今日と期限日の早い方）時点
+    remaining_points: float = 0.0  # 基準日時点
+    planned_remaining_points: float = 0.0  # 基準日時点の計画線
+    statistics: dict = {}
+    warning_counts: Dict[str, int] = {}
+    burn_down: List[ChartDataModel] = []  # include_series指定時のみ
+    burn_down_columns: Optional[ChartColumnsModel] = None  # include_series・format=columnar指定時のみ
+
+class MilestoneChartResponse(BaseModel):
+    """マイルストーン別Burn-downチャート一括レスポンス"""
+    milestones: List[MilestoneChartModel]
+    skipped: List[Dict[str, Any]] = []  # 期間を決められないマイルストーン
+    metadata: dict
+
+class ForecastPercentileModel(BaseModel):
+    """完了予測のパーセンタイル"""
+    percentile: int
+    completion_date: Optional[date] = None  # シミュレーション上限内に完了しない場合はNone
+    steps: Optional[int] = None  # 基準日からの営業日数 or 週数
+
+class ForecastResponse(BaseModel):
+    """モンテカルロ完了予測レスポンス"""
+    as_of: date
+    unit: str
+    remaining_points: float
+    trials: int
+    seed: Optional[int] = None
+    percentiles: List[ForecastPercentileModel]
+    probability_by_end_date: float
+    history: dict
+    metadata: dict
+
+class CumulativeFlowSeriesModel(BaseModel):
+    """累積フロー図のKanban Status別系列"""
+    status: str
+    counts: List[int]  # datesと同じ長さの日別issue数
+
+class CumulativeFlowResponse(BaseModel):
+    """累積フロー図レスポンス"""
+    dates: List[date]
+    series: List[CumulativeFlowSeriesModel]
+    metadata: dict
+    warnings: Optional[List[Dict[str, Any]]] = []
+
+class FlowTimePercentileModel(BaseModel):
+    """リードタイム・サイクルタイムのパーセンタイル"""
+    percentile: int
+    days: Optional[float] = None  # 対象issueがない場合はNone
+
+class FlowTimeGroupModel(BaseModel):
+    """リードタイム・サイクルタイムのグループ別分布"""
+    key: Optional[str] = None  # グループ値（全体・未設定のissueはNone）
+    count: int
+    mean_days: Optional[float] = None
+    min_days: Optional[float] = None
+    max_days: Optional[float] = None
+    percentiles: List[FlowTimePercentileModel]
+    histogram: List[int]  # 0日からbin_days日幅の階級ごとのissue数
+
+class FlowTimeDistributionModel(BaseModel):
+    """リードタイム・サイクルタイムの分布"""
+    overall: FlowTimeGroupModel
+    by_service: List[FlowTimeGroupModel]
+    by_assignee: List[FlowTimeGroupModel]
+
+class FlowTimeResponse(BaseModel):
+    """リードタイム・サイクルタイム分析レスポンス"""
+    bin_days: int
+    lead_time: FlowTimeDistributionModel
+    cycle_time: FlowTimeDistributionModel
+    metadata: dict
+    warnings: Optional[List[Dict[str, Any]]] = []
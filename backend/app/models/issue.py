@@ -76,10 +76,26 @@ class IssueSearchRequest(BaseModel):
     is_epic: Optional[str] = None
     date_from: Optional[datetime] = None
     date_to: Optional[datetime] = None
-    sort_by: Optional[str] = 'created_at'
+    fuzzy: bool = False  # 編集距離の近い語も該当とする（typo対策）
+    sort_by: Optional[str] = 'created_at'  # 'relevance' は検索語との関連度順
     sort_order: Optional[str] = 'desc'
     page: Optional[int] = 1
     per_page: Optional[int] = 50
+    cursor: Optional[str] = None  # 前ページのnext_cursor（指定時はpageを無視）
+
+
+class SearchHighlight(BaseModel):
+    """検索語に一致した位置（元のタイトル・説明文での文字位置）"""
+    field: str  # 'title' or 'description'
+    start: int
+    end: int
+
+
+class SearchMatch(BaseModel):
+    """検索結果のIssueごとの関連度・ハイライト位置"""
+    issue_id: int
+    score: Optional[float] = None  # sort_by='relevance' の場合のみ
+    highlights: List[SearchHighlight] = []
 
 
 class ExcludedIssue(BaseModel):
@@ -94,4 +110,38 @@ class IssueListWithWarningsResponse(BaseModel):
     warnings: List[ExcludedIssue]
     total_count: int
     filtered_count: int
-    warning_count: int
\ No newline at end of file
+    warning_count: int
+
+class EpicRollupModel(BaseModel):
+    """エピックの子issue集計"""
+    epic: IssueResponse
+    total_issues: int = 0
+    completed_issues: int = 0
+    total_points: float = 0.0
+    completed_points: float = 0.0
+    remaining_points: float = 0.0
+    progress: float = 0.0  # completed_points / total_points
+    children: List[int] = []  # 直下の子issue ID（エピック以外）
+    child_epics: List[int] = []  # 直下の子エピックID
+
+
+class EpicRollupResponse(BaseModel):
+    """エピック集計一覧レスポンス"""
+    epics: List[EpicRollupModel]
+    total_count: int
+    metadata: Dict[str, Any]
+
+
+class SuggestionModel(BaseModel):
+    """入力補完の候補"""
+    value: str  # 値（titleの場合はタイトル）
+    count: int = 1  # 値を持つissue数
+    issue_id: Optional[int] = None  # titleの場合のみ
+    iid: Optional[int] = None  # titleの場合のみ
+
+
+class SuggestResponse(BaseModel):
+    """入力補完レスポンス"""
+    field: str
+    prefix: str
+    suggestions: List[SuggestionModel]
@@ -1,13 +1,30 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from datetime import datetime, date, timedelta, timezone
 from collections import defaultdict
 import logging
 from app.models.issue import IssueModel
 from app.models.chart import ChartDataModel, BurnChartRequest, BurnChartResponse
 from app.utils.business_days import BusinessDayCalculator
+from app.utils.chart_sampling import (
+    resolve_granularity,
+    select_granularity_indices,
+    downsample_indices
+)
 
 logger = logging.getLogger(__name__)
 
+# グループ別チャートでグループ化できる項目
+GROUP_BY_FIELDS = ['service', 'assignee', 'milestone']
+
+# 累積フロー図のKanban Status表示順（未定義のステータスは名前順で後ろに並べる）
+KANBAN_STATUS_ORDER = ['未着手', '作業中', 'レビュー中', 'ブロック中', '共有待ち', '完了']
+
+# 列形式チャートデータのキー（ChartDataModelの各フィールドに対応）
+CHART_COLUMNS = [
+    'dates', 'planned', 'actual', 'remaining', 'completed',
+    'total', 'completed_issues', 'total_issues'
+]
+
 class ChartAnalyzer:
     """Burn-up/Burn-downチャート分析サービス"""
     
@@ -18,306 +35,719 @@ class ChartAnalyzer:
         self,
         issues: List[IssueModel],
         start_date: date,
-        end_date: date
+        end_date: date,
+        granularity: str = 'day',
+        max_points: Optional[int] = None
     ) -> List[ChartDataModel]:
         """Burn-downチャートデータ生成
         
         Note: issuesは事前にフィルタリング済みであることを前提とする
         """
+        return self.columns_to_rows(self.generate_burn_down_columns(
+            issues, start_date, end_date, granularity, max_points
+        ))
+    
+    def generate_burn_up_data(
+        self,
+        issues: List[IssueModel],
+        start_date: date,
+        end_date: date,
+        granularity: str = 'day',
+        max_points: Optional[int] = None
+    ) -> List[ChartDataModel]:
+        """Burn-upチャートデータ生成
+        
+        Note: issuesは事前にフィルタリング済みであることを前提とする
+        """
+        return self.columns_to_rows(self.generate_burn_up_columns(
+            issues, start_date, end_date, granularity, max_points
+        ))
+    
+    def generate_burn_charts(
+        self,
+        issues: List[IssueModel],
+        start_date: date,
+        end_date: date,
+        granularity: str = 'day',
+        max_points: Optional[int] = None
+    ) -> Tuple[List[ChartDataModel], List[ChartDataModel]]:
+        """Burn-down/Burn-upチャートデータを一括生成
+        
+        Returns:
+            Tuple[List[ChartDataModel], List[ChartDataModel]]: (Burn-down, Burn-up)
+        """
+        burn_down, burn_up = self.generate_burn_chart_columns(
+            issues, start_date, end_date, granularity, max_points
+        )
+        return self.columns_to_rows(burn_down), self.columns_to_rows(burn_up)
+    
+    def generate_grouped_chart_data(
+        self,
+        issues: List[IssueModel],
+        start_date: date,
+        end_date: date,
+        group_by: str,
+        chart_type: str,
+        granularity: str = 'day',
+        max_points: Optional[int] = None
+    ) -> Tuple[List[ChartDataModel], Dict[Optional[str], List[ChartDataModel]]]:
+        """グループ別チャートデータ生成
+        
+        Returns:
+            Tuple[List[ChartDataModel], Dict[Optional[str], List[ChartDataModel]]]:
+                (合計のチャートデータ, グループ値別のチャートデータ)
+        """
+        total, groups = self.generate_grouped_chart_columns(
+            issues, start_date, end_date, group_by, chart_type, granularity, max_points
+        )
+        return self.columns_to_rows(total), {
+            key: self.columns_to_rows(columns) for key, columns in groups.items()
+        }
+    
+    def generate_burn_down_columns(
+        self,
+        issues: List[IssueModel],
+        start_date: date,
+        end_date: date,
+        granularity: str = 'day',
+        max_points: Optional[int] = None
+    ) -> Dict[str, List[Any]]:
+        """Burn-downチャートデータを列形式で生成
+        
+        Note: issuesは事前にフィルタリング済みであることを前提とする
+        
+        累積値は日次で計算し、granularity・max_pointsに応じて選択した日付の値のみ出力する
+        
+        Returns:
+            Dict[str, List[Any]]: CHART_COLUMNSをキーとする同じ長さのリスト
+        """
         try:
-            # 事前フィルタリング済みのissuesを使用
-            filtered_issues = issues
-            
-            # 日付範囲生成
             date_range = self._generate_date_range(start_date, end_date)
-            
-            # 開始時点の総ポイント計算（期間内のポイントの合計）
-            total_points = sum(
-                issue.point for issue in filtered_issues 
-                if issue.point
+            counters = self._build_daily_counters(issues, start_date, len(date_range))
+            progress = self.business_day_calc.calculate_business_day_progress_series(
+                start_date, end_date, date_range
             )
-            
-            chart_data = []
-            for current_date in date_range:
-                # その日時点での残りポイント計算
-                completed_points = self._calculate_completed_points_by_date(
-                    filtered_issues, current_date
-                )
-                remaining_points = total_points - completed_points
-                
-                # 理想線計算
-                ideal_remaining = self._calculate_ideal_remaining(
-                    total_points, start_date, end_date, current_date
-                )
-                
-                chart_data.append(ChartDataModel(
-                    date=current_date,
-                    planned_points=ideal_remaining,
-                    actual_points=remaining_points,
-                    remaining_points=remaining_points,
-                    completed_points=completed_points,
-                    total_points=total_points,
-                    completed_issues=self._count_completed_issues_by_date(
-                        filtered_issues, current_date
-                    ),
-                    total_issues=len(filtered_issues)
-                ))
+            indices = self._select_indices(date_range, counters, start_date, end_date, granularity, max_points)
+            columns = self._build_burn_down_columns(date_range, counters, progress, indices)
             
             # データ整合性チェック
-            self._validate_burn_down_data(chart_data, total_points)
+            self._validate_burn_down_data(columns, counters['total_points'])
             
-            return chart_data
+            return columns
             
         except Exception as e:
             logger.error(f"Burn-downデータ生成失敗: {e}")
             raise
     
-    def generate_burn_up_data(
+    def generate_burn_up_columns(
         self,
         issues: List[IssueModel],
         start_date: date,
-        end_date: date
-    ) -> List[ChartDataModel]:
-        """Burn-upチャートデータ生成
+        end_date: date,
+        granularity: str = 'day',
+        max_points: Optional[int] = None
+    ) -> Dict[str, List[Any]]:
+        """Burn-upチャートデータを列形式で生成
         
         Note: issuesは事前にフィルタリング済みであることを前提とする
+        
+        累積値は日次で計算し、granularity・max_pointsに応じて選択した日付の値のみ出力する
+        
+        Returns:
+            Dict[str, List[Any]]: CHART_COLUMNSをキーとする同じ長さのリスト
         """
         try:
-            # 事前フィルタリング済みのissuesを使用
-            filtered_issues = issues
-            
             date_range = self._generate_date_range(start_date, end_date)
-            
-            # 総ポイント（BurnUp仕様：created_atタイミングで増加）
-            total_points_by_date = self._calculate_total_points_by_created_date(
-                filtered_issues, date_range
+            counters = self._build_daily_counters(issues, start_date, len(date_range))
+            progress = self.business_day_calc.calculate_business_day_progress_series(
+                start_date, end_date, date_range
             )
-            
-            chart_data = []
-            for current_date in date_range:
-                completed_points = self._calculate_completed_points_by_date(
-                    filtered_issues, current_date
-                )
-                total_points = total_points_by_date.get(current_date, 0)
-                
-                # 理想線計算（スコープ変更対応）
-                ideal_completed = self._calculate_ideal_completed(
-                    total_points, start_date, end_date, current_date
-                )
-                
-                chart_data.append(ChartDataModel(
-                    date=current_date,
-                    planned_points=ideal_completed,
-                    actual_points=completed_points,
-                    total_points=total_points,
-                    completed_points=completed_points,
-                    remaining_points=total_points - completed_points,
-                    total_issues=len(filtered_issues),
-                    completed_issues=self._count_completed_issues_by_date(
-                        filtered_issues, current_date
-                    )
-                ))
+            indices = self._select_indices(date_range, counters, start_date, end_date, granularity, max_points)
+            columns = self._build_burn_up_columns(date_range, counters, progress, indices)
             
             # データ整合性チェック
-            self._validate_burn_up_data(chart_data)
+            self._validate_burn_up_data(columns)
             
-            return chart_data
+            return columns
             
         except Exception as e:
             logger.error(f"Burn-upデータ生成失敗: {e}")
             raise
     
-    def _filter_by_milestone(
-        self, 
-        issues: List[IssueModel], 
-        milestone: Optional[str]
-    ) -> List[IssueModel]:
-        """マイルストーンフィルタ"""
-        if not milestone:
-            return issues
-        return [issue for issue in issues if issue.milestone == milestone]
+    def generate_burn_chart_columns(
+        self,
+        issues: List[IssueModel],
+        start_date: date,
+        end_date: date,
+        granularity: str = 'day',
+        max_points: Optional[int] = None
+    ) -> Tuple[Dict[str, List[Any]], Dict[str, List[Any]]]:
+        """Burn-down/Burn-upチャートデータを列形式で一括生成
+        
+        日別の累積値は一度の走査で算出し、両チャートで共有する
+        
+        Returns:
+            Tuple[Dict[str, List[Any]], Dict[str, List[Any]]]: (Burn-down, Burn-up)
+        """
+        try:
+            date_range = self._generate_date_range(start_date, end_date)
+            counters = self._build_daily_counters(issues, start_date, len(date_range))
+            return self._build_burn_chart_columns(
+                date_range, counters, start_date, end_date, granularity, max_points
+            )
+            
+        except Exception as e:
+            logger.error(f"チャートデータ一括生成失敗: {e}")
+            raise
     
-    def _generate_date_range(self, start_date: date, end_date: date) -> List[date]:
-        """日付範囲生成"""
-        dates = []
-        current = start_date
-        while current <= end_date:
-            dates.append(current)
-            current += timedelta(days=1)
-        return dates
+    def generate_burn_chart_columns_from_counters(
+        self,
+        counters: Dict[str, Any],
+        start_date: date,
+        end_date: date,
+        granularity: str = 'day',
+        max_points: Optional[int] = None
+    ) -> Tuple[Dict[str, List[Any]], Dict[str, List[Any]]]:
+        """日別累積値からBurn-down/Burn-upチャートデータを列形式で生成
+        
+        Returns:
+            Tuple[Dict[str, List[Any]], Dict[str, List[Any]]]: (Burn-down, Burn-up)
+        """
+        date_range = self._generate_date_range(start_date, end_date)
+        return self._build_burn_chart_columns(
+            date_range, counters, start_date, end_date, granularity, max_points
+        )
     
-    def _calculate_completed_points_by_date(
-        self, 
-        issues: List[IssueModel], 
-        target_date: date
-    ) -> float:
-        """指定日時点での完了ポイント計算"""
-        completed_points = 0
-        for issue in issues:
-            if issue.completed_at and issue.point:
-                completed_date = issue.completed_at.astimezone(timezone.utc).date() if issue.completed_at.tzinfo else issue.completed_at.date()
-                if completed_date <= target_date:
-                    completed_points += issue.point
-        return completed_points
+    def generate_period_chart_columns(
+        self,
+        records: List[Tuple[Optional[int], Optional[int], Optional[float]]],
+        start_date: date,
+        end_date: date,
+        granularity: str = 'day',
+        max_points: Optional[int] = None
+    ) -> Tuple[Dict[str, List[Any]], Dict[str, List[Any]]]:
+        """期間インデックスのレコードからBurn-down/Burn-upチャートデータを列形式で生成
+        
+        Args:
+            records: PeriodIssueIndex.selectの集計レコード（作成日序数, 完了日序数, ポイント）
+        
+        Returns:
+            Tuple[Dict[str, List[Any]], Dict[str, List[Any]]]: (Burn-down, Burn-up)
+        """
+        try:
+            date_range = self._generate_date_range(start_date, end_date)
+            counters = self._build_ordinal_daily_counters(records, start_date, len(date_range))
+            return self._build_burn_chart_columns(
+                date_range, counters, start_date, end_date, granularity, max_points
+            )
+            
+        except Exception as e:
+            logger.error(f"期間別チャートデータ生成失敗 ({start_date} - {end_date}): {e}")
+            raise
+    
+    def generate_grouped_chart_columns(
+        self,
+        issues: List[IssueModel],
+        start_date: date,
+        end_date: date,
+        group_by: str,
+        chart_type: str,
+        granularity: str = 'day',
+        max_points: Optional[int] = None
+    ) -> Tuple[Dict[str, List[Any]], Dict[Optional[str], Dict[str, List[Any]]]]:
+        """グループ別チャートデータを列形式で生成
+        
+        issueをgroup_byの値で分割し、全グループと合計の累積値を同じ走査で計算する
+        
+        Args:
+            issues: 事前フィルタリング済みのissue
+            start_date: 期間開始日
+            end_date: 期間終了日
+            group_by: グループ化する項目（GROUP_BY_FIELDS）
+            chart_type: 'burn_down' or 'burn_up'
+            granularity: 出力粒度（'day' / 'week' / 'month' / 'auto'）
+            max_points: 最大点数（超える場合は形状を保って間引く）
+            
+        Returns:
+            Tuple[Dict[str, List[Any]], Dict[Optional[str], Dict[str, List[Any]]]]:
+                (合計のチャートデータ, グループ値別のチャートデータ)
+        """
+        if group_by not in GROUP_BY_FIELDS:
+            raise ValueError(f"未対応のグループ化項目です: {group_by}")
+        
+        try:
+            date_range = self._generate_date_range(start_date, end_date)
+            total_counters, group_counters = self._build_grouped_daily_counters(
+                issues, start_date, len(date_range), lambda issue: getattr(issue, group_by)
+            )
+            progress = self.business_day_calc.calculate_business_day_progress_series(
+                start_date, end_date, date_range
+            )
+            build_columns = self._build_burn_down_columns if chart_type == 'burn_down' else self._build_burn_up_columns
+            
+            # 全グループで同じ日付を使うため、間引きは合計の系列で決める
+            indices = self._select_indices(date_range, total_counters, start_date, end_date, granularity, max_points)
+            total_columns = build_columns(date_range, total_counters, progress, indices)
+            grouped_columns = {
+                key: build_columns(date_range, counters, progress, indices)
+                for key, counters in group_counters.items()
+            }
+            return total_columns, grouped_columns
+            
+        except Exception as e:
+            logger.error(f"グループ別チャートデータ生成失敗 (group_by={group_by}): {e}")
+            raise
     
-    def _count_completed_issues_by_date(
-        self, 
-        issues: List[IssueModel], 
-        target_date: date
-    ) -> int:
-        """指定日時点での完了issue数計算"""
-        count = 0
+    @staticmethod
+    def columns_to_rows(columns: Dict[str, List[Any]]) -> List[ChartDataModel]:
+        """列形式のチャートデータを行形式（ChartDataModelのリスト）に変換"""
+        return [
+            ChartDataModel(
+                date=columns['dates'][index],
+                planned_points=columns['planned'][index],
+                actual_points=columns['actual'][index],
+                remaining_points=columns['remaining'][index],
+                completed_points=columns['completed'][index],
+                total_points=columns['total'][index],
+                completed_issues=columns['completed_issues'][index],
+                total_issues=columns['total_issues'][index]
+            )
+            for index in range(len(columns['dates']))
+        ]
+    
+    def generate_velocity_data(
+        self,
+        issues: List[IssueModel],
+        weeks: int = 12,
+        end_date: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """週次ベロシティデータ生成
+        
+        end_dateを含む週から遡ってweeks週分の完了ポイントを集計する（月曜始まり）
+        """
+        if end_date is None:
+            end_date = datetime.now(timezone.utc).date()
+        
+        last_week_start = end_date - timedelta(days=end_date.weekday())
+        first_week_start = last_week_start - timedelta(weeks=weeks - 1)
+        
+        completed_points = [0.0] * weeks
+        completed_issues = [0] * weeks
         for issue in issues:
-            if issue.completed_at:
-                completed_date = issue.completed_at.astimezone(timezone.utc).date() if issue.completed_at.tzinfo else issue.completed_at.date()
-                if completed_date <= target_date:
-                    count += 1
-        return count
+            if not issue.completed_at:
+                continue
+            completed_date = self._to_utc_date(issue.completed_at)
+            week_index = (completed_date - first_week_start).days // 7
+            if 0 <= week_index < weeks:
+                completed_points[week_index] += issue.point or 0
+                completed_issues[week_index] += 1
+        
+        velocity_data = []
+        for week_index in range(weeks):
+            week_start = first_week_start + timedelta(weeks=week_index)
+            velocity_data.append({
+                'week_start': week_start,
+                'week_end': week_start + timedelta(days=6),
+                'completed_points': completed_points[week_index],
+                'completed_issues': completed_issues[week_index]
+            })
+        return velocity_data
+    
+    def generate_cumulative_flow_data(
+        self,
+        transitions: Dict[int, List[Tuple[datetime, Optional[str]]]],
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, Any]:
+        """累積フロー図データ生成（日別・Kanban Status別のissue数）
+        
+        各issueの遷移を「旧ステータス -1 / 新ステータス +1」の差分イベントに変換し、
+        日付順にソートして一度だけ走査する。期間開始前のイベントは開始日に寄せ、
+        同日の複数遷移はその日の最終ステータスとして集計される
+        
+        Args:
+            transitions: issue ID別のKanban Status遷移（日時順、ステータスなしはNone）
+        
+        Returns:
+            Dict[str, Any]: dates / statuses / counts（ステータス別の日別issue数）
+        """
+        start_ordinal = start_date.toordinal()
+        end_ordinal = end_date.toordinal()
+        
+        events: List[Tuple[int, str, int]] = []
+        for issue_transitions in transitions.values():
+            previous = None
+            for changed_at, status in issue_transitions:
+                ordinal = max(start_ordinal, self._to_utc_date(changed_at).toordinal())
+                if ordinal > end_ordinal:
+                    break
+                if previous is not None:
+                    events.append((ordinal, previous, -1))
+                if status is not None:
+                    events.append((ordinal, status, 1))
+                previous = status
+        events.sort(key=lambda event: event[0])
+        
+        statuses = sorted(
+            {status for _, status, _ in events},
+            key=lambda status: (
+                KANBAN_STATUS_ORDER.index(status) if status in KANBAN_STATUS_ORDER else len(KANBAN_STATUS_ORDER),
+                status
+            )
+        )
+        days = end_ordinal - start_ordinal + 1
+        counts = {status: [0] * days for status in statuses}
+        current = dict.fromkeys(statuses, 0)
+        
+        position = 0
+        for index in range(days):
+            ordinal = start_ordinal + index
+            while position < len(events) and events[position][0] <= ordinal:
+                _, status, delta = events[position]
+                current[status] += delta
+                position += 1
+            for status in statuses:
+                counts[status][index] = current[status]
+        
+        return {
+            'dates': [date.fromordinal(start_ordinal + index) for index in range(days)],
+            'statuses': statuses,
+            'counts': counts
+        }
+    
+    def generate_scope_change_columns(
+        self,
+        scope_events: List[Tuple[int, str, float, Optional[str]]],
+        start_date: date,
+        end_date: date
+    ) -> Tuple[Dict[str, List[Any]], Dict[str, Any]]:
+        """スコープ変化の日別列データ生成
+        
+        スコープ変化イベント（日付序数, 種別, ポイント, 削除理由）を日付順にソートして
+        一度だけ走査する。期間開始前のイベントは期首スコープに含め、期間終了後は集計しない
+        
+        Returns:
+            Tuple[Dict[str, List[Any]], Dict[str, Any]]:
+                (dates / added / removed / reestimated / scope の列データ, 期間合計)
+        """
+        start_ordinal = start_date.toordinal()
+        days = end_date.toordinal() - start_ordinal + 1
+        columns = {
+            'dates': [date.fromordinal(start_ordinal + index) for index in range(days)],
+            'added': [0.0] * days,
+            'removed': [0.0] * days,
+            'reestimated': [0.0] * days,
+            'scope': [0.0] * days
+        }
+        removed_by_reason: Dict[str, float] = {}
+        
+        initial_points = 0.0
+        scope = 0.0
+        index = 0
+        for ordinal, kind, points, reason in sorted(scope_events, key=lambda event: event[0]):
+            if ordinal - start_ordinal >= days:
+                break
+            
+            delta = -points if kind == 'removed' else points
+            if ordinal < start_ordinal:
+                initial_points += delta
+                scope += delta
+                continue
+            
+            # 変化のない日は前日のスコープを引き継ぐ
+            day_index = ordinal - start_ordinal
+            while index < day_index:
+                columns['scope'][index] = scope
+                index += 1
+            
+            scope += delta
+            if kind == 'removed':
+                columns['removed'][day_index] += points
+                removed_by_reason[reason] = removed_by_reason.get(reason, 0.0) + points
+            else:
+                columns[kind][day_index] += points
+        
+        while index < days:
+            columns['scope'][index] = scope
+            index += 1
+        
+        summary = {
+            'initial_points': initial_points,
+            'added_points': sum(columns['added']),
+            'removed_points': sum(columns['removed']),
+            'reestimated_points': sum(columns['reestimated']),
+            'final_points': scope,
+            'removed_by_reason': removed_by_reason
+        }
+        return columns, summary
     
-    def _calculate_ideal_remaining(
-        self, 
-        total_points: float, 
-        start_date: date, 
-        end_date: date, 
-        current_date: date
-    ) -> float:
-        """理想的な残りポイント計算（Burn-down用）- 営業日ベース"""
-        if current_date <= start_date:
-            return total_points
-        if current_date >= end_date:
-            return 0.0
-        
-        # 営業日ベースで進捗率を計算
-        progress_ratio = self.business_day_calc.calculate_business_day_progress(
-            start_date, end_date, current_date
+    def _build_burn_down_columns(
+        self,
+        date_range: List[date],
+        counters: Dict[str, Any],
+        progress: List[float],
+        indices: Optional[List[int]] = None
+    ) -> Dict[str, List[Any]]:
+        """累積値からBurn-downチャートの列データを生成（indices指定時はその日付のみ）"""
+        if indices is None:
+            indices = range(len(date_range))
+        
+        # 開始時点の総ポイント計算（期間内のポイントの合計）
+        total_points = counters['total_points']
+        completed = [counters['completed_points'][index] for index in indices]
+        remaining = [total_points - points for points in completed]
+        
+        return {
+            'dates': [date_range[index] for index in indices],
+            # 理想線計算（営業日ベース）
+            'planned': [total_points * (1 - progress[index]) for index in indices],
+            'actual': remaining,
+            'remaining': list(remaining),
+            'completed': completed,
+            'total': [total_points] * len(completed),
+            'completed_issues': [counters['completed_issues'][index] for index in indices],
+            'total_issues': [counters['total_issues']] * len(completed)
+        }
+    
+    def _build_burn_up_columns(
+        self,
+        date_range: List[date],
+        counters: Dict[str, Any],
+        progress: List[float],
+        indices: Optional[List[int]] = None
+    ) -> Dict[str, List[Any]]:
+        """累積値からBurn-upチャートの列データを生成（indices指定時はその日付のみ）"""
+        if indices is None:
+            indices = range(len(date_range))
+        
+        completed = [counters['completed_points'][index] for index in indices]
+        # 総ポイント（BurnUp仕様：created_atタイミングで増加）
+        total = [counters['created_points'][index] for index in indices]
+        
+        return {
+            'dates': [date_range[index] for index in indices],
+            # 理想線計算（スコープ変更対応）
+            'planned': [total_points * progress[index] for total_points, index in zip(total, indices)],
+            'actual': completed,
+            'remaining': [total_points - points for total_points, points in zip(total, completed)],
+            'completed': list(completed),
+            'total': total,
+            'completed_issues': [counters['completed_issues'][index] for index in indices],
+            'total_issues': [counters['total_issues']] * len(completed)
+        }
+    
+    def _build_burn_chart_columns(
+        self,
+        date_range: List[date],
+        counters: Dict[str, Any],
+        start_date: date,
+        end_date: date,
+        granularity: str,
+        max_points: Optional[int]
+    ) -> Tuple[Dict[str, List[Any]], Dict[str, List[Any]]]:
+        """累積値からBurn-down/Burn-upの列データを生成・検証"""
+        progress = self.business_day_calc.calculate_business_day_progress_series(
+            start_date, end_date, date_range
         )
         
-        return total_points * (1 - progress_ratio)
+        indices = self._select_indices(date_range, counters, start_date, end_date, granularity, max_points)
+        burn_down = self._build_burn_down_columns(date_range, counters, progress, indices)
+        burn_up = self._build_burn_up_columns(date_range, counters, progress, indices)
+        
+        self._validate_burn_down_data(burn_down, counters['total_points'])
+        self._validate_burn_up_data(burn_up)
+        
+        return burn_down, burn_up
     
-    def _calculate_ideal_completed(
-        self, 
-        total_points: float, 
-        start_date: date, 
-        end_date: date, 
-        current_date: date
-    ) -> float:
-        """理想的な完了ポイント計算（Burn-up用）- 営業日ベース"""
-        if current_date <= start_date:
-            return 0.0
-        if current_date >= end_date:
-            return total_points
-        
-        # 営業日ベースで進捗率を計算
-        progress_ratio = self.business_day_calc.calculate_business_day_progress(
-            start_date, end_date, current_date
+    def _select_indices(
+        self,
+        date_range: List[date],
+        counters: Dict[str, Any],
+        start_date: date,
+        end_date: date,
+        granularity: str,
+        max_points: Optional[int]
+    ) -> List[int]:
+        """出力する日付インデックスを粒度・最大点数から選択"""
+        resolved = resolve_granularity(start_date, end_date, granularity)
+        indices = select_granularity_indices(date_range, resolved)
+        return downsample_indices(
+            indices,
+            [counters['completed_points'], counters['created_points']],
+            max_points
         )
+    
+    def _build_daily_counters(
+        self,
+        issues: List[IssueModel],
+        start_date: date,
+        days: int
+    ) -> Dict[str, Any]:
+        """日別累積値を一度の走査で計算
+        
+        Returns:
+            Dict[str, Any]: created_points / completed_points / completed_issues（日別累積）
+                と total_points / total_issues
+        """
+        counters, _ = self._build_grouped_daily_counters(issues, start_date, days)
+        return counters
+    
+    def _build_grouped_daily_counters(
+        self,
+        issues: List[IssueModel],
+        start_date: date,
+        days: int,
+        key_func: Optional[Callable[[IssueModel], Optional[str]]] = None
+    ) -> Tuple[Dict[str, Any], Dict[Optional[str], Dict[str, Any]]]:
+        """日別累積値を合計・グループ別に一度の走査で計算
+        
+        各issueの作成日・完了日を日付インデックスに変換して差分配列に加算し、
+        最後に累積和を取る。期間開始前の日付はインデックス0に寄せ、
+        期間終了後の日付は集計対象外とする。
+        
+        Returns:
+            Tuple[Dict[str, Any], Dict[Optional[str], Dict[str, Any]]]:
+                (合計の累積値, グループ値別の累積値。key_func未指定時は空)
+        """
+        total = self._new_counters(days)
+        groups: Dict[Optional[str], Dict[str, Any]] = {}
+        
+        for issue in issues:
+            targets = [total]
+            if key_func is not None:
+                key = key_func(issue)
+                if key not in groups:
+                    groups[key] = self._new_counters(days)
+                targets.append(groups[key])
+            
+            created_index = None
+            if issue.created_at and issue.point:
+                created_index = self._day_index(issue.created_at, start_date)
+            completed_index = None
+            if issue.completed_at:
+                completed_index = self._day_index(issue.completed_at, start_date)
+            
+            for counters in targets:
+                counters['total_issues'] += 1
+                if issue.point:
+                    counters['total_points'] += issue.point
+                if created_index is not None and created_index < days:
+                    counters['created_points'][created_index] += issue.point
+                if completed_index is not None and completed_index < days:
+                    counters['completed_issues'][completed_index] += 1
+                    if issue.point:
+                        counters['completed_points'][completed_index] += issue.point
+        
+        for counters in [total, *groups.values()]:
+            for name in ('created_points', 'completed_points', 'completed_issues'):
+                series = counters[name]
+                for index in range(1, days):
+                    series[index] += series[index - 1]
+        
+        return total, groups
+    
+    def _build_ordinal_daily_counters(
+        self,
+        records: List[Tuple[Optional[int], Optional[int], Optional[float]]],
+        start_date: date,
+        days: int
+    ) -> Dict[str, Any]:
+        """日付序数のレコードから日別累積値を計算（_build_daily_countersと同じ集計）"""
+        counters = self._new_counters(days)
+        start_ordinal = start_date.toordinal()
         
-        return total_points * progress_ratio
+        for created_ordinal, completed_ordinal, point in records:
+            counters['total_issues'] += 1
+            if point:
+                counters['total_points'] += point
+                if created_ordinal is not None:
+                    created_index = max(0, created_ordinal - start_ordinal)
+                    if created_index < days:
+                        counters['created_points'][created_index] += point
+            if completed_ordinal is not None:
+                completed_index = max(0, completed_ordinal - start_ordinal)
+                if completed_index < days:
+                    counters['completed_issues'][completed_index] += 1
+                    if point:
+                        counters['completed_points'][completed_index] += point
+        
+        for name in ('created_points', 'completed_points', 'completed_issues'):
+            series = counters[name]
+            for index in range(1, days):
+                series[index] += series[index - 1]
+        
+        return counters
+    
+    @staticmethod
+    def _new_counters(days: int) -> Dict[str, Any]:
+        """累積値集計用の空データ"""
+        return {
+            'created_points': [0.0] * days,
+            'completed_points': [0.0] * days,
+            'completed_issues': [0] * days,
+            'total_points': 0,
+            'total_issues': 0
+        }
+    
+    def _day_index(self, value: datetime, start_date: date) -> int:
+        """日時を期間開始日からの日数に変換（開始日以前は0）"""
+        return max(0, (self._to_utc_date(value) - start_date).days)
+    
+    @staticmethod
+    def _to_utc_date(value: datetime) -> date:
+        """timezone-awareなdatetimeから、UTCのdateを取得"""
+        return value.astimezone(timezone.utc).date() if value.tzinfo else value.date()
+    
+    def _generate_date_range(self, start_date: date, end_date: date) -> List[date]:
+        """日付範囲生成"""
+        dates = []
+        current = start_date
+        while current <= end_date:
+            dates.append(current)
+            current += timedelta(days=1)
+        return dates
     
-    def _validate_burn_down_data(self, chart_data: List[ChartDataModel], total_points: float) -> None:
+    def _validate_burn_down_data(self, columns: Dict[str, List[Any]], total_points: float) -> None:
         """バーンダウンチャートデータの整合性チェック"""
-        if not chart_data:
+        if not columns['dates']:
             return
         
         # 最終日の理想線が0になっているか確認
-        final_planned = chart_data[-1].planned_points
+        final_planned = columns['planned'][-1]
         if abs(final_planned) > 0.01:  # 浮動小数点の誤差を考慮
             logger.warning(
                 f"バーンダウンチャートの最終日理想線が0ではありません: {final_planned}"
             )
         
-        # 各データポイントでの整合性チェック
-        for data in chart_data:
-            # 残りポイント = 総ポイント - 完了ポイント
-            expected_remaining = data.total_points - data.completed_points
-            if abs(data.remaining_points - expected_remaining) > 0.01:
-                logger.warning(
-                    f"データ整合性エラー ({data.date}): "
-                    f"残りポイント={data.remaining_points}, "
-                    f"期待値={expected_remaining}"
-                )
+        self._validate_remaining_points(columns)
     
-    def _validate_burn_up_data(self, chart_data: List[ChartDataModel]) -> None:
+    def _validate_burn_up_data(self, columns: Dict[str, List[Any]]) -> None:
         """バーンアップチャートデータの整合性チェック"""
-        if not chart_data:
+        if not columns['dates']:
             return
         
         # 最終日の理想線が総ポイントに等しいか確認
-        final_data = chart_data[-1]
-        if abs(final_data.planned_points - final_data.total_points) > 0.01:
+        if abs(columns['planned'][-1] - columns['total'][-1]) > 0.01:
             logger.warning(
                 f"バーンアップチャートの最終日理想線が総ポイントと一致しません: "
-                f"理想線={final_data.planned_points}, 総ポイント={final_data.total_points}"
+                f"理想線={columns['planned'][-1]}, 総ポイント={columns['total'][-1]}"
             )
         
-        # 各データポイントでの整合性チェック
-        for data in chart_data:
+        self._validate_remaining_points(columns)
+    
+    def _validate_remaining_points(self, columns: Dict[str, List[Any]]) -> None:
+        """各データポイントでの整合性チェック"""
+        for current_date, total, completed, remaining in zip(
+            columns['dates'], columns['total'], columns['completed'], columns['remaining']
+        ):
             # 残りポイント = 総ポイント - 完了ポイント
-            expected_remaining = data.total_points - data.completed_points
-            if abs(data.remaining_points - expected_remaining) > 0.01:
+            expected_remaining = total - completed
+            if abs(remaining - expected_remaining) > 0.01:
                 logger.warning(
-                    f"データ整合性エラー ({data.date}): "
-                    f"残りポイント={data.remaining_points}, "
+                    f"データ整合性エラー ({current_date}): "
+                    f"残りポイント={remaining}, "
                     f"期待値={expected_remaining}"
                 )
-    
-    def _calculate_total_points_by_date(
-        self, 
-        issues: List[IssueModel], 
-        date_range: List[date]
-    ) -> Dict[date, float]:
-        """日付別総ポイント計算（スコープ変更対応）"""
-        total_by_date = {}
-        for target_date in date_range:
-            total_points = 0
-            for issue in issues:
-                if issue.point:
-                    total_points += issue.point
-            total_by_date[target_date] = total_points
-        return total_by_date
-    
-    def _calculate_total_points_by_created_date(
-        self, 
-        issues: List[IssueModel], 
-        date_range: List[date]
-    ) -> Dict[date, float]:
-        """BurnUp用：created_atタイミングで総ポイントが増加する計算"""
-        total_by_date = {}
-        for target_date in date_range:
-            total_points = 0
-            for issue in issues:
-                # created_atが対象日以前で、かつポイントが設定されているIssueを集計
-                if issue.created_at and issue.point:
-                    # timezone-awareなdatetimeから、UTCのdateを取得
-                    created_date = issue.created_at.astimezone(timezone.utc).date() if issue.created_at.tzinfo else issue.created_at.date()
-                    if created_date <= target_date:
-                        total_points += issue.point
-            total_by_date[target_date] = total_points
-        return total_by_date
-    
-    def _is_issue_in_scope_by_date(
-        self, 
-        issue: IssueModel, 
-        target_date: date,
-        chart_start_date: date,
-        chart_end_date: date
-    ) -> bool:
-        """指定日時点でissueがスコープ内かどうか判定（シンプルな除外ルール）"""
-        # completed_atがある場合のみチェック
-        if issue.completed_at:
-            # timezone-awareなdatetimeから、UTCのdateを取得
-            completed_date = issue.completed_at.astimezone(timezone.utc).date() if issue.completed_at.tzinfo else issue.completed_at.date()
-            
-            # 除外ルール1: completed_atが期間終了日より未来
-            if completed_date > chart_end_date:
-                return False
-            
-            # 除外ルール2: completed_atが期間開始日より過去
-            if completed_date < chart_start_date:
-                return False
-        
-        # 除外ルールに該当しなければスコープ内（未完了または期間内完了）
-        return True
 
 # グローバルインスタンス
 chart_analyzer = ChartAnalyzer()
\ No newline at end of file
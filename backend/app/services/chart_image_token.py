@@ -0,0 +1,81 @@
+from typing import Dict, Optional, Tuple, Iterable
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+import base64
+import hashlib
+import hmac
+import secrets
+import threading
+import logging
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+def image_scope(chart_type: str, image_format: str, params: Iterable[Tuple[str, str]]) -> str:
+    """トークンの対象画像（チャート種別・画像形式・tokenを除くクエリパラメータ）"""
+    query = sorted((key, value) for key, value in params if key != 'token')
+    return f"{chart_type}.{image_format}?{urlencode(query)}"
+
+class ChartImageTokenService:
+    """チャート画像の埋め込み用トークン発行・検証サービス
+    
+    X-Session-Idヘッダーを付与できない<img>埋め込み用に、セッションIDの代わりにURLへ含める
+    短時間だけ有効なトークンを発行する。トークンは発行時の画像（チャート種別・画像形式・
+    クエリパラメータ）に限定した署名付きの値で、画像の取得にのみ使用できる。
+    セッションIDはサーバー側にのみ保持し、トークンからは復元できない
+    """
+    
+    def __init__(self, ttl_seconds: int = 300, secret: Optional[str] = None):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        # 未設定時はプロセスごとの乱数（再起動で発行済みトークンは無効になる）
+        self._secret = secret.encode('utf-8') if secret else secrets.token_bytes(32)
+        # 発行ID → (セッションID, 対象画像, 有効期限)
+        self._grants: Dict[str, Tuple[str, str, datetime]] = {}
+        self._lock = threading.Lock()
+    
+    def issue(self, session_id: str, scope: str) -> Tuple[str, datetime]:
+        """トークン発行
+        
+        Returns:
+            Tuple[str, datetime]: (トークン, 有効期限)
+        """
+        grant_id = secrets.token_urlsafe(16)
+        expires_at = datetime.now(timezone.utc) + self.ttl
+        with self._lock:
+            self._purge_expired()
+            self._grants[grant_id] = (session_id, scope, expires_at)
+        return f"{grant_id}.{self._sign(grant_id, scope, expires_at)}", expires_at
+    
+    def resolve(self, token: str, scope: str) -> Optional[str]:
+        """トークンのセッションID（不正・期限切れ・対象画像が異なる場合はNone）"""
+        grant_id, _, signature = token.partition('.')
+        with self._lock:
+            grant = self._grants.get(grant_id)
+        if grant is None:
+            return None
+        
+        session_id, granted_scope, expires_at = grant
+        if expires_at <= datetime.now(timezone.utc):
+            return None
+        if not hmac.compare_digest(signature, self._sign(grant_id, scope, expires_at)):
+            return None
+        if granted_scope != scope:
+            return None
+        return session_id
+    
+    def _sign(self, grant_id: str, scope: str, expires_at: datetime) -> str:
+        message = f"{grant_id}|{scope}|{int(expires_at.timestamp())}".encode('utf-8')
+        digest = hmac.new(self._secret, message, hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).decode('ascii').rstrip('=')
+    
+    def _purge_expired(self) -> None:
+        now = datetime.now(timezone.utc)
+        expired = [grant_id for grant_id, (_, _, expires_at) in self._grants.items() if expires_at <= now]
+        for grant_id in expired:
+            del self._grants[grant_id]
+
+# グローバルインスタンス
+chart_image_tokens = ChartImageTokenService(
+    ttl_seconds=settings.chart_image_token_seconds,
+    secret=settings.chart_image_token_secret
+)
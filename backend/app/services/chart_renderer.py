@@ -0,0 +1,239 @@
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date, timedelta
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import math
+import threading
+from functools import lru_cache
+import matplotlib
+from matplotlib import font_manager
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import matplotlib.dates as mdates
+import matplotlib.ticker as ticker
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 出力可能な画像形式
+IMAGE_FORMATS = {
+    'svg': 'image/svg+xml',
+    'png': 'image/png'
+}
+
+# 日本語ラベル用フォントの候補（インストールされている最初のフォントを使用）
+JAPANESE_FONTS = ['Hiragino Sans', 'Noto Sans CJK JP', 'IPAexGothic', 'IPAGothic']
+# 日本語フォントがない場合のフォント（凡例は英語表記にする）
+FALLBACK_FONT = 'DejaVu Sans'
+
+# 描画時のみ適用するmatplotlibの設定（SVGの要素IDを固定し、同じデータから同じ出力を得る）
+RENDER_RC_PARAMS = {
+    'svg.hashsalt': 'gitlab-bud-chart'
+}
+
+# チャート種別ごとの描画設定（サンプルCLIのBurnDownChartSvgRepo / BurnUpChartSvgRepo準拠）
+# lines: (列, 色, 凡例, 日本語フォントがない場合の凡例)
+CHART_STYLES = {
+    'burn_down': {
+        'title': 'burn down',
+        'lines': [
+            ('planned', 'lightgreen', '予定残り', 'planned remaining'),
+            ('actual', 'green', '実績残り', 'actual remaining')
+        ],
+        'legend_loc': 'upper right'
+    },
+    'burn_up': {
+        'title': 'burn up',
+        'lines': [
+            ('planned', 'wheat', '予定累積', 'planned total'),
+            ('actual', 'orange', '実績累積', 'actual total')
+        ],
+        'legend_loc': 'upper left'
+    }
+}
+
+# rcParamsはプロセス全体で共有されるため、描画時の一時的な変更はこのロック内で行う
+_rc_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def find_japanese_font() -> Optional[str]:
+    """インストールされている日本語フォント（ない場合はNone）"""
+    for family in JAPANESE_FONTS:
+        try:
+            font_manager.findfont(font_manager.FontProperties(family=family), fallback_to_default=False)
+            return family
+        except ValueError:
+            continue
+    logger.warning(f"日本語フォントが見つからないため、チャート画像の凡例を英語で表示します（フォント: {FALLBACK_FONT}）")
+    return None
+
+class ChartRenderer:
+    """チャート画像（SVG/PNG）描画サービス
+    
+    描画はスレッドプールで実行してイベントループをブロックしない。
+    描画結果は入力内容のハッシュをキーとしてLRUキャッシュする。
+    フォント等の設定はFigureごとに指定し、グローバルなrcParamsは変更しない
+    """
+    
+    # 日付ラベルの最小間隔（日）と1ラベルあたりの最小幅（px）
+    TICK_INTERVAL_DAYS = 3
+    TICK_WIDTH_PX = 50
+    DPI = 100
+    
+    def __init__(self, max_workers: int = 2, cache_size: int = 128):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='chart-render')
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+    
+    def content_hash(
+        self,
+        columns: Dict[str, List[Any]],
+        chart_type: str,
+        image_format: str,
+        width: int,
+        height: int
+    ) -> str:
+        """描画入力のハッシュ（キャッシュキー・ETagとして使用）"""
+        payload = {
+            'chart_type': chart_type,
+            'format': image_format,
+            'size': [width, height],
+            'dates': [d.isoformat() for d in columns['dates']],
+            'series': {key: columns[key] for key, _, _, _ in CHART_STYLES[chart_type]['lines']}
+        }
+        encoded = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+    
+    async def render(
+        self,
+        columns: Dict[str, List[Any]],
+        chart_type: str,
+        image_format: str,
+        width: int = 1600,
+        height: int = 900
+    ) -> Tuple[bytes, str]:
+        """チャート画像を描画
+        
+        Args:
+            columns: 列形式のチャートデータ（ChartAnalyzer.generate_*_columns）
+            chart_type: 'burn_down' or 'burn_up'
+            image_format: 'svg' or 'png'
+            width: 画像幅（px）
+            height: 画像高さ（px）
+        
+        Returns:
+            Tuple[bytes, str]: (画像データ, コンテンツハッシュ)
+        """
+        if chart_type not in CHART_STYLES:
+            raise ValueError(f"未対応のチャート種別です: {chart_type}")
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"未対応の画像形式です: {image_format}")
+        
+        key = self.content_hash(columns, chart_type, image_format, width, height)
+        cached = self._get_cache(key)
+        if cached is not None:
+            logger.debug(f"チャート画像キャッシュヒット: {key}")
+            return cached, key
+        
+        loop = asyncio.get_running_loop()
+        image = await loop.run_in_executor(
+            self._executor, self._render_sync, columns, chart_type, image_format, width, height
+        )
+        self._set_cache(key, image)
+        return image, key
+    
+    def clear_cache(self) -> None:
+        """描画キャッシュをクリア"""
+        with self._lock:
+            self._cache.clear()
+    
+    def _get_cache(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+            return image
+    
+    def _set_cache(self, key: str, image: bytes) -> None:
+        with self._lock:
+            self._cache[key] = image
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+    
+    def _render_sync(
+        self,
+        columns: Dict[str, List[Any]],
+        chart_type: str,
+        image_format: str,
+        width: int,
+        height: int
+    ) -> bytes:
+        """チャート画像描画（ワーカースレッドで実行）
+        
+        pyplotのグローバル状態を使わず、Figureごとに独立して描画する。
+        フォントは文字列ごとに指定し、SVGの設定（RENDER_RC_PARAMS）は保存時のみrc_contextで適用する
+        """
+        style = CHART_STYLES[chart_type]
+        dates = columns['dates']
+        japanese_font = find_japanese_font()
+        family = japanese_font or FALLBACK_FONT
+        
+        fig = Figure(figsize=(width / self.DPI, height / self.DPI), dpi=self.DPI)
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
+        self._apply_chart_settings(fig, ax, dates, width)
+        
+        for column, color, label, fallback_label in style['lines']:
+            ax.plot(dates, columns[column], lw=4, color=color, label=label if japanese_font else fallback_label)
+        ax.set_title(style['title'], fontproperties=font_manager.FontProperties(family=family, size=24))
+        if dates:
+            ax.legend(loc=style['legend_loc'], prop=font_manager.FontProperties(family=family))
+        
+        buffer = io.BytesIO()
+        metadata = {'Date': None} if image_format == 'svg' else None
+        with _rc_lock, matplotlib.rc_context(RENDER_RC_PARAMS):
+            fig.savefig(buffer, format=image_format, metadata=metadata)
+        return buffer.getvalue()
+    
+    def _apply_chart_settings(self, fig: Figure, ax, dates: List[date], width: int) -> None:
+        """軸・枠線・日付ラベル設定（サンプルCLIのchart_settings準拠）"""
+        # 左右と上の枠線は非表示
+        for position in ['left', 'top', 'right']:
+            ax.spines[position].set_visible(False)
+        
+        # y軸のグリッドのみ表示
+        ax.grid(axis='y')
+        
+        # グラフの描画開始位置を0に合わせる
+        ax.spines['bottom'].set_position('zero')
+        
+        if not dates:
+            return
+        
+        # 日付ラベルは開始日〜終了日で一定間隔に表示（長期間・小さい画像ではラベルが重ならないよう間隔を広げる）
+        # DayLocatorだと期間によって開始日がラベルに出なかったりするので、FixedLocatorを使う
+        days = (dates[-1] - dates[0]).days
+        max_ticks = max(2, width // self.TICK_WIDTH_PX)
+        interval = max(self.TICK_INTERVAL_DAYS, math.ceil((days + 1) / max_ticks))
+        xticks = mdates.date2num([dates[0] + timedelta(days=i) for i in range(0, days + 1, interval)])
+        ax.xaxis.set_major_locator(ticker.FixedLocator(xticks))
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+        if days > 0:
+            ax.set_xlim([dates[0], dates[-1]])
+        
+        # 日付ラベルのフォーマットを設定
+        fig.autofmt_xdate(rotation=315, ha='left')
+
+# グローバルインスタンス
+chart_renderer = ChartRenderer(
+    max_workers=settings.chart_render_workers,
+    cache_size=settings.chart_render_cache_size
+)
@@ -0,0 +1,143 @@
+from typing import Dict, Any, Optional
+from datetime import date, datetime, timezone
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import numpy as np
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+class ChartSnapshotStore:
+    """終了済み期間のチャートスナップショット保存サービス
+    
+    (プロジェクト, フィルタ, 期間) ごとに日別累積値・ベロシティ・警告を
+    列形式のnpzファイルとして保存する。終了済みの期間は現在のissueから再計算せず
+    スナップショットを返すため、ラベル変更などで過去のチャートが変化しない
+    """
+    
+    # 保存形式のバージョン（形式を変更した場合は上げる）
+    SNAPSHOT_VERSION = 1
+    
+    def __init__(self, snapshot_dir: str = "/tmp/chart_snapshots"):
+        self.snapshot_dir = snapshot_dir
+    
+    def make_key(
+        self,
+        project_key: str,
+        start_date: date,
+        end_date: date,
+        filters: Dict[str, Any]
+    ) -> str:
+        """スナップショットキー生成（プロジェクト・期間・フィルタのハッシュ）"""
+        payload = {
+            'version': self.SNAPSHOT_VERSION,
+            'project': project_key,
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'filters': {key: value for key, value in filters.items() if value is not None}
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+    
+    def is_closed(self, end_date: date, today: Optional[date] = None) -> bool:
+        """期間が終了済みか（終了日が今日より前）"""
+        if today is None:
+            today = datetime.now(timezone.utc).date()
+        return end_date < today
+    
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """スナップショット読み込み（存在しない・読み込めない場合はNone）"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data['meta']))
+                if meta.get('version') != self.SNAPSHOT_VERSION:
+                    return None
+                
+                counters = {
+                    'created_points': data['created_points'].tolist(),
+                    'completed_points': data['completed_points'].tolist(),
+                    'completed_issues': data['completed_issues'].tolist(),
+                    'total_points': meta['total_points'],
+                    'total_issues': meta['total_issues']
+                }
+                velocity = [
+                    {
+                        'week_start': date.fromordinal(week_start),
+                        'week_end': date.fromordinal(week_start + 6),
+                        'completed_points': completed_points,
+                        'completed_issues': completed_issues
+                    }
+                    for week_start, completed_points, completed_issues in zip(
+                        data['velocity_week_start'].tolist(),
+                        data['velocity_completed_points'].tolist(),
+                        data['velocity_completed_issues'].tolist()
+                    )
+                ]
+            
+            logger.info(f"チャートスナップショット読み込み: {key}")
+            return {
+                'counters': counters,
+                'velocity': velocity,
+                'warnings': meta['warnings'],
+                'created_at': datetime.fromisoformat(meta['created_at'])
+            }
+        
+        except Exception as e:
+            logger.warning(f"チャートスナップショット読み込み失敗 ({key}): {e}")
+            return None
+    
+    def save(self, key: str, snapshot: Dict[str, Any]) -> None:
+        """スナップショット保存（一時ファイルに書き込んでから置き換える）"""
+        counters = snapshot['counters']
+        velocity = snapshot['velocity']
+        meta = {
+            'version': self.SNAPSHOT_VERSION,
+            'created_at': snapshot['created_at'].isoformat(),
+            'total_points': counters['total_points'],
+            'total_issues': counters['total_issues'],
+            'warnings': snapshot['warnings']
+        }
+        
+        temp_path = None
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.snapshot_dir, suffix='.npz.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(
+                    f,
+                    created_points=np.asarray(counters['created_points'], dtype=np.float64),
+                    completed_points=np.asarray(counters['completed_points'], dtype=np.float64),
+                    completed_issues=np.asarray(counters['completed_issues'], dtype=np.int64),
+                    velocity_week_start=np.asarray([v['week_start'].toordinal() for v in velocity], dtype=np.int64),
+                    velocity_completed_points=np.asarray([v['completed_points'] for v in velocity], dtype=np.float64),
+                    velocity_completed_issues=np.asarray([v['completed_issues'] for v in velocity], dtype=np.int64),
+                    meta=np.asarray(json.dumps(meta, ensure_ascii=False, default=str))
+                )
+            os.replace(temp_path, self._path(key))
+            logger.info(f"チャートスナップショット保存: {key}")
+        
+        except Exception as e:
+            logger.error(f"チャートスナップショット保存失敗 ({key}): {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    def delete(self, key: str) -> bool:
+        """スナップショット削除"""
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
+            return True
+        return False
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.snapshot_dir, f"{key}.npz")
+
+# グローバルインスタンス
+chart_snapshot_store = ChartSnapshotStore(snapshot_dir=settings.chart_snapshot_dir)
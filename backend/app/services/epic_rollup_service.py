@@ -0,0 +1,283 @@
+from typing import List, Dict, Any, Optional, Tuple, FrozenSet
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+import asyncio
+import logging
+from app.models.issue import IssueModel
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# エピック同士のリンクで、リンク先を子エピックとみなすlink_type（親は子が完了するまでブロックされる）
+CHILD_EPIC_LINK_TYPES = ['is_blocked_by']
+
+# キャッシュしたissueリンク: (取得日時, 取得時のissue更新日時, リンク)
+CachedLinks = Tuple[datetime, Optional[datetime], List[Tuple[int, str]]]
+
+class ProjectIssueLinks:
+    """1プロジェクト分のエピックのissueリンクのキャッシュ
+    
+    保持数を超えた場合は最も古く使われたエピックから破棄する
+    """
+    
+    def __init__(self, max_issues: int = 5000):
+        self.max_issues = max_issues
+        # issue ID -> キャッシュしたissueリンク
+        self._links: "OrderedDict[int, CachedLinks]" = OrderedDict()
+    
+    def get(self, issue_id: int) -> Optional[CachedLinks]:
+        cached = self._links.get(issue_id)
+        if cached is not None:
+            self._links.move_to_end(issue_id)
+        return cached
+    
+    def set(self, issue_id: int, cached: CachedLinks) -> None:
+        self._links[issue_id] = cached
+        self._links.move_to_end(issue_id)
+        while len(self._links) > self.max_issues:
+            self._links.popitem(last=False)
+
+class EpicRollupService:
+    """エピックの子issue集計サービス
+    
+    エピックのissueリンクのみをスレッドで並行取得し（同時実行数は上限付き）、
+    エピック→子issueの隣接インデックスを構築する。子エピックを含む階層は
+    下位から順にメモ化して集計するため、エピック数に関わらず各エピックは一度だけ計算される。
+    リンクのキャッシュはIssueストアと同じプロジェクト識別子（認証情報を含む）ごとに保持し、
+    プロジェクト数・プロジェクトごとのエピック数の上限を超えた場合は最も古く使われたものから破棄する
+    """
+    
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        cache_seconds: int = 600,
+        max_projects: int = 16,
+        max_issues_per_project: int = 5000
+    ):
+        self.max_concurrency = max_concurrency
+        self.cache_ttl = timedelta(seconds=cache_seconds)
+        self.max_projects = max_projects
+        self.max_issues_per_project = max_issues_per_project
+        # プロジェクト識別子 -> プロジェクトのissueリンクのキャッシュ
+        self._projects: "OrderedDict[str, ProjectIssueLinks]" = OrderedDict()
+    
+    async def get_epic_rollups(
+        self,
+        gitlab_client,
+        issues: List[IssueModel]
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """全エピックの集計
+        
+        Args:
+            issues: 分析済み・除外ルール適用済みのissue（リンク先がこの中にないissueは集計しない）
+        
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: (エピック別の集計, 今回GitLabからリンクを取得したエピック数)
+        """
+        issues_by_id = {issue.id: issue for issue in issues}
+        epics = [issue for issue in issues if issue.is_epic]
+        
+        links, fetched = await self.get_links(gitlab_client, epics)
+        adjacency = self.build_adjacency(epics, links, issues_by_id)
+        leaves = self.collect_leaves(adjacency, issues_by_id)
+        
+        rollups = []
+        for epic in epics:
+            children = adjacency.get(epic.id, [])
+            rollups.append({
+                'epic': epic,
+                'children': [child for child in children if not issues_by_id[child].is_epic],
+                'child_epics': [child for child in children if issues_by_id[child].is_epic],
+                **self.summarize(leaves[epic.id], issues_by_id)
+            })
+        return rollups, fetched
+    
+    async def get_links(
+        self,
+        gitlab_client,
+        epics: List[IssueModel]
+    ) -> Tuple[Dict[int, List[Tuple[int, str]]], int]:
+        """エピックごとのissueリンク取得（キャッシュ期間内かつissue未更新の場合は再取得しない）"""
+        cache = self._project_cache(gitlab_client)
+        now = datetime.now(timezone.utc)
+        
+        links: Dict[int, List[Tuple[int, str]]] = {}
+        stale: List[IssueModel] = []
+        for epic in epics:
+            cached = cache.get(epic.id)
+            if cached is not None and now - cached[0] < self.cache_ttl and cached[1] == epic.updated_at:
+                links[epic.id] = cached[2]
+            else:
+                stale.append(epic)
+        
+        if stale:
+            from app.services.issue_service import IssueService
+            issue_service = IssueService()
+            issue_service.client = gitlab_client
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            
+            async def fetch(epic: IssueModel) -> List[Tuple[int, str]]:
+                async with semaphore:
+                    return await asyncio.to_thread(issue_service.fetch_issue_links, epic.iid)
+            
+            results = await asyncio.gather(*(fetch(epic) for epic in stale))
+            for epic, epic_links in zip(stale, results):
+                cache.set(epic.id, (now, epic.updated_at, epic_links))
+                links[epic.id] = epic_links
+            
+            logger.info(f"issueリンク取得: {len(stale)}件 (キャッシュ: {len(epics) - len(stale)}件)")
+        
+        return links, len(stale)
+    
+    @staticmethod
+    def build_adjacency(
+        epics: List[IssueModel],
+        links: Dict[int, List[Tuple[int, str]]],
+        issues_by_id: Dict[int, IssueModel]
+    ) -> Dict[int, List[int]]:
+        """エピック→子issue IDの隣接インデックス構築
+        
+        エピック以外のリンク先はすべて子issueとし、エピック同士のリンクは
+        CHILD_EPIC_LINK_TYPESの場合のみ子エピックとする（双方向リンクによる循環を避ける）
+        """
+        adjacency: Dict[int, List[int]] = {}
+        for epic in epics:
+            children = []
+            for linked_id, link_type in links.get(epic.id, []):
+                linked = issues_by_id.get(linked_id)
+                if linked is None or linked_id == epic.id:
+                    continue
+                if linked.is_epic and link_type not in CHILD_EPIC_LINK_TYPES:
+                    continue
+                if linked_id not in children:
+                    children.append(linked_id)
+            adjacency[epic.id] = children
+        return adjacency
+    
+    @staticmethod
+    def collect_leaves(
+        adjacency: Dict[int, List[int]],
+        issues_by_id: Dict[int, IssueModel]
+    ) -> Dict[int, FrozenSet[int]]:
+        """エピックごとの配下の子issue（エピック以外）IDを下位からメモ化して収集
+        
+        子エピックへの辺で強連結成分に分解し、下位の成分から順に集計する。
+        循環しているエピックは同じ成分になり、循環内のすべての子issueを共有する
+        （どのエピックから辿っても同じ結果になる）。複数の子エピックに属するissueは一度だけ数える
+        """
+        child_epics = {
+            epic_id: [child_id for child_id in children if issues_by_id[child_id].is_epic]
+            for epic_id, children in adjacency.items()
+        }
+        
+        memo: Dict[int, FrozenSet[int]] = {}
+        for component in EpicRollupService.strongly_connected_components(child_epics):
+            members = set(component)
+            leaves = set()
+            for epic_id in component:
+                for child_id in adjacency.get(epic_id, []):
+                    if not issues_by_id[child_id].is_epic:
+                        leaves.add(child_id)
+                    elif child_id not in members:
+                        leaves |= memo[child_id]
+            shared = frozenset(leaves)
+            for epic_id in component:
+                memo[epic_id] = shared
+        return memo
+    
+    @staticmethod
+    def strongly_connected_components(graph: Dict[int, List[int]]) -> List[List[int]]:
+        """強連結成分の列挙（Tarjanのアルゴリズム、深い階層でも再帰しない）
+        
+        Returns:
+            List[List[int]]: 強連結成分のリスト（辺の先の成分が先に並ぶ）
+        """
+        order: Dict[int, int] = {}
+        lowlink: Dict[int, int] = {}
+        stack: List[int] = []
+        on_stack = set()
+        components: List[List[int]] = []
+        
+        for root in graph:
+            if root in order:
+                continue
+            order[root] = lowlink[root] = len(order)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(graph.get(root, [])))]
+            while work:
+                node, children = work[-1]
+                descended = False
+                for child in children:
+                    if child not in order:
+                        order[child] = lowlink[child] = len(order)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(graph.get(child, []))))
+                        descended = True
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], order[child])
+                if descended:
+                    continue
+                
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+        return components
+    
+    @staticmethod
+    def summarize(leaf_ids: FrozenSet[int], issues_by_id: Dict[int, IssueModel]) -> Dict[str, Any]:
+        """子issueのポイント集計（完了はcompleted_atが設定されたissue）"""
+        total_points = 0.0
+        completed_points = 0.0
+        completed_issues = 0
+        for leaf_id in leaf_ids:
+            issue = issues_by_id[leaf_id]
+            total_points += issue.point or 0.0
+            if issue.completed_at:
+                completed_points += issue.point or 0.0
+                completed_issues += 1
+        
+        return {
+            'total_issues': len(leaf_ids),
+            'completed_issues': completed_issues,
+            'total_points': total_points,
+            'completed_points': completed_points,
+            'remaining_points': total_points - completed_points,
+            'progress': completed_points / total_points if total_points > 0 else 0.0
+        }
+    
+    def clear_cache(self) -> None:
+        self._projects.clear()
+    
+    def _project_cache(self, gitlab_client) -> ProjectIssueLinks:
+        """プロジェクトのキャッシュ取得（未作成の場合は作成）"""
+        from app.services.issue_store import project_store_key
+        key = project_store_key(gitlab_client)
+        cache = self._projects.get(key)
+        if cache is None:
+            cache = ProjectIssueLinks(self.max_issues_per_project)
+            self._projects[key] = cache
+            while len(self._projects) > self.max_projects:
+                self._projects.popitem(last=False)
+        self._projects.move_to_end(key)
+        return cache
+
+# グローバルインスタンス
+epic_rollup_service = EpicRollupService(
+    max_concurrency=settings.gitlab_fetch_concurrency,
+    cache_seconds=settings.issue_link_cache_seconds,
+    max_projects=settings.issue_link_cache_projects,
+    max_issues_per_project=settings.issue_link_cache_issues
+)
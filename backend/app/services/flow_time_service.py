@@ -0,0 +1,170 @@
+from typing import List, Dict, Any, Optional
+from datetime import date, datetime, timezone
+import math
+import logging
+from app.models.issue import IssueModel
+from app.services.label_event_service import StatusTransition
+
+logger = logging.getLogger(__name__)
+
+# サイクルタイムの開始・終了とするKanban Status
+CYCLE_START_STATUS = '作業中'
+CYCLE_END_STATUS = '完了'
+
+# issueを分割する項目
+FLOW_TIME_GROUP_FIELDS = ['service', 'assignee']
+
+class FlowTimeAnalyzer:
+    """リードタイム・サイクルタイム分析サービス
+    
+    リードタイムは作成日から完了日（completed_at）まで、サイクルタイムはラベル履歴で
+    最初に#作業中になってから、その後最初に#完了になるまでの日数とする。
+    全体・グループ別の値を一度の走査で振り分け、グループごとに一度だけソートして
+    パーセンタイルとヒストグラムを算出する
+    """
+    
+    def analyze(
+        self,
+        issues: List[IssueModel],
+        transitions: Dict[int, List[StatusTransition]],
+        bin_days: int = 1,
+        percentiles: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
+        """リードタイム・サイクルタイムの分布を算出
+        
+        Args:
+            issues: 完了済みの分析済みissue（日付補正前）
+            transitions: issue ID別のKanban Status遷移履歴
+            bin_days: ヒストグラムの階級幅（日）
+            percentiles: 算出するパーセンタイル（デフォルト: 50, 85, 95）
+        
+        Returns:
+            lead_time / cycle_time ごとの全体・service別・assignee別の分布
+        """
+        if percentiles is None:
+            percentiles = [50, 85, 95]
+        
+        lead_times = {issue.id: self.lead_time_days(issue) for issue in issues}
+        cycle_times = {
+            issue.id: self.cycle_time_days(transitions.get(issue.id, []))
+            for issue in issues
+        }
+        
+        return {
+            'lead_time': self._distributions(issues, lead_times, bin_days, percentiles),
+            'cycle_time': self._distributions(issues, cycle_times, bin_days, percentiles)
+        }
+    
+    @staticmethod
+    def select_completed(issues: List[IssueModel], start_date: date, end_date: date) -> List[IssueModel]:
+        """完了日（UTCの日付）が期間内のissue"""
+        return [
+            issue for issue in issues
+            if issue.completed_at and start_date <= FlowTimeAnalyzer._utc_date(issue.completed_at) <= end_date
+        ]
+    
+    @staticmethod
+    def lead_time_days(issue: IssueModel) -> Optional[float]:
+        """作成日から完了日までの日数（完了日は日付単位のため日数も日単位、どちらもUTCの日付で比較）
+        
+        チャートの日付補正（作成日を期間開始日に寄せる等）を行う前のissueを渡すこと
+        """
+        if issue.completed_at is None or issue.created_at is None:
+            return None
+        elapsed = FlowTimeAnalyzer._utc_date(issue.completed_at) - FlowTimeAnalyzer._utc_date(issue.created_at)
+        return float(max(0, elapsed.days))
+    
+    @staticmethod
+    def cycle_time_days(transitions: List[StatusTransition]) -> Optional[float]:
+        """最初の#作業中から、その後最初の#完了までの日数（どちらかがない場合はNone）"""
+        started_at = None
+        for changed_at, status in transitions:
+            if started_at is None:
+                if status == CYCLE_START_STATUS:
+                    started_at = changed_at
+            elif status == CYCLE_END_STATUS:
+                elapsed = FlowTimeAnalyzer._to_utc(changed_at) - FlowTimeAnalyzer._to_utc(started_at)
+                return max(0.0, elapsed.total_seconds() / 86400)
+        return None
+    
+    def _distributions(
+        self,
+        issues: List[IssueModel],
+        values: Dict[int, Optional[float]],
+        bin_days: int,
+        percentiles: List[int]
+    ) -> Dict[str, Any]:
+        """全体・グループ別の分布（値のないissueは集計しない）"""
+        overall: List[float] = []
+        groups: Dict[str, Dict[Optional[str], List[float]]] = {field: {} for field in FLOW_TIME_GROUP_FIELDS}
+        for issue in issues:
+            value = values.get(issue.id)
+            if value is None:
+                continue
+            overall.append(value)
+            for field in FLOW_TIME_GROUP_FIELDS:
+                groups[field].setdefault(getattr(issue, field), []).append(value)
+        
+        result = {'overall': self.summarize(None, overall, bin_days, percentiles)}
+        for field in FLOW_TIME_GROUP_FIELDS:
+            # グループ値の昇順（未設定のissueは末尾）
+            ordered = sorted(groups[field].items(), key=lambda item: (item[0] is None, item[0] or ''))
+            result[f"by_{field}"] = [
+                self.summarize(key, group_values, bin_days, percentiles)
+                for key, group_values in ordered
+            ]
+        return result
+    
+    @staticmethod
+    def summarize(
+        key: Optional[str],
+        values: List[float],
+        bin_days: int,
+        percentiles: List[int]
+    ) -> Dict[str, Any]:
+        """1グループの件数・平均・パーセンタイル（nearest-rank法）・ヒストグラム
+        
+        ヒストグラムは0日から bin_days 日幅の階級ごとの件数（最大値を含む階級まで）
+        """
+        if not values:
+            return {
+                'key': key,
+                'count': 0,
+                'mean_days': None,
+                'min_days': None,
+                'max_days': None,
+                'percentiles': [{'percentile': p, 'days': None} for p in percentiles],
+                'histogram': []
+            }
+        
+        sorted_values = sorted(values)
+        count = len(sorted_values)
+        histogram = [0] * (int(sorted_values[-1] // bin_days) + 1)
+        for value in sorted_values:
+            histogram[int(value // bin_days)] += 1
+        
+        return {
+            'key': key,
+            'count': count,
+            'mean_days': sum(sorted_values) / count,
+            'min_days': sorted_values[0],
+            'max_days': sorted_values[-1],
+            'percentiles': [
+                {'percentile': p, 'days': sorted_values[max(0, math.ceil(p / 100 * count) - 1)]}
+                for p in percentiles
+            ],
+            'histogram': histogram
+        }
+    
+    @staticmethod
+    def _to_utc(value: datetime) -> datetime:
+        """timezone-naiveなdatetimeはUTCとして扱う"""
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    
+    @staticmethod
+    def _utc_date(value: datetime) -> date:
+        """UTCの日付（timezone-naiveはUTCとして扱う）"""
+        return FlowTimeAnalyzer._to_utc(value).astimezone(timezone.utc).date()
+
+# グローバルインスタンス
+flow_time_analyzer = FlowTimeAnalyzer()
@@ -0,0 +1,202 @@
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date, timedelta, timezone
+import math
+import logging
+import numpy as np
+from app.models.issue import IssueModel
+from app.utils.business_days import BusinessDayCalculator
+
+logger = logging.getLogger(__name__)
+
+# 予測単位
+FORECAST_UNITS = ['day', 'week']
+
+class CompletionForecaster:
+    """モンテカルロ法による完了日予測サービス
+    
+    過去のスループット（営業日別または週別の完了ポイント）を復元抽出し、
+    残りポイントを消化するまでの期間を多数回シミュレーションする
+    """
+    
+    # 1ブロックでシミュレーションするステップ数
+    BLOCK_STEPS = 64
+    # シミュレーションする最大ステップ数（営業日 or 週）
+    MAX_STEPS = {'day': 260 * 5, 'week': 52 * 5}
+    
+    def __init__(self):
+        self.business_day_calc = BusinessDayCalculator()
+    
+    def forecast(
+        self,
+        history_issues: List[IssueModel],
+        remaining_points: float,
+        as_of: date,
+        end_date: date,
+        unit: str = 'day',
+        history_weeks: int = 12,
+        trials: int = 10000,
+        percentiles: Optional[List[int]] = None,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """完了日分布を予測
+        
+        Args:
+            history_issues: スループット算出に使う分析済みissue
+            remaining_points: as_of時点の残りポイント
+            as_of: 予測基準日（この日までの完了を実績とする）
+            end_date: 期間終了日（期限内完了確率の算出に使用）
+            unit: サンプリング単位（'day': 営業日, 'week': 週）
+            history_weeks: スループット算出に使う過去の週数
+            trials: シミュレーション回数
+            percentiles: 算出するパーセンタイル（デフォルト: 50, 85, 95）
+            seed: 乱数シード（指定時は結果が決定的になる）
+        
+        Returns:
+            予測結果（パーセンタイル別完了日・期限内完了確率・履歴情報）
+        """
+        if unit not in FORECAST_UNITS:
+            raise ValueError(f"未対応の予測単位です: {unit}")
+        if percentiles is None:
+            percentiles = [50, 85, 95]
+        
+        samples, history_start = self._sample_throughput(history_issues, as_of, unit, history_weeks)
+        result = {
+            'as_of': as_of,
+            'unit': unit,
+            'remaining_points': remaining_points,
+            'trials': trials,
+            'seed': seed,
+            'history': {
+                'start_date': history_start,
+                'end_date': as_of,
+                'samples': len(samples),
+                'mean_throughput': float(samples.mean()) if len(samples) > 0 else 0.0
+            }
+        }
+        
+        if remaining_points <= 0:
+            result['percentiles'] = [
+                {'percentile': p, 'completion_date': as_of, 'steps': 0} for p in percentiles
+            ]
+            result['probability_by_end_date'] = 1.0
+            return result
+        
+        if len(samples) == 0 or samples.sum() <= 0:
+            logger.warning("完了予測: 履歴期間に完了実績がないため予測できません")
+            result['percentiles'] = [
+                {'percentile': p, 'completion_date': None, 'steps': None} for p in percentiles
+            ]
+            result['probability_by_end_date'] = 0.0
+            return result
+        
+        rng = np.random.default_rng(seed)
+        steps = self._simulate(rng, samples, remaining_points, trials, self.MAX_STEPS[unit])
+        
+        # ステップ数 → 日付変換
+        sorted_steps = np.sort(steps)
+        step_dates = self._step_dates(as_of, unit, self.MAX_STEPS[unit])
+        result['percentiles'] = []
+        for p in percentiles:
+            rank = max(0, math.ceil(p / 100 * trials) - 1)
+            step = sorted_steps[rank]
+            if step > self.MAX_STEPS[unit]:
+                # シミュレーション上限内に完了しない
+                result['percentiles'].append({'percentile': p, 'completion_date': None, 'steps': None})
+            else:
+                result['percentiles'].append({
+                    'percentile': p,
+                    'completion_date': step_dates[int(step) - 1],
+                    'steps': int(step)
+                })
+        
+        steps_by_end = int(np.searchsorted(np.array(step_dates, dtype='datetime64[D]'), np.datetime64(end_date), side='right'))
+        result['probability_by_end_date'] = float(np.mean(steps <= steps_by_end)) if steps_by_end > 0 else 0.0
+        return result
+    
+    def _simulate(
+        self,
+        rng: np.random.Generator,
+        samples: np.ndarray,
+        remaining_points: float,
+        trials: int,
+        max_steps: int
+    ) -> np.ndarray:
+        """完了までのステップ数をシミュレーション
+        
+        全試行を行列としてまとめて扱い、BLOCK_STEPS単位で抽出・累積する。
+        上限までに完了しない試行は max_steps + 1 を返す。
+        """
+        finished_at = np.full(trials, max_steps + 1, dtype=np.int64)
+        completed = np.zeros(trials, dtype=np.float64)
+        active = np.arange(trials)
+        
+        for block_start in range(0, max_steps, self.BLOCK_STEPS):
+            block_steps = min(self.BLOCK_STEPS, max_steps - block_start)
+            draws = rng.choice(samples, size=(len(active), block_steps))
+            cumulative = completed[active, None] + np.cumsum(draws, axis=1)
+            reached = cumulative >= remaining_points
+            done = reached.any(axis=1)
+            
+            finished_at[active[done]] = block_start + reached[done].argmax(axis=1) + 1
+            completed[active] = cumulative[:, -1]
+            active = active[~done]
+            if len(active) == 0:
+                break
+        
+        return finished_at
+    
+    def _sample_throughput(
+        self,
+        issues: List[IssueModel],
+        as_of: date,
+        unit: str,
+        history_weeks: int
+    ) -> Tuple[np.ndarray, date]:
+        """過去のスループット標本を作成
+        
+        day: 履歴期間の営業日ごとの完了ポイント（休日の完了は直前の営業日に計上）
+        week: as_ofを末日とする7日区切りごとの完了ポイント
+        
+        Returns:
+            Tuple[np.ndarray, date]: (スループット標本, 履歴開始日)
+        """
+        history_start = as_of - timedelta(weeks=history_weeks) + timedelta(days=1)
+        days = (as_of - history_start).days + 1
+        
+        daily_points = np.zeros(days, dtype=np.float64)
+        for issue in issues:
+            if not issue.completed_at or not issue.point:
+                continue
+            completed_date = issue.completed_at.astimezone(timezone.utc).date() if issue.completed_at.tzinfo else issue.completed_at.date()
+            index = (completed_date - history_start).days
+            if 0 <= index < days:
+                daily_points[index] += issue.point
+        
+        if unit == 'week':
+            return daily_points.reshape(history_weeks, 7).sum(axis=1), history_start
+        
+        # 営業日単位に集約
+        samples = []
+        for index in range(days):
+            current = history_start + timedelta(days=index)
+            if self.business_day_calc.is_business_day(current) or not samples:
+                samples.append(daily_points[index])
+            else:
+                samples[-1] += daily_points[index]
+        return np.array(samples, dtype=np.float64), history_start
+    
+    def _step_dates(self, as_of: date, unit: str, max_steps: int) -> List[date]:
+        """ステップ番号（1始まり）に対応する日付リスト"""
+        if unit == 'week':
+            return [as_of + timedelta(weeks=step) for step in range(1, max_steps + 1)]
+        
+        dates = []
+        current = as_of
+        while len(dates) < max_steps:
+            current += timedelta(days=1)
+            if self.business_day_calc.is_business_day(current):
+                dates.append(current)
+        return dates
+
+# グローバルインスタンス
+completion_forecaster = CompletionForecaster()
@@ -0,0 +1,228 @@
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+import json
+import logging
+import numpy as np
+from app.models.issue import IssueModel
+from app.utils.issue_filters import apply_chart_filters
+
+logger = logging.getLogger(__name__)
+
+# 警告の並び順（apply_scope_filtersの処理順）
+WARNING_STAGES = {
+    'quarter': 0,
+    'template': 1,
+    'goal': 1,
+    'unnecessary': 1,
+    'excluded': 1,
+    'created-after-period': 2,
+    'post-period': 2,
+    'pre-period': 2,
+    'no-due-date': 3
+}
+
+def _to_utc_date(value: datetime) -> date:
+    """timezone-awareなdatetimeから、UTCのdateを取得"""
+    return value.astimezone(timezone.utc).date() if value.tzinfo else value.date()
+
+class IncrementalChartState:
+    """1つの (期間, フィルタ) の日別累積値・ベロシティ・警告
+    
+    issueごとの寄与（作成日・完了日インデックス、ポイント、週インデックス）を保持し、
+    issueが変更された場合は旧寄与を差し引いて新寄与を加えるだけで累積値を更新する
+    """
+    
+    def __init__(self, start_date: date, end_date: date, filters: Dict[str, Any]):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.filters = filters
+        self.days = (end_date - start_date).days + 1
+        
+        # ベロシティは期間内の週単位で集計（月曜始まり）
+        self.weeks = (end_date - start_date).days // 7 + 1
+        last_week_start = end_date - timedelta(days=end_date.weekday())
+        self.first_week_start = last_week_start - timedelta(weeks=self.weeks - 1)
+        
+        self.created_points = np.zeros(self.days, dtype=np.float64)
+        self.completed_points = np.zeros(self.days, dtype=np.float64)
+        self.completed_issues = np.zeros(self.days, dtype=np.int64)
+        self.velocity_points = np.zeros(self.weeks, dtype=np.float64)
+        self.velocity_issues = np.zeros(self.weeks, dtype=np.int64)
+        self.total_points = 0.0
+        self.total_issues = 0
+        
+        self._contributions: Dict[int, Tuple[Optional[int], Optional[int], Optional[int], float]] = {}
+        self._warnings: Dict[int, Tuple[Tuple[Any, ...], List[Dict[str, Any]]]] = {}
+    
+    def build(self, issues: List[IssueModel]) -> None:
+        """全issueから初期構築"""
+        included, warnings = apply_chart_filters(issues, self.start_date, self.end_date, self.filters)
+        originals = {issue.id: issue for issue in issues}
+        for issue in included:
+            self._add(issue)
+        for warning in warnings:
+            issue_id = warning['issue'].id
+            if issue_id not in self._warnings:
+                self._warnings[issue_id] = (self._sort_key(originals.get(issue_id, warning['issue'])), [])
+            self._warnings[issue_id][1].append(warning)
+    
+    def apply_issue_change(self, old: Optional[IssueModel], new: Optional[IssueModel]) -> None:
+        """issue変更の差分適用（旧issueの寄与を取り消し、新issueの寄与を加える）"""
+        if old is not None:
+            self._remove(old.id)
+        if new is None:
+            return
+        
+        included, warnings = apply_chart_filters([new], self.start_date, self.end_date, self.filters)
+        if included:
+            self._add(included[0])
+        if warnings:
+            self._warnings[new.id] = (self._sort_key(new), warnings)
+    
+    def counters(self) -> Dict[str, Any]:
+        """日別累積値（ChartAnalyzer._build_daily_countersと同じ形式）"""
+        return {
+            'created_points': self.created_points.tolist(),
+            'completed_points': self.completed_points.tolist(),
+            'completed_issues': self.completed_issues.tolist(),
+            'total_points': self.total_points,
+            'total_issues': self.total_issues
+        }
+    
+    def velocity(self) -> List[Dict[str, Any]]:
+        """週次ベロシティ（ChartAnalyzer.generate_velocity_dataと同じ形式）"""
+        return [
+            {
+                'week_start': self.first_week_start + timedelta(weeks=week_index),
+                'week_end': self.first_week_start + timedelta(weeks=week_index, days=6),
+                'completed_points': float(self.velocity_points[week_index]),
+                'completed_issues': int(self.velocity_issues[week_index])
+            }
+            for week_index in range(self.weeks)
+        ]
+    
+    def warnings(self) -> List[Dict[str, Any]]:
+        """警告情報（apply_scope_filtersと同じ並び順）"""
+        entries = []
+        for sort_key, warnings in self._warnings.values():
+            for warning in warnings:
+                entries.append(((WARNING_STAGES.get(warning['reason'], 1),) + sort_key, warning))
+        entries.sort(key=lambda entry: entry[0])
+        return [warning for _, warning in entries]
+    
+    def _add(self, issue: IssueModel) -> None:
+        point = issue.point or 0.0
+        created_index = None
+        if issue.created_at and issue.point:
+            created_index = max(0, (_to_utc_date(issue.created_at) - self.start_date).days)
+        completed_index = None
+        week_index = None
+        if issue.completed_at:
+            completed_date = _to_utc_date(issue.completed_at)
+            completed_index = max(0, (completed_date - self.start_date).days)
+            week_index = (completed_date - self.first_week_start).days // 7
+        
+        self._contributions[issue.id] = (created_index, completed_index, week_index, point)
+        self._apply(created_index, completed_index, week_index, point, 1)
+    
+    def _remove(self, issue_id: int) -> None:
+        self._warnings.pop(issue_id, None)
+        contribution = self._contributions.pop(issue_id, None)
+        if contribution is not None:
+            self._apply(*contribution, -1)
+    
+    def _apply(
+        self,
+        created_index: Optional[int],
+        completed_index: Optional[int],
+        week_index: Optional[int],
+        point: float,
+        sign: int
+    ) -> None:
+        """累積値への寄与を加算（sign=-1で取り消し）"""
+        self.total_issues += sign
+        self.total_points += sign * point
+        if created_index is not None and created_index < self.days:
+            self.created_points[created_index:] += sign * point
+        if completed_index is not None and completed_index < self.days:
+            self.completed_issues[completed_index:] += sign
+            self.completed_points[completed_index:] += sign * point
+        if week_index is not None and 0 <= week_index < self.weeks:
+            self.velocity_points[week_index] += sign * point
+            self.velocity_issues[week_index] += sign
+    
+    @staticmethod
+    def _sort_key(issue: IssueModel) -> Tuple[Any, ...]:
+        """ストアの並び順（作成日時の降順）に合わせたソートキー"""
+        created_at = issue.created_at.timestamp() if issue.created_at else float('-inf')
+        return (-created_at, -issue.id)
+
+class ProjectChartStates:
+    """1プロジェクト分のIncrementalChartState（Issueストアのリスナー）
+    
+    保持数を超えた場合は最も古く使われた状態から破棄する
+    """
+    
+    def __init__(self, max_states: int = 32):
+        self.max_states = max_states
+        self._states: "OrderedDict[str, IncrementalChartState]" = OrderedDict()
+    
+    def get_state(
+        self,
+        issues: List[IssueModel],
+        start_date: date,
+        end_date: date,
+        filters: Dict[str, Any]
+    ) -> IncrementalChartState:
+        """状態取得（未作成の場合はissuesから構築）"""
+        key = json.dumps(
+            [start_date.isoformat(), end_date.isoformat(), {k: v for k, v in filters.items() if v is not None}],
+            sort_keys=True,
+            default=str
+        )
+        state = self._states.get(key)
+        if state is None:
+            state = IncrementalChartState(start_date, end_date, filters)
+            state.build(issues)
+            self._states[key] = state
+            while len(self._states) > self.max_states:
+                self._states.popitem(last=False)
+        self._states.move_to_end(key)
+        return state
+    
+    def apply_issue_change(self, old: Optional[IssueModel], new: Optional[IssueModel]) -> None:
+        for state in self._states.values():
+            state.apply_issue_change(old, new)
+    
+    def reset(self) -> None:
+        self._states.clear()
+
+class IncrementalChartService:
+    """Issueストアの変更を差分適用するチャート累積値サービス"""
+    
+    def __init__(self, max_states_per_project: int = 32):
+        self.max_states_per_project = max_states_per_project
+        self._projects: Dict[str, ProjectChartStates] = {}
+    
+    def get_state(
+        self,
+        store,
+        start_date: date,
+        end_date: date,
+        filters: Dict[str, Any]
+    ) -> IncrementalChartState:
+        """ストアの (期間, フィルタ) の状態取得
+        
+        Args:
+            store: 同期済みのProjectIssueStore
+        """
+        states = self._projects.get(store.project_key)
+        if states is None:
+            states = ProjectChartStates(self.max_states_per_project)
+            store.add_listener(states)
+            self._projects[store.project_key] = states
+        return states.get_state(store.get_issues(), start_date, end_date, filters)
+
+# グローバルインスタンス
+incremental_chart_service = IncrementalChartService()
@@ -0,0 +1,280 @@
+from typing import List, Dict, Any, Optional, Set, Iterable, Iterator, Tuple
+from datetime import date, datetime, timezone
+from bisect import bisect_left, bisect_right, insort
+import logging
+from app.models.issue import IssueModel
+from app.utils.issue_filters import EXCLUDED_KANBAN_STATUSES
+from app.utils.shared_filters import sort_position
+from app.services.text_index import TextIndex
+from app.services.suggest_index import SuggestIndex
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 転置インデックスを作る項目（値の一致で絞り込む項目）
+INDEXED_FIELDS = ['milestone', 'assignee', 'service', 'quarter', 'kanban_status', 'state']
+
+# 事前に並べておくソートキー（作成日時はスコープの日付補正で値が変わるため対象外、
+# 更新日時も未設定時は作成日時で並べるため対象外）
+PRESORTED_KEYS = ['point', 'title', 'state', 'completed_at']
+
+class IssueIndex:
+    """issueストアの転置インデックス
+    
+    項目ごとに 値 → issue IDの集合 を保持する。複数項目の絞り込みは小さい集合から
+    順に積集合を取り、ファセット（値ごとの件数）は絞り込み結果との積集合の件数で求める。
+    
+    作成日・完了日は (UTCの日付の序数, issue ID) の昇順リストに保持し、日付範囲の絞り込みと
+    チャートのスコープ判定（期間後作成・期間前後完了）を二分探索とスライスで解決する。
+    タイトル・説明文の検索はn-gramの転置インデックス（text）、入力補完は前方一致用の
+    昇順配列（suggest）で解決する。
+    
+    ストアのリスナーとして、issueの変更時は旧値・新値の集合・日付リストだけを更新する。
+    対象はストアのget_issues()と同じく除外ルール適用済みのissueのみ
+    """
+    
+    fields = INDEXED_FIELDS
+    
+    def __init__(self, store):
+        self.store = store
+        self._postings: Dict[str, Dict[Any, Set[int]]] = {}
+        self._ids: Set[int] = set()
+        # 作成日・補正後の作成日（完了日より後の場合は完了日）・完了日
+        self._created_days: List[Tuple[int, int]] = []
+        self._effective_days: List[Tuple[int, int]] = []
+        self._completed_days: List[Tuple[int, int]] = []
+        self.text = TextIndex(cjk_bigrams=settings.search_cjk_bigrams)
+        self.suggest = SuggestIndex()
+        # (ソートキー, 降順か) → ソート位置（sort_position）の昇順リスト
+        self._orders: Dict[Tuple[str, bool], List[Tuple[Any, float, int]]] = {}
+        self.reset()
+    
+    def reset(self) -> None:
+        """ストアの全issueから再構築"""
+        self._postings = {field: {} for field in INDEXED_FIELDS}
+        self._ids = set()
+        self._created_days = []
+        self._effective_days = []
+        self._completed_days = []
+        self.text.clear()
+        self.suggest.clear()
+        self._orders = {}
+        for issue in self.store.get_issues():
+            self._add(issue, sort=False)
+        self._created_days.sort()
+        self._effective_days.sort()
+        self._completed_days.sort()
+        self.suggest.sort()
+        logger.debug(f"Issueインデックス構築: {self.store.project_key}")
+    
+    def apply_issue_change(self, old: Optional[IssueModel], new: Optional[IssueModel]) -> None:
+        if old is not None:
+            self._remove(old)
+        if new is not None:
+            self._add(new)
+    
+    def select(self, conditions: Dict[str, Any]) -> Optional[Set[int]]:
+        """値の一致条件に該当するissue ID（インデックス対象の条件がない場合はNone）
+        
+        Args:
+            conditions: 項目 → 値（値がNone・空の項目は条件なし）
+        """
+        postings = [
+            self._postings[field].get(value, set())
+            for field, value in conditions.items()
+            if field in self._postings and value
+        ]
+        if not postings:
+            return None
+        
+        postings.sort(key=len)
+        selected = set(postings[0])
+        for posting in postings[1:]:
+            if not selected:
+                break
+            selected &= posting
+        return selected
+    
+    def select_created(
+        self,
+        low: Optional[date],
+        high: Optional[date],
+        start_date: Optional[date] = None
+    ) -> Set[int]:
+        """作成日（UTCの日付）が範囲内のissue ID
+        
+        apply_date_correctionの補正後の作成日で判定する（完了日より後の作成日は完了日、
+        start_dateより前の作成日はstart_date）
+        """
+        low_day = low.toordinal() if low else None
+        high_day = high.toordinal() if high else None
+        selected = self._slice(self._effective_days, low_day, high_day)
+        if start_date is None:
+            return selected
+        
+        # start_dateより前に作成されたissueは、start_dateが範囲内の場合のみ該当
+        start_day = start_date.toordinal()
+        before_start = self._slice(self._created_days, None, start_day - 1)
+        selected -= before_start
+        if (low_day is None or low_day <= start_day) and (high_day is None or start_day <= high_day):
+            selected |= before_start
+        return selected
+    
+    def select_completed(
+        self,
+        low: Optional[date],
+        high: Optional[date],
+        include_incomplete: bool = False
+    ) -> Set[int]:
+        """完了日（UTCの日付）が範囲内のissue ID（include_incomplete指定時は未完了のissueを含める）"""
+        low_day = low.toordinal() if low else None
+        high_day = high.toordinal() if high else None
+        if not include_incomplete:
+            return self._slice(self._completed_days, low_day, high_day)
+        
+        excluded = set()
+        if low_day is not None:
+            excluded |= self._slice(self._completed_days, None, low_day - 1)
+        if high_day is not None:
+            excluded |= self._slice(self._completed_days, high_day + 1, None)
+        return self._ids - excluded
+    
+    def scope_violations(self, start_date: date, end_date: date) -> Optional[Dict[int, str]]:
+        """apply_scope_filtersのスコープ判定で除外されるissue ID → 警告理由
+        
+        期間後作成（補正後の作成日 > end_date）・期間後完了・期間前完了を、この順の優先度で返す。
+        開始日が終了日より後の場合はNone（issueごとの判定が必要）
+        """
+        if start_date > end_date:
+            return None
+        
+        start_day = start_date.toordinal()
+        end_day = end_date.toordinal()
+        violations = dict.fromkeys(self._slice(self._completed_days, None, start_day - 1), 'pre-period')
+        violations.update(dict.fromkeys(self._slice(self._completed_days, end_day + 1, None), 'post-period'))
+        violations.update(dict.fromkeys(self._slice(self._effective_days, end_day + 1, None), 'created-after-period'))
+        return violations
+    
+    def ordered_ids(
+        self,
+        sort_by: str,
+        sort_order: str,
+        after: Optional[Tuple[Any, float, int]] = None
+    ) -> Optional[Iterator[int]]:
+        """ソート順のissue ID（sort_issuesでストアの全issueを並べた順、PRESORTED_KEYS以外はNone）
+        
+        Args:
+            after: ソート位置（sort_position）。指定時はこの位置より後のissueから返す（二分探索で開始位置を求める）
+        """
+        if sort_by not in PRESORTED_KEYS:
+            return None
+        descending = sort_order == 'desc'
+        order = self._orders.get((sort_by, descending))
+        if order is None:
+            order = sorted(
+                sort_position(issue, sort_by, descending)
+                for issue in self.get_issues(self._ids)
+            )
+            self._orders[(sort_by, descending)] = order
+        
+        if descending:
+            end = len(order) if after is None else bisect_left(order, after)
+            return (order[position][2] for position in range(end - 1, -1, -1))
+        begin = 0 if after is None else bisect_right(order, after)
+        return (-order[position][2] for position in range(begin, len(order)))
+    
+    def get_issues(self, issue_ids: Iterable[int]) -> List[IssueModel]:
+        """issue IDからissue取得（ストアにないIDは無視）"""
+        issues = []
+        for issue_id in issue_ids:
+            issue = self.store.get_issue(issue_id)
+            if issue is not None:
+                issues.append(issue)
+        return issues
+    
+    def facets(self, issue_ids: Optional[Set[int]] = None) -> Dict[str, Dict[str, int]]:
+        """項目・値ごとのissue数（値がNoneのissueは数えない）
+        
+        Args:
+            issue_ids: 対象のissue ID（Noneの場合はストアの全issue）
+        """
+        facets: Dict[str, Dict[str, int]] = {}
+        for field, postings in self._postings.items():
+            counts = {}
+            for value, posting in postings.items():
+                if value is None:
+                    continue
+                count = len(posting) if issue_ids is None else len(posting & issue_ids)
+                if count:
+                    counts[value] = count
+            facets[field] = dict(sorted(counts.items()))
+        return facets
+    
+    def _add(self, issue: IssueModel, sort: bool = True) -> None:
+        if issue.kanban_status in EXCLUDED_KANBAN_STATUSES:
+            return
+        for field, postings in self._postings.items():
+            postings.setdefault(getattr(issue, field), set()).add(issue.id)
+        
+        self._ids.add(issue.id)
+        self.text.add(issue)
+        self.suggest.add(issue, sort)
+        add = insort if sort else list.append
+        for days, day in self._day_entries(issue):
+            add(days, (day, issue.id))
+        for (sort_by, descending), order in self._orders.items():
+            insort(order, sort_position(issue, sort_by, descending))
+    
+    def _remove(self, issue: IssueModel) -> None:
+        if issue.id not in self._ids:
+            return
+        for field, postings in self._postings.items():
+            value = getattr(issue, field)
+            posting = postings.get(value)
+            if posting is None:
+                continue
+            posting.discard(issue.id)
+            if not posting:
+                del postings[value]
+        
+        self._ids.discard(issue.id)
+        self.text.remove(issue.id)
+        self.suggest.remove(issue)
+        for days, day in self._day_entries(issue):
+            position = bisect_left(days, (day, issue.id))
+            if position < len(days) and days[position] == (day, issue.id):
+                del days[position]
+        for (sort_by, descending), order in self._orders.items():
+            entry = sort_position(issue, sort_by, descending)
+            position = bisect_left(order, entry)
+            if position < len(order) and order[position] == entry:
+                del order[position]
+    
+    def _day_entries(self, issue: IssueModel) -> List[Tuple[List[Tuple[int, int]], int]]:
+        """issueの日付リストと日付の序数"""
+        entries = []
+        completed_day = self._utc_day(issue.completed_at) if issue.completed_at else None
+        if issue.created_at:
+            created_day = self._utc_day(issue.created_at)
+            entries.append((self._created_days, created_day))
+            entries.append((
+                self._effective_days,
+                min(created_day, completed_day) if completed_day is not None else created_day
+            ))
+        if completed_day is not None:
+            entries.append((self._completed_days, completed_day))
+        return entries
+    
+    @staticmethod
+    def _slice(days: List[Tuple[int, int]], low: Optional[int], high: Optional[int]) -> Set[int]:
+        """日付の序数がlow以上high以下のissue ID（二分探索で範囲を求める）"""
+        begin = 0 if low is None else bisect_left(days, (low,))
+        end = len(days) if high is None else bisect_left(days, (high + 1,))
+        return {issue_id for _, issue_id in days[begin:end]}
+    
+    @staticmethod
+    def _utc_day(value: datetime) -> int:
+        """UTCの日付の序数（timezone-naiveはUTCとして扱う）"""
+        if value.tzinfo:
+            value = value.astimezone(timezone.utc)
+        return value.date().toordinal()
@@ -20,9 +20,13 @@ class IssueService:
         milestone: Optional[str] = None,
         assignee: Optional[str] = None,
         labels: Optional[List[str]] = None,
-        per_page: int = 100
+        per_page: int = 100,
+        updated_after: Optional[datetime] = None
     ) -> List[IssueModel]:
-        """全issue取得（ページネーション対応）"""
+        """全issue取得（ページネーション対応）
+        
+        updated_after指定時は、その日時以降に更新されたissueのみ取得する（差分同期用）
+        """
         if not self.client or not self.client.gl or not self.client.project:
             raise ValueError("GitLab接続が設定されていません")
         
@@ -48,6 +52,8 @@ class IssueService:
                     params['assignee_username'] = assignee
                 if labels:
                     params['labels'] = ','.join(labels)
+                if updated_after:
+                    params['updated_after'] = updated_after.isoformat()
                 
                 # API呼び出し
                 issues_page = self.client.project.issues.list(**params)
@@ -91,6 +97,55 @@ class IssueService:
             logger.error(f"Issue取得失敗 (ID: {issue_id}): {e}")
             return None
     
+    def fetch_label_events(
+        self,
+        issue_iid: int,
+        known_count: int = 0,
+        per_page: int = 100
+    ) -> List[Tuple[int, datetime, str, Optional[str]]]:
+        """issueのラベルイベント取得（同期呼び出し、スレッドから実行する）
+        
+        ラベルイベントはID順に追加されるのみのため、取得済みの件数（known_count）を
+        含むページから取得する。呼び出し側でイベントIDによる重複除去を行うこと
+        
+        Returns:
+            List[Tuple[int, datetime, str, Optional[str]]]:
+                (イベントID, 発生日時, action（add / remove）, ラベル名（削除済みラベルはNone）) のリスト
+        """
+        if not self.client or not self.client.gl or not self.client.project:
+            raise ValueError("GitLab接続が設定されていません")
+        
+        issue = self.client.project.issues.get(issue_iid, lazy=True)
+        events = []
+        page = known_count // per_page + 1
+        while True:
+            events_page = issue.resourcelabelevents.list(page=page, per_page=per_page)
+            for event in events_page:
+                label = event.label or {}
+                created_at = self._parse_datetime(event.created_at)
+                if created_at:
+                    events.append((event.id, created_at, event.action, label.get('name')))
+            
+            if len(events_page) < per_page:
+                break
+            page += 1
+        return events
+    
+    def fetch_issue_links(self, issue_iid: int) -> List[Tuple[int, str]]:
+        """issueのリンク取得（同期呼び出し、スレッドから実行する）
+        
+        Returns:
+            List[Tuple[int, str]]: (リンク先issue ID, link_type（このissueから見た関係）) のリスト
+        """
+        if not self.client or not self.client.gl or not self.client.project:
+            raise ValueError("GitLab接続が設定されていません")
+        
+        issue = self.client.project.issues.get(issue_iid, lazy=True)
+        return [
+            (link.id, getattr(link, 'link_type', None) or 'relates_to')
+            for link in issue.links.list(get_all=True)
+        ]
+    
     async def get_issues_by_milestone(
         self,
         milestone: str,
@@ -191,11 +246,11 @@ class IssueService:
             issues = [i for i in issues if i.kanban_status == kanban_status]
         
         # 統計情報生成
-        statistics = self._generate_statistics(issues)
+        statistics = self.generate_statistics(issues)
         
         return issues, statistics
     
-    def _generate_statistics(self, issues: List[IssueModel]) -> Dict[str, Any]:
+    def generate_statistics(self, issues: List[IssueModel]) -> Dict[str, Any]:
         """
         Issue統計情報生成
         """
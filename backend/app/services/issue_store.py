@@ -0,0 +1,204 @@
+from typing import List, Dict, Optional, Any
+from datetime import datetime, timedelta, timezone
+import asyncio
+import hashlib
+import logging
+from app.models.issue import IssueModel
+from app.services.issue_analyzer import issue_analyzer
+from app.utils.issue_filters import apply_exclusion_filter
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+def project_store_key(gitlab_client) -> str:
+    """Issueストアのプロジェクト識別子（GitLab URL + 数値のプロジェクトID + 認証情報のハッシュ）
+    
+    参照できるissueはアクセストークンの権限で異なるため、同じプロジェクトでも
+    アクセストークンごとに別のストア・キャッシュにする（トークン自体は含めない）
+    """
+    project = gitlab_client.project
+    project_id = getattr(project, 'id', None) or gitlab_client.project_id
+    token = getattr(gitlab_client, 'token', None) or ''
+    credential = hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+    return f"{gitlab_client.url}|{project_id}|{credential}"
+
+class ProjectIssueStore:
+    """プロジェクト単位の分析済みissueストア
+    
+    issueをIDで保持し、変更のたびにversionを上げてリスナーへ通知する。
+    リスナーは apply_issue_change(old, new) と reset() を実装する
+    """
+    
+    def __init__(self, project_key: str, project_id: Optional[int] = None):
+        self.project_key = project_key
+        self.project_id = project_id
+        self.client = None  # 同期に使うGitLabクライアント（ストアと同じ認証情報）
+        self.version = 0
+        self.loaded_at: Optional[datetime] = None  # 最終全件取得日時
+        self.synced_at: Optional[datetime] = None  # 最終同期（全件・差分）開始日時
+        self.lock = asyncio.Lock()
+        self._issues: Dict[int, IssueModel] = {}
+        self._listeners: List[Any] = []
+        self._ordered: Optional[List[IssueModel]] = None
+        self._ordered_all: Optional[List[IssueModel]] = None
+        self._ordered_version = -1
+        self._index = None
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+    
+    def add_listener(self, listener: Any) -> None:
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Any) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def get_issues(self, include_excluded: bool = False) -> List[IssueModel]:
+        """全issue（作成日時の降順、include_excluded未指定時は除外ルール適用済み）"""
+        if self._ordered_version != self.version:
+            self._ordered_all = sorted(
+                self._issues.values(),
+                key=lambda issue: (issue.created_at or datetime.min.replace(tzinfo=timezone.utc), issue.id),
+                reverse=True
+            )
+            self._ordered = apply_exclusion_filter(self._ordered_all)
+            self._ordered_version = self.version
+        return self._ordered_all if include_excluded else self._ordered
+    
+    def get_index(self):
+        """転置インデックス取得（初回に構築し、以降はリスナーとして差分更新）"""
+        if self._index is None:
+            from app.services.issue_index import IssueIndex
+            self._index = IssueIndex(self)
+            self.add_listener(self._index)
+        return self._index
+    
+    def get_issue(self, issue_id: int) -> Optional[IssueModel]:
+        return self._issues.get(issue_id)
+    
+    def replace_all(self, issues: List[IssueModel], synced_at: datetime) -> None:
+        """全件置き換え（リスナーは再構築が必要）"""
+        self._issues = {issue.id: issue for issue in issues}
+        self.version += 1
+        self.loaded_at = synced_at
+        self.synced_at = synced_at
+        for listener in self._listeners:
+            listener.reset()
+    
+    def upsert(self, issue: IssueModel) -> bool:
+        """issue追加・更新（変更がない場合はFalse）"""
+        old = self._issues.get(issue.id)
+        if old is not None and old == issue:
+            return False
+        
+        self._issues[issue.id] = issue
+        self.version += 1
+        for listener in self._listeners:
+            listener.apply_issue_change(old, issue)
+        return True
+    
+    def remove(self, issue_id: int) -> bool:
+        """issue削除"""
+        old = self._issues.pop(issue_id, None)
+        if old is None:
+            return False
+        
+        self.version += 1
+        for listener in self._listeners:
+            listener.apply_issue_change(old, None)
+        return True
+
+class IssueStore:
+    """プロジェクト単位のissueストア管理
+    
+    初回（および全件再取得間隔経過後）は全件取得し、それ以外は
+    updated_afterによる差分同期で変更されたissueのみ取得・分析する
+    """
+    
+    # 差分同期時のupdated_afterの余裕（GitLabとの時刻ずれ対策）
+    SYNC_MARGIN = timedelta(seconds=5)
+    
+    def __init__(self, sync_seconds: int = 30, refresh_seconds: int = 3600):
+        self.sync_interval = timedelta(seconds=sync_seconds)
+        self.refresh_interval = timedelta(seconds=refresh_seconds)
+        self._stores: Dict[str, ProjectIssueStore] = {}
+    
+    def get_store(self, gitlab_client) -> ProjectIssueStore:
+        """GitLabクライアントのプロジェクト・認証情報のストア取得（未作成の場合は作成）
+        
+        同期に使うクライアントは作成時のものを使い続け、再接続等で接続が切れたか
+        認証情報が変わった場合のみ、同じ認証情報の呼び出し元のクライアントに置き換える
+        """
+        key = project_store_key(gitlab_client)
+        store = self._stores.get(key)
+        if store is None:
+            store = ProjectIssueStore(key, getattr(gitlab_client.project, 'id', None))
+            self._stores[key] = store
+        if (
+            store.client is None
+            or not store.client.is_connected
+            or project_store_key(store.client) != key
+        ):
+            store.client = gitlab_client
+        return store
+    
+    def find_stores(self, project_id: int) -> List[ProjectIssueStore]:
+        """数値のプロジェクトIDに対応するストア一覧（Webhook用、認証情報ごとのストアをすべて返す）"""
+        return [store for store in self._stores.values() if store.project_id == project_id]
+    
+    async def get_issues(self, gitlab_client, force: bool = False) -> List[IssueModel]:
+        """同期済みの分析済みissue取得（除外ルール適用済み）
+        
+        Args:
+            force: 同期間隔に関わらず差分同期してから取得する
+        """
+        store = self.get_store(gitlab_client)
+        await self.sync(store, force=force)
+        return store.get_issues()
+    
+    async def sync(self, store: ProjectIssueStore, force: bool = False) -> None:
+        """ストア同期（全件再取得または差分同期）
+        
+        Args:
+            store: 同期するストア
+            force: 同期間隔に関わらず差分同期する（Webhook受信時）
+        """
+        async with store.lock:
+            now = datetime.now(timezone.utc)
+            if not store.is_loaded or now - store.loaded_at >= self.refresh_interval:
+                await self._full_refresh(store, now)
+            elif force or now - store.synced_at >= self.sync_interval:
+                await self._delta_sync(store, now)
+    
+    async def _full_refresh(self, store: ProjectIssueStore, now: datetime) -> None:
+        issues = await self._fetch_issues(store)
+        store.replace_all(issues, now)
+        logger.info(f"Issueストア全件取得: {store.project_key} ({len(issues)}件)")
+    
+    async def _delta_sync(self, store: ProjectIssueStore, now: datetime) -> None:
+        issues = await self._fetch_issues(store, updated_after=store.synced_at - self.SYNC_MARGIN)
+        changed = sum(1 for issue in issues if store.upsert(issue))
+        store.synced_at = now
+        if changed:
+            logger.info(f"Issueストア差分同期: {store.project_key} ({changed}件更新)")
+    
+    async def _fetch_issues(
+        self,
+        store: ProjectIssueStore,
+        updated_after: Optional[datetime] = None
+    ) -> List[IssueModel]:
+        """issue取得・分析（除外ルールは読み出し時に適用）"""
+        from app.services.issue_service import IssueService
+        issue_service = IssueService()
+        issue_service.client = store.client
+        
+        issues = await issue_service.get_all_issues(state='all', updated_after=updated_after)
+        return issue_analyzer.analyze_issues_batch(issues) if issues else []
+
+# グローバルインスタンス
+issue_store = IssueStore(
+    sync_seconds=settings.issue_store_sync_seconds,
+    refresh_seconds=settings.issue_store_refresh_seconds
+)
@@ -0,0 +1,300 @@
+from typing import List, Dict, Optional, Tuple
+from datetime import date, datetime, time, timezone
+from collections import OrderedDict
+import asyncio
+import logging
+from app.models.issue import IssueModel
+from app.services.issue_analyzer import issue_analyzer
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# ラベルイベント: (イベントID, 発生日時, action（add / remove）, ラベル名（削除済みラベルはNone）)
+LabelEvent = Tuple[int, datetime, str, Optional[str]]
+
+# Kanban Statusの遷移: (変更日時, 変更後のKanban Status（#ラベルなしの場合はNone）)
+StatusTransition = Tuple[datetime, Optional[str]]
+
+class ProjectLabelEvents:
+    """1プロジェクト分のラベルイベントのキャッシュ
+    
+    保持数を超えた場合は最も古く使われたissueから破棄する
+    """
+    
+    def __init__(self, max_issues: int = 5000):
+        self.max_issues = max_issues
+        # issue ID -> (取得時のissue更新日時, 発生日時順のラベルイベント)
+        self._events: "OrderedDict[int, Tuple[Optional[datetime], List[LabelEvent]]]" = OrderedDict()
+    
+    def get(self, issue_id: int) -> Optional[Tuple[Optional[datetime], List[LabelEvent]]]:
+        cached = self._events.get(issue_id)
+        if cached is not None:
+            self._events.move_to_end(issue_id)
+        return cached
+    
+    def set(self, issue_id: int, updated_at: Optional[datetime], events: List[LabelEvent]) -> None:
+        self._events[issue_id] = (updated_at, events)
+        self._events.move_to_end(issue_id)
+        while len(self._events) > self.max_issues:
+            self._events.popitem(last=False)
+
+class LabelEventService:
+    """GitLabのラベルイベント取得・ラベル履歴の再構築サービス
+    
+    issueごとのラベルイベントはスレッドで並行取得し（同時実行数は上限付き）、
+    issueの更新日時が変わるまでキャッシュする。更新されたissueは取得済みの件数以降のみ
+    取得し、イベントIDで既存のキャッシュにマージする。
+    キャッシュはIssueストアと同じプロジェクト識別子（認証情報を含む）ごとに保持し、
+    プロジェクト数・プロジェクトごとのissue数の上限を超えた場合は最も古く使われたものから破棄する
+    """
+    
+    def __init__(self, max_concurrency: int = 8, max_projects: int = 16, max_issues_per_project: int = 5000):
+        self.max_concurrency = max_concurrency
+        self.max_projects = max_projects
+        self.max_issues_per_project = max_issues_per_project
+        # プロジェクト識別子 -> プロジェクトのラベルイベントのキャッシュ
+        self._projects: "OrderedDict[str, ProjectLabelEvents]" = OrderedDict()
+    
+    async def get_label_events(
+        self,
+        gitlab_client,
+        issues: List[IssueModel]
+    ) -> Tuple[Dict[int, List[LabelEvent]], int]:
+        """issueごとのラベルイベント取得
+        
+        Returns:
+            Tuple[Dict[int, List[LabelEvent]], int]: (issue ID別のラベルイベント, 今回GitLabから取得したissue数)
+        """
+        cache = self._project_cache(gitlab_client)
+        
+        label_events: Dict[int, List[LabelEvent]] = {}
+        stale: List[IssueModel] = []
+        for issue in issues:
+            cached = cache.get(issue.id)
+            if cached is not None and cached[0] == issue.updated_at:
+                label_events[issue.id] = cached[1]
+            else:
+                stale.append(issue)
+        
+        if stale:
+            from app.services.issue_service import IssueService
+            issue_service = IssueService()
+            issue_service.client = gitlab_client
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            
+            async def fetch(issue: IssueModel) -> List[LabelEvent]:
+                cached = cache.get(issue.id)
+                known = cached[1] if cached is not None else []
+                async with semaphore:
+                    events = await asyncio.to_thread(
+                        issue_service.fetch_label_events, issue.iid, len(known)
+                    )
+                merged = {event[0]: event for event in known}
+                merged.update((event[0], event) for event in events)
+                return sorted(merged.values(), key=lambda event: (event[1], event[0]))
+            
+            results = await asyncio.gather(*(fetch(issue) for issue in stale))
+            for issue, events in zip(stale, results):
+                cache.set(issue.id, issue.updated_at, events)
+                label_events[issue.id] = events
+            
+            logger.info(f"ラベルイベント取得: {len(stale)}件 (キャッシュ: {len(issues) - len(stale)}件)")
+        
+        return label_events, len(stale)
+    
+    async def get_status_transitions(
+        self,
+        gitlab_client,
+        issues: List[IssueModel]
+    ) -> Tuple[Dict[int, List[StatusTransition]], int]:
+        """issueごとのKanban Status遷移履歴取得
+        
+        Returns:
+            Tuple[Dict[int, List[StatusTransition]], int]: (issue ID別の遷移履歴, 今回GitLabから取得したissue数)
+        """
+        label_events, fetched = await self.get_label_events(gitlab_client, issues)
+        transitions = {
+            issue.id: self.build_status_transitions(issue, label_events.get(issue.id, []))
+            for issue in issues
+        }
+        return transitions, fetched
+    
+    async def get_issues_as_of(
+        self,
+        gitlab_client,
+        issues: List[IssueModel],
+        as_of: date
+    ) -> Tuple[List[IssueModel], int]:
+        """基準日終了時点のラベルでissueを再分析
+        
+        基準日より後に作成されたissueは除外する。基準日以降に更新されていないissueは
+        ラベルも変わっていないため、ラベルイベントを取得せずにそのまま使用する。
+        due_date・stateはラベルイベントに履歴がないため現在の値を使用する
+        
+        Returns:
+            Tuple[List[IssueModel], int]: (基準日時点の分析済みissue, 今回GitLabから取得したissue数)
+        """
+        as_of_datetime = datetime.combine(as_of, time.max).replace(tzinfo=timezone.utc)
+        
+        existing = [
+            issue for issue in issues
+            if issue.created_at is None or self._to_utc(issue.created_at) <= as_of_datetime
+        ]
+        changed = [
+            issue for issue in existing
+            if issue.updated_at is not None and self._to_utc(issue.updated_at) > as_of_datetime
+        ]
+        label_events, fetched = await self.get_label_events(gitlab_client, changed)
+        
+        result = []
+        for issue in existing:
+            events = label_events.get(issue.id)
+            if events is None:
+                result.append(issue)
+                continue
+            reconstructed = issue.model_copy(update={
+                'labels': self.reconstruct_labels(issue, events, as_of_datetime)
+            })
+            result.append(issue_analyzer.analyze_issue(reconstructed))
+        
+        return result, fetched
+    
+    @staticmethod
+    def reconstruct_labels(
+        issue: IssueModel,
+        events: List[LabelEvent],
+        as_of: datetime
+    ) -> List[str]:
+        """基準日時時点のラベルを再構築
+        
+        作成時のラベル（initial_labels）に、基準日時までのイベントを付与順に適用する
+        """
+        labels = LabelEventService.initial_labels(issue, events)
+        for _, created_at, action, name in events:
+            if created_at > as_of:
+                break
+            if not name:
+                continue
+            if action == 'add' and name not in labels:
+                labels.append(name)
+            elif action == 'remove' and name in labels:
+                labels.remove(name)
+        return labels
+    
+    @staticmethod
+    def build_label_timeline(
+        issue: IssueModel,
+        events: List[LabelEvent]
+    ) -> List[Tuple[datetime, List[str]]]:
+        """作成時点と各ラベル変更時点のラベル一覧（同時刻のイベントはまとめて適用）
+        
+        Returns:
+            List[Tuple[datetime, List[str]]]: (時点, その時点のラベル) の時系列
+        """
+        initial = LabelEventService.initial_labels(issue, events)
+        labels = list(initial)
+        created_at = LabelEventService._to_utc(issue.created_at)
+        
+        timeline: List[Tuple[datetime, List[str]]] = []
+        for _, event_at, action, name in events:
+            if name:
+                if action == 'add' and name not in labels:
+                    labels.append(name)
+                elif action == 'remove' and name in labels:
+                    labels.remove(name)
+            at = max(event_at, created_at)
+            if timeline and timeline[-1][0] == at:
+                timeline[-1] = (at, list(labels))
+            else:
+                timeline.append((at, list(labels)))
+        
+        if not timeline or timeline[0][0] > created_at:
+            timeline.insert(0, (created_at, initial))
+        return timeline
+    
+    @staticmethod
+    def initial_labels(issue: IssueModel, events: List[LabelEvent]) -> List[str]:
+        """作成時のラベル
+        
+        イベントのない現在のラベルは作成時から付与されていたものとみなす。イベントのあるラベルは
+        最初のイベントがremoveの場合のみ作成時に付与されていたものとみなす（最初のイベントの順に並べる）
+        """
+        first_actions: Dict[str, str] = {}
+        for _, _, action, name in events:
+            if name and name not in first_actions:
+                first_actions[name] = action
+        labels = [label for label in issue.labels if label not in first_actions]
+        labels.extend(name for name, action in first_actions.items() if action == 'remove')
+        return labels
+    
+    @staticmethod
+    def build_status_transitions(
+        issue: IssueModel,
+        events: List[LabelEvent]
+    ) -> List[StatusTransition]:
+        """ラベルイベントをKanban Statusの遷移に変換
+        
+        IssueAnalyzerと同様に、複数の#ラベルがある場合は最後に付与されたものを採用する。
+        #ラベルのイベントがない場合は作成時点から現在のKanban Statusとみなす。
+        最初のイベントがremoveの#ラベルは作成時から付与されていたものとみなす
+        """
+        current: List[str] = []
+        for label in LabelEventService.initial_labels(issue, events):
+            match = issue_analyzer.kanban_pattern.match(label)
+            if match and match.group(1) not in current:
+                current.append(match.group(1))
+        transitions: List[StatusTransition] = []
+        if current and issue.created_at:
+            # 遷移は日時順（作成日時より前のイベントがある場合は最初のイベントの日時）
+            initial_at = LabelEventService._to_utc(issue.created_at)
+            if events:
+                initial_at = min(initial_at, LabelEventService._to_utc(events[0][1]))
+            transitions.append((initial_at, current[-1]))
+        for _, created_at, action, name in events:
+            match = issue_analyzer.kanban_pattern.match(name) if name else None
+            if not match:
+                continue
+            
+            status = match.group(1)
+            if action == 'add' and status not in current:
+                current.append(status)
+            elif action == 'remove' and status in current:
+                current.remove(status)
+            else:
+                continue
+            
+            latest = current[-1] if current else None
+            if not transitions or transitions[-1][1] != latest:
+                transitions.append((created_at, latest))
+        
+        if not transitions and issue.kanban_status and issue.created_at:
+            transitions.append((issue.created_at, issue.kanban_status))
+        return transitions
+    
+    @staticmethod
+    def _to_utc(value: datetime) -> datetime:
+        """timezone-naiveなdatetimeはUTCとして扱う"""
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    
+    def clear_cache(self) -> None:
+        self._projects.clear()
+    
+    def _project_cache(self, gitlab_client) -> ProjectLabelEvents:
+        """プロジェクトのキャッシュ取得（未作成の場合は作成）"""
+        from app.services.issue_store import project_store_key
+        key = project_store_key(gitlab_client)
+        cache = self._projects.get(key)
+        if cache is None:
+            cache = ProjectLabelEvents(self.max_issues_per_project)
+            self._projects[key] = cache
+            while len(self._projects) > self.max_projects:
+                self._projects.popitem(last=False)
+        self._projects.move_to_end(key)
+        return cache
+
+# グローバルインスタンス
+label_event_service = LabelEventService(
+    max_concurrency=settings.gitlab_fetch_concurrency,
+    max_projects=settings.label_event_cache_projects,
+    max_issues_per_project=settings.label_event_cache_issues
+)
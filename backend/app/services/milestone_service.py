@@ -0,0 +1,78 @@
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
+from collections import OrderedDict
+import asyncio
+import logging
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+class MilestoneService:
+    """GitLabマイルストーン取得サービス
+    
+    プロジェクトのアクティブなマイルストーンを取得し、キャッシュ期間内は再取得しない。
+    キャッシュはIssueストアと同じプロジェクト識別子（認証情報を含む）ごとに保持し、
+    プロジェクト数の上限を超えた場合は最も古く使われたものから破棄する
+    """
+    
+    def __init__(self, cache_seconds: int = 300, max_projects: int = 16):
+        self.cache_ttl = timedelta(seconds=cache_seconds)
+        self.max_projects = max_projects
+        # プロジェクト識別子 -> (取得日時, マイルストーン)
+        self._cache: "OrderedDict[str, Tuple[datetime, List[Dict[str, Any]]]]" = OrderedDict()
+    
+    async def get_active_milestones(self, gitlab_client) -> List[Dict[str, Any]]:
+        """アクティブなマイルストーン取得（期限日・開始日の昇順）"""
+        from app.services.issue_store import project_store_key
+        key = project_store_key(gitlab_client)
+        now = datetime.now(timezone.utc)
+        
+        cached = self._cache.get(key)
+        if cached is not None and now - cached[0] < self.cache_ttl:
+            self._cache.move_to_end(key)
+            return cached[1]
+        
+        milestones = await asyncio.to_thread(self._fetch_milestones, gitlab_client)
+        milestones.sort(key=lambda m: (m['due_date'] or date.max, m['start_date'] or date.max, m['title']))
+        self._cache[key] = (now, milestones)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_projects:
+            self._cache.popitem(last=False)
+        logger.info(f"マイルストーン取得: {key} ({len(milestones)}件)")
+        return milestones
+    
+    def _fetch_milestones(self, gitlab_client) -> List[Dict[str, Any]]:
+        if not gitlab_client.gl or not gitlab_client.project:
+            raise ValueError("GitLab接続が設定されていません")
+        
+        milestones = []
+        for milestone in gitlab_client.project.milestones.list(state='active', get_all=True):
+            milestones.append({
+                'id': milestone.id,
+                'iid': milestone.iid,
+                'title': milestone.title,
+                'start_date': self._parse_date(getattr(milestone, 'start_date', None)),
+                'due_date': self._parse_date(getattr(milestone, 'due_date', None)),
+                'created_at': self._parse_date(getattr(milestone, 'created_at', None)),
+                'web_url': getattr(milestone, 'web_url', None)
+            })
+        return milestones
+    
+    @staticmethod
+    def _parse_date(value: Optional[str]) -> Optional[date]:
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            logger.warning(f"マイルストーン日付解析失敗: {value}")
+            return None
+    
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+# グローバルインスタンス
+milestone_service = MilestoneService(
+    cache_seconds=settings.milestone_cache_seconds,
+    max_projects=settings.milestone_cache_projects
+)
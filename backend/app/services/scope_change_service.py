@@ -0,0 +1,110 @@
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date, datetime, timezone
+import logging
+from app.models.issue import IssueModel
+from app.services.issue_analyzer import issue_analyzer
+from app.services.label_event_service import label_event_service, LabelEventService
+from app.utils.issue_filters import (
+    apply_chart_filters,
+    EXCLUDED_KANBAN_STATUSES,
+    EXCLUDED_STATUS_REASONS
+)
+
+logger = logging.getLogger(__name__)
+
+# スコープ変化イベント: (日付序数, 種別（added / removed / reestimated）, ポイント, 削除理由)
+ScopeEvent = Tuple[int, str, float, Optional[str]]
+
+class ScopeChangeService:
+    """ラベル履歴によるスコープ変化分析サービス
+    
+    issueの作成時点と各ラベル変更時点のラベルで再分析し、チャートと同じフィルタ
+    （apply_chart_filters）でスコープ内外を判定する。スコープへの追加・スコープからの
+    削除（apply_scope_filtersの警告理由付き）・ポイントの再見積もりをイベントとして出力する
+    """
+    
+    async def analyze(
+        self,
+        gitlab_client,
+        issues: List[IssueModel],
+        start_date: date,
+        end_date: date,
+        filters: Dict[str, Any]
+    ) -> Tuple[List[ScopeEvent], int]:
+        """スコープ変化イベント生成
+        
+        期間開始後に更新されていないissueは期間中にラベルが変わっていないため、
+        ラベルイベントを取得せず現在のラベルのみで判定する
+        
+        Args:
+            issues: 分析済みissue（除外ルール適用前）
+        
+        Returns:
+            Tuple[List[ScopeEvent], int]: (スコープ変化イベント, 今回GitLabから取得したissue数)
+        """
+        start_datetime = datetime.combine(start_date, datetime.min.time()).replace(tzinfo=timezone.utc)
+        changed = [
+            issue for issue in issues
+            if issue.updated_at is not None and self._to_utc(issue.updated_at) >= start_datetime
+        ]
+        label_events, fetched = await label_event_service.get_label_events(gitlab_client, changed)
+        
+        scope_events: List[ScopeEvent] = []
+        for issue in issues:
+            if issue.created_at is None:
+                continue
+            events = label_events.get(issue.id)
+            if events is None:
+                timeline = [(self._to_utc(issue.created_at), issue)]
+            else:
+                timeline = [
+                    (at, issue_analyzer.analyze_issue(issue.model_copy(update={'labels': labels})))
+                    for at, labels in LabelEventService.build_label_timeline(issue, events)
+                ]
+            scope_events.extend(self._issue_scope_events(timeline, start_date, end_date, filters))
+        
+        return scope_events, fetched
+    
+    def _issue_scope_events(
+        self,
+        timeline: List[Tuple[datetime, IssueModel]],
+        start_date: date,
+        end_date: date,
+        filters: Dict[str, Any]
+    ) -> List[ScopeEvent]:
+        """1issueの時系列からスコープ変化イベントを生成"""
+        scope_events: List[ScopeEvent] = []
+        in_scope = False
+        previous_points = 0.0
+        for at, state in timeline:
+            included, warnings = apply_chart_filters([state], start_date, end_date, filters)
+            points = (included[0].point or 0.0) if included else 0.0
+            ordinal = at.astimezone(timezone.utc).date().toordinal()
+            
+            if included and not in_scope:
+                scope_events.append((ordinal, 'added', points, None))
+            elif not included and in_scope:
+                scope_events.append((ordinal, 'removed', previous_points, self._removal_reason(state, warnings)))
+            elif included and points != previous_points:
+                scope_events.append((ordinal, 'reestimated', points - previous_points, None))
+            
+            in_scope = bool(included)
+            previous_points = points
+        return scope_events
+    
+    @staticmethod
+    def _removal_reason(state: IssueModel, warnings: List[Dict[str, Any]]) -> str:
+        """スコープから外れた理由（警告理由、統一フィルタでの除外、追加フィルタ）"""
+        if warnings:
+            return warnings[0]['reason']
+        if state.kanban_status in EXCLUDED_KANBAN_STATUSES:
+            return EXCLUDED_STATUS_REASONS.get(state.kanban_status, 'excluded')
+        return 'filtered'
+    
+    @staticmethod
+    def _to_utc(value: datetime) -> datetime:
+        """timezone-naiveなdatetimeはUTCとして扱う"""
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+# グローバルインスタンス
+scope_change_service = ScopeChangeService()
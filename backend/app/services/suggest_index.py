@@ -0,0 +1,150 @@
+from typing import List, Dict, Any, Tuple, Iterable
+from bisect import bisect_left, insort
+import logging
+from app.models.issue import IssueModel
+from app.utils.text_search import normalize_text, TOKEN_PATTERN
+
+logger = logging.getLogger(__name__)
+
+# 候補を返す項目（titleはissue、それ以外は値）
+SUGGEST_FIELDS = ['title', 'assignee', 'milestone', 'label', 'service', 'quarter', 'kanban_status']
+
+# タイトルの開始位置ごとのキーの最大長（これより長い入力はissueの正規化済みタイトルで照合する）
+TITLE_KEY_LENGTH = 32
+
+class SortedKeys:
+    """正規化済みキーの昇順配列（前方一致検索用）
+    
+    (正規化済みキー, 値) を出現数付きで保持し、出現数が0になったら配列から削除する
+    """
+    
+    def __init__(self):
+        self._keys: List[Tuple[str, Any]] = []
+        self._counts: Dict[Tuple[str, Any], int] = {}
+    
+    def add(self, key: str, value: Any, sort: bool = True) -> None:
+        """追加（sort=Falseの場合は末尾に追加するため、追加後にsort()が必要）"""
+        entry = (key, value)
+        count = self._counts.get(entry, 0)
+        if not count:
+            if sort:
+                insort(self._keys, entry)
+            else:
+                self._keys.append(entry)
+        self._counts[entry] = count + 1
+    
+    def sort(self) -> None:
+        self._keys.sort()
+    
+    def remove(self, key: str, value: Any) -> None:
+        entry = (key, value)
+        count = self._counts.get(entry, 0)
+        if count > 1:
+            self._counts[entry] = count - 1
+            return
+        if not count:
+            return
+        del self._counts[entry]
+        position = bisect_left(self._keys, entry)
+        if position < len(self._keys) and self._keys[position] == entry:
+            del self._keys[position]
+    
+    def prefix(self, prefix: str) -> Iterable[Tuple[str, Any, int]]:
+        """キーがprefixで始まる (キー, 値, 出現数) をキーの昇順に返す（二分探索で開始位置を求める）"""
+        position = bisect_left(self._keys, (prefix,))
+        while position < len(self._keys):
+            key, value = self._keys[position]
+            if not key.startswith(prefix):
+                return
+            yield key, value, self._counts[(key, value)]
+            position += 1
+
+class SuggestIndex:
+    """入力補完（前方一致）用のインデックス
+    
+    assignee・milestone・label・service・quarter・kanban_statusは正規化済みの値、
+    titleは正規化済みタイトルの単語の開始位置（CJK文字は各文字）から最大TITLE_KEY_LENGTH文字を
+    (issue ID, 開始位置) と組にして昇順配列に保持し、候補を二分探索とその後のk件の走査で求める。
+    タイトル全体はissueごとに1つだけ保持し、キーより長い入力はそのタイトルで照合する
+    （CJKのタイトルでも保持量はタイトル長に比例する）
+    """
+    
+    def __init__(self):
+        self._fields: Dict[str, SortedKeys] = {field: SortedKeys() for field in SUGGEST_FIELDS}
+        # issue ID -> 正規化済みタイトル
+        self._titles: Dict[int, str] = {}
+    
+    def clear(self) -> None:
+        self.__init__()
+    
+    def add(self, issue: IssueModel, sort: bool = True) -> None:
+        """追加（sort=Falseの場合は追加後にsort()が必要）"""
+        self._titles[issue.id] = normalize_text(issue.title)
+        for field, key, value in self._entries(issue):
+            self._fields[field].add(key, value, sort)
+    
+    def sort(self) -> None:
+        for keys in self._fields.values():
+            keys.sort()
+    
+    def remove(self, issue: IssueModel) -> None:
+        for field, key, value in self._entries(issue):
+            self._fields[field].remove(key, value)
+        self._titles.pop(issue.id, None)
+    
+    def suggest(self, field: str, prefix: str, limit: int = 10) -> List[Tuple[Any, int]]:
+        """prefixで始まる候補（正規化済みの値の昇順）
+        
+        Returns:
+            List[Tuple[Any, int]]: (値 or issue ID, 出現数) のリスト（titleの場合はissue IDで、重複は除く）
+        """
+        prefix = normalize_text(prefix)
+        suggestions: List[Tuple[Any, int]] = []
+        seen = set()
+        if field == 'title':
+            matches = self._title_matches(prefix)
+        else:
+            matches = ((value, count) for _, value, count in self._fields[field].prefix(prefix))
+        for value, count in matches:
+            if value in seen:
+                continue
+            seen.add(value)
+            suggestions.append((value, count))
+            if len(suggestions) >= limit:
+                break
+        return suggestions
+    
+    def _title_matches(self, prefix: str) -> Iterable[Tuple[int, int]]:
+        """タイトルの開始位置のいずれかがprefixで始まるissue ID（開始位置以降の昇順、重複あり）"""
+        for _, (issue_id, start), count in self._fields['title'].prefix(prefix[:TITLE_KEY_LENGTH]):
+            if len(prefix) > TITLE_KEY_LENGTH and not self._titles[issue_id].startswith(prefix, start):
+                continue
+            yield issue_id, count
+    
+    @staticmethod
+    def _entries(issue: IssueModel) -> List[Tuple[str, str, Any]]:
+        """issueの (項目, 正規化済みキー, 値)（titleの値は (issue ID, 開始位置)）"""
+        entries = [
+            (field, normalize_text(value), value)
+            for field, value in (
+                ('assignee', issue.assignee),
+                ('milestone', issue.milestone),
+                ('service', issue.service),
+                ('quarter', issue.quarter),
+                ('kanban_status', issue.kanban_status)
+            )
+            if value
+        ]
+        entries.extend(('label', normalize_text(label), label) for label in set(issue.labels))
+        
+        title = normalize_text(issue.title)
+        starts = set()
+        for match in TOKEN_PATTERN.finditer(title):
+            if match.lastgroup == 'cjk':
+                starts.update(range(match.start(), match.end()))
+            else:
+                starts.add(match.start())
+        entries.extend(
+            ('title', title[start:start + TITLE_KEY_LENGTH], (issue.id, start)) for start in sorted(starts)
+        )
+        return entries
@@ -0,0 +1,304 @@
+from typing import List, Dict, Any, Optional, Set, Tuple
+from collections import Counter
+import math
+import logging
+from app.models.issue import IssueModel
+from app.utils.text_search import (
+    OffsetMap,
+    normalize_with_offsets,
+    split_search_terms,
+    cjk_bigrams,
+    is_cjk,
+    tokenize,
+    edit_distance
+)
+
+logger = logging.getLogger(__name__)
+
+# インデックスするn-gramの長さ（1文字・2文字の検索語は1-gram、3文字以上はtrigramで候補を絞る）
+GRAM_SIZES = (1, 3)
+
+# 検索順位（BM25）のパラメータと、タイトル中の出現の重み
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2.0
+
+# あいまい検索: 編集距離で照合するトークンの最小文字数、検索語のトークンのうち一致が必要な割合、
+# 編集距離で一致したトークンのスコアの重み
+FUZZY_MIN_TOKEN_LENGTH = 3
+FUZZY_MIN_TOKEN_RATIO = 0.75
+FUZZY_SCORE_WEIGHT = 0.5
+
+# ハイライト位置の項目名（タイトル・説明文の順）
+TEXT_FIELDS = ('title', 'description')
+
+class TextIndex:
+    """issueのタイトル・説明文のn-gram転置インデックス
+    
+    正規化済みのタイトル・説明文をissueの追加・更新時に一度だけ作成して保持し、
+    n-gram → issue IDの集合 を項目ごと（タイトルと説明文をまたぐn-gramは作らない）に登録する。
+    検索語ごとにn-gramの積集合で候補を絞り、候補のみ正規化済みテキストで部分一致を確認する。
+    
+    cjk_bigrams指定時はCJK文字の2-gramも登録し、日本語の2文字の検索語（「設計」など）を
+    確認なしで解決する。
+    
+    検索順位とハイライト用に、トークン（英数字の単語・CJK文字の2-gram）の出現位置と、
+    トークン一覧のtrigramインデックス（あいまい検索で編集距離を確認する候補の絞り込み用）も保持する
+    """
+    
+    def __init__(self, cjk_bigrams: bool = True):
+        self.cjk_bigrams = cjk_bigrams
+        self._postings: Dict[str, Set[int]] = {}
+        # issue ID → (正規化済みタイトル, 正規化済み説明文)
+        self._texts: Dict[int, Tuple[str, str]] = {}
+        # issue ID → 正規化済みテキストの位置から元のテキストの位置への変換（項目ごと）
+        self._offsets: Dict[int, Tuple[OffsetMap, OffsetMap]] = {}
+        # issue ID → トークン → 出現位置 (項目, 開始位置, 終了位置) のリスト
+        self._positions: Dict[int, Dict[str, List[Tuple[int, int, int]]]] = {}
+        # issue ID → 文書長（タイトル中のトークンは重み付きで数える）
+        self._lengths: Dict[int, float] = {}
+        self._total_length = 0.0
+        # トークン → 出現するissue IDの集合
+        self._token_postings: Dict[str, Set[int]] = {}
+        # trigram → それを含むトークンの集合
+        self._vocabulary_grams: Dict[str, Set[str]] = {}
+    
+    def clear(self) -> None:
+        self.__init__(self.cjk_bigrams)
+    
+    def add(self, issue: IssueModel) -> None:
+        title, title_offsets = normalize_with_offsets(issue.title)
+        description, description_offsets = normalize_with_offsets(issue.description)
+        texts = (title, description)
+        self._texts[issue.id] = texts
+        self._offsets[issue.id] = (title_offsets, description_offsets)
+        for gram in self._grams(texts):
+            self._postings.setdefault(gram, set()).add(issue.id)
+        
+        positions: Dict[str, List[Tuple[int, int, int]]] = {}
+        length = 0.0
+        for field, text in enumerate(texts):
+            for token, begin, end in tokenize(text):
+                positions.setdefault(token, []).append((field, begin, end))
+                length += TITLE_WEIGHT if field == 0 else 1.0
+        self._positions[issue.id] = positions
+        self._lengths[issue.id] = length
+        self._total_length += length
+        for token in positions:
+            posting = self._token_postings.setdefault(token, set())
+            if not posting:
+                self._add_vocabulary(token)
+            posting.add(issue.id)
+    
+    def remove(self, issue_id: int) -> None:
+        texts = self._texts.pop(issue_id, None)
+        if texts is None:
+            return
+        for gram in self._grams(texts):
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(issue_id)
+            if not posting:
+                del self._postings[gram]
+        
+        self._offsets.pop(issue_id, None)
+        self._total_length -= self._lengths.pop(issue_id, 0.0)
+        for token in self._positions.pop(issue_id, {}):
+            posting = self._token_postings.get(token)
+            if posting is None:
+                continue
+            posting.discard(issue_id)
+            if not posting:
+                del self._token_postings[token]
+                self._remove_vocabulary(token)
+    
+    def search(self, search: Optional[str], fuzzy: bool = False) -> Optional[Set[int]]:
+        """すべての検索語（空白区切り）をタイトルまたは説明文に含むissue ID（検索語がない場合はNone）
+        
+        fuzzy指定時は、部分一致しない検索語も、検索語のトークンの一定割合（FUZZY_MIN_TOKEN_RATIO）が
+        同じトークンまたは編集距離の近いトークンとして含まれていれば該当とする
+        """
+        terms = split_search_terms(search)
+        if not terms:
+            return None
+        
+        # 候補の少ない検索語から順に絞り込む
+        candidates = sorted(((self._candidates(term), term) for term in terms), key=lambda item: len(item[0]))
+        selected: Optional[Set[int]] = None
+        for issue_ids, term in candidates:
+            issue_ids = issue_ids if selected is None else issue_ids & selected
+            if not self._is_gram(term):
+                issue_ids = {issue_id for issue_id in issue_ids if self.contains(issue_id, term)}
+            if fuzzy:
+                fuzzy_ids = self._fuzzy_matches(term)
+                issue_ids |= fuzzy_ids if selected is None else fuzzy_ids & selected
+            selected = issue_ids
+            if not selected:
+                break
+        return selected
+    
+    def contains(self, issue_id: int, term: str) -> bool:
+        """正規化済みの検索語がissueのタイトルまたは説明文に含まれるか"""
+        title, description = self._texts.get(issue_id, ('', ''))
+        return term in title or term in description
+    
+    def score(self, issue_ids: Set[int], search: Optional[str], fuzzy: bool = False) -> Dict[int, float]:
+        """BM25による検索語との関連度（インデックスのトークン出現回数から算出）
+        
+        検索語のトークンごとに、同じトークン・それを含むトークン（あいまい検索時は編集距離の
+        近いトークンも、FUZZY_SCORE_WEIGHTの重みで）のうち最も高いスコアを合計する
+        """
+        document_count = len(self._texts)
+        if not document_count:
+            return {}
+        average_length = self._total_length / document_count or 1.0
+        
+        scores: Dict[int, float] = {issue_id: 0.0 for issue_id in issue_ids}
+        for expansions in self._expand_terms(search, fuzzy):
+            best: Dict[int, float] = {}
+            for token, weight in expansions.items():
+                posting = self._token_postings.get(token, set())
+                idf = math.log(1 + (document_count - len(posting) + 0.5) / (len(posting) + 0.5))
+                for issue_id in posting & issue_ids:
+                    frequency = sum(
+                        TITLE_WEIGHT if field == 0 else 1.0
+                        for field, _, _ in self._positions[issue_id][token]
+                    )
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[issue_id] / average_length)
+                    value = weight * idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                    if value > best.get(issue_id, 0.0):
+                        best[issue_id] = value
+            for issue_id, value in best.items():
+                scores[issue_id] += value
+        return scores
+    
+    def highlights(self, issue_id: int, search: Optional[str], fuzzy: bool = False) -> List[Dict[str, Any]]:
+        """検索語に一致したトークンの、元のタイトル・説明文での位置（重なる範囲は結合）
+        
+        Returns:
+            List[Dict[str, Any]]: {'field': 'title' or 'description', 'start': 開始位置, 'end': 終了位置} のリスト
+        """
+        positions = self._positions.get(issue_id)
+        if not positions:
+            return []
+        
+        ranges: List[Tuple[int, int, int]] = []
+        for expansions in self._expand_terms(search, fuzzy):
+            for token in expansions:
+                ranges.extend(positions.get(token, ()))
+        
+        merged: List[List[int]] = []
+        for field, begin, end in sorted(ranges):
+            if merged and merged[-1][0] == field and begin <= merged[-1][2]:
+                merged[-1][2] = max(merged[-1][2], end)
+            else:
+                merged.append([field, begin, end])
+        
+        offsets = self._offsets[issue_id]
+        highlights = []
+        for field, begin, end in merged:
+            offset_map = offsets[field]
+            if offset_map is not None:
+                begin, end = offset_map[0][begin], offset_map[1][end - 1]
+            highlights.append({'field': TEXT_FIELDS[field], 'start': begin, 'end': end})
+        return highlights
+    
+    def _candidates(self, term: str) -> Set[int]:
+        """検索語のn-gramをすべて含むissue ID（候補）"""
+        if self._is_gram(term):
+            return set(self._postings.get(term, ()))
+        
+        size = max(size for size in GRAM_SIZES if size <= len(term))
+        postings = sorted(
+            (self._postings.get(gram, set()) for gram in {term[i:i + size] for i in range(len(term) - size + 1)}),
+            key=len
+        )
+        selected = set(postings[0])
+        for posting in postings[1:]:
+            if not selected:
+                break
+            selected &= posting
+        return selected
+    
+    def _fuzzy_matches(self, term: str) -> Set[int]:
+        """検索語のトークンのうちFUZZY_MIN_TOKEN_RATIO以上を、同じトークンまたは編集距離の近いトークンとして含むissue ID"""
+        tokens = {token for token, _, _ in tokenize(term)}
+        if not tokens:
+            return set()
+        
+        counts: Counter = Counter()
+        for token in tokens:
+            issue_ids: Set[int] = set()
+            for similar in self._similar_tokens(token):
+                issue_ids |= self._token_postings[similar]
+            counts.update(issue_ids)
+        required = math.ceil(len(tokens) * FUZZY_MIN_TOKEN_RATIO)
+        return {issue_id for issue_id, count in counts.items() if count >= required}
+    
+    def _expand_terms(self, search: Optional[str], fuzzy: bool) -> List[Dict[str, float]]:
+        """検索語のトークンごとの、一致するインデックスのトークン → スコアの重み"""
+        expanded = []
+        for term in split_search_terms(search):
+            for token in {token for token, _, _ in tokenize(term)}:
+                expansions = {similar: FUZZY_SCORE_WEIGHT for similar in self._similar_tokens(token)} if fuzzy else {}
+                expansions.update(dict.fromkeys(self._containing_tokens(token), 1.0))
+                expanded.append(expansions)
+        return expanded
+    
+    def _containing_tokens(self, token: str) -> Set[str]:
+        """tokenと同じ、またはtokenを含むトークン（3文字以上はトークン一覧のtrigramで候補を絞る）"""
+        tokens = {token} if token in self._token_postings else set()
+        if len(token) < 3:
+            return tokens
+        
+        candidates: Optional[Set[str]] = None
+        for gram in {token[i:i + 3] for i in range(len(token) - 2)}:
+            vocabulary = self._vocabulary_grams.get(gram, set())
+            candidates = set(vocabulary) if candidates is None else candidates & vocabulary
+            if not candidates:
+                return tokens
+        return tokens | {candidate for candidate in candidates if token in candidate}
+    
+    def _similar_tokens(self, token: str) -> Set[str]:
+        """tokenと同じ、または編集距離の近いトークン（トークン一覧のtrigramを共有するものから探す）"""
+        tokens = {token} if token in self._token_postings else set()
+        if len(token) < FUZZY_MIN_TOKEN_LENGTH:
+            return tokens
+        
+        limit = 1 if len(token) <= 5 else 2
+        candidates: Set[str] = set()
+        for gram in {token[i:i + 3] for i in range(len(token) - 2)}:
+            candidates |= self._vocabulary_grams.get(gram, set())
+        return tokens | {
+            candidate for candidate in candidates
+            if edit_distance(token, candidate, limit) <= limit
+        }
+    
+    def _add_vocabulary(self, token: str) -> None:
+        for gram in {token[i:i + 3] for i in range(len(token) - 2)}:
+            self._vocabulary_grams.setdefault(gram, set()).add(token)
+    
+    def _remove_vocabulary(self, token: str) -> None:
+        for gram in {token[i:i + 3] for i in range(len(token) - 2)}:
+            tokens = self._vocabulary_grams.get(gram)
+            if tokens is None:
+                continue
+            tokens.discard(token)
+            if not tokens:
+                del self._vocabulary_grams[gram]
+    
+    def _is_gram(self, term: str) -> bool:
+        """検索語そのものがインデックスのn-gramか（候補の確認が不要か）"""
+        if len(term) in GRAM_SIZES:
+            return True
+        return self.cjk_bigrams and len(term) == 2 and is_cjk(term[0]) and is_cjk(term[1])
+    
+    def _grams(self, texts: Tuple[str, str]) -> Set[str]:
+        grams = set()
+        for text in texts:
+            for size in GRAM_SIZES:
+                grams.update(map(''.join, zip(*(text[offset:] for offset in range(size)))))
+            if self.cjk_bigrams:
+                grams.update(cjk_bigrams(text))
+        return grams
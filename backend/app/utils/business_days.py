@@ -88,4 +88,45 @@ class BusinessDayCalculator:
             return 1.0
         
         elapsed_business_days = self.count_business_days(start_date, current_date)
-        return min(1.0, elapsed_business_days / total_business_days)
\ No newline at end of file
+        return min(1.0, elapsed_business_days / total_business_days)
+    
+    def calculate_business_day_progress_series(
+        self,
+        start_date: date,
+        end_date: date,
+        dates: List[date]
+    ) -> List[float]:
+        """営業日ベースでの進捗率を日付リスト分まとめて計算
+        
+        calculate_business_day_progressと同じ結果を、期間内の営業日数の
+        累積を一度だけ求めることで日付数に比例した計算量で返す
+        
+        Args:
+            start_date: 期間開始日
+            end_date: 期間終了日
+            dates: 進捗率を求める日付のリスト
+            
+        Returns:
+            各日付の進捗率（0.0〜1.0）
+        """
+        total_days = (end_date - start_date).days + 1
+        cumulative = []
+        count = 0
+        for offset in range(max(total_days, 0)):
+            if self.is_business_day(start_date + timedelta(days=offset)):
+                count += 1
+            cumulative.append(count)
+        total_business_days = count
+        
+        progress = []
+        for current_date in dates:
+            if current_date <= start_date:
+                progress.append(0.0)
+            elif current_date >= end_date:
+                progress.append(1.0)
+            elif total_business_days == 0:
+                progress.append(1.0)
+            else:
+                elapsed = cumulative[(current_date - start_date).days]
+                progress.append(min(1.0, elapsed / total_business_days))
+        return progress
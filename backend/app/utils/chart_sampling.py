@@ -0,0 +1,123 @@
+"""チャート系列の粒度変換・ダウンサンプリングユーティリティ"""
+
+from datetime import date, timedelta
+from typing import List, Optional, Sequence
+
+# 指定可能な粒度
+GRANULARITIES = ['day', 'week', 'month', 'auto']
+
+# auto指定時に日次/週次を使う最大日数
+AUTO_DAILY_MAX_DAYS = 92
+AUTO_WEEKLY_MAX_DAYS = 731
+
+
+def resolve_granularity(start_date: date, end_date: date, granularity: str) -> str:
+    """粒度を決定（autoの場合は期間の長さから選択）
+    
+    Args:
+        start_date: 期間開始日
+        end_date: 期間終了日
+        granularity: 'day' / 'week' / 'month' / 'auto'
+    
+    Returns:
+        'day' / 'week' / 'month'
+    """
+    if granularity != 'auto':
+        return granularity
+    
+    days = (end_date - start_date).days + 1
+    if days <= AUTO_DAILY_MAX_DAYS:
+        return 'day'
+    if days <= AUTO_WEEKLY_MAX_DAYS:
+        return 'week'
+    return 'month'
+
+
+def select_granularity_indices(date_range: List[date], granularity: str) -> List[int]:
+    """粒度に応じて出力する日付インデックスを選択
+    
+    累積値の系列なので、各区間の末日（週: 日曜日、月: 月末日）の値が区間の値になる。
+    期間の初日と最終日は常に含める。
+    
+    Args:
+        date_range: 日次の日付リスト
+        granularity: 'day' / 'week' / 'month'
+    
+    Returns:
+        昇順の日付インデックスリスト
+    """
+    if granularity == 'day' or len(date_range) <= 2:
+        return list(range(len(date_range)))
+    
+    last = len(date_range) - 1
+    indices = [0]
+    for index in range(1, last):
+        current = date_range[index]
+        if granularity == 'week':
+            is_boundary = current.weekday() == 6
+        else:
+            is_boundary = (current + timedelta(days=1)).day == 1
+        if is_boundary:
+            indices.append(index)
+    indices.append(last)
+    return indices
+
+
+def downsample_indices(
+    indices: List[int],
+    series_list: Sequence[Sequence[float]],
+    max_points: Optional[int]
+) -> List[int]:
+    """形状を保ったままインデックスを間引く（Largest-Triangle-Three-Buckets）
+    
+    各バケットから、前回選択点と次バケット平均点とで作る三角形の面積が
+    最大になる点を選ぶ。複数系列を渡した場合は面積の合計で評価するため、
+    いずれかの系列の変化点が優先的に残る。
+    
+    Args:
+        indices: 候補の日付インデックス（昇順）
+        series_list: 日付インデックスで参照する系列のリスト
+        max_points: 最大点数（None または候補数以下の場合は間引かない）
+    
+    Returns:
+        間引き後の日付インデックスリスト（先頭・末尾は必ず含む）
+    """
+    if not max_points or len(indices) <= max_points or max_points < 3:
+        return indices
+    
+    selected = [indices[0]]
+    bucket_size = (len(indices) - 2) / (max_points - 2)
+    previous = indices[0]
+    
+    for bucket in range(max_points - 2):
+        bucket_start = int(bucket * bucket_size) + 1
+        bucket_end = int((bucket + 1) * bucket_size) + 1
+        
+        # 次バケットの平均点
+        next_start = bucket_end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, len(indices))
+        next_bucket = indices[next_start:next_end] or [indices[-1]]
+        average_x = sum(next_bucket) / len(next_bucket)
+        average_ys = [
+            sum(series[i] for i in next_bucket) / len(next_bucket)
+            for series in series_list
+        ]
+        
+        best_index = indices[bucket_start]
+        best_area = -1.0
+        for candidate in indices[bucket_start:bucket_end]:
+            area = 0.0
+            for series, average_y in zip(series_list, average_ys):
+                area += abs(
+                    (previous - average_x) * (series[candidate] - series[previous])
+                    - (previous - candidate) * (average_y - series[previous])
+                )
+            if area > best_area:
+                best_area = area
+                best_index = candidate
+        
+        selected.append(best_index)
+        previous = best_index
+    
+    selected.append(indices[-1])
+    return selected
@@ -0,0 +1,210 @@
+from typing import List, Any, Optional, Callable, Tuple, Iterable
+from datetime import datetime, timezone, date, time, timedelta
+from functools import lru_cache
+from operator import attrgetter
+from app.models.issue import IssueModel
+from app.utils.text_search import split_search_terms, contains_all_terms
+import logging
+
+logger = logging.getLogger(__name__)
+
+IssuePredicate = Callable[[IssueModel], bool]
+
+
+class FilterPlan:
+    """
+    コンパイル済みフィルタ
+    
+    各条件を値を閉じ込めた判定関数にしておき、issueごとに先頭から順に評価して
+    不一致の時点で打ち切る（条件ごとのリスト再作成を行わない）。
+    適用は1回の走査で、出力リストも1つだけ作成する
+    """
+    
+    def __init__(self, clauses: List[Tuple[str, IssuePredicate]]):
+        """
+        Args:
+            clauses: (条件名, 判定関数) のリスト（評価順）
+        """
+        self.names = [name for name, _ in clauses]
+        self.matches: IssuePredicate = _all_of([predicate for _, predicate in clauses])
+    
+    @property
+    def is_empty(self) -> bool:
+        return not self.names
+    
+    def apply(self, issues: Iterable[IssueModel]) -> List[IssueModel]:
+        """フィルタ適用（条件がない場合はコピーを返す）"""
+        if self.is_empty:
+            return list(issues)
+        matches = self.matches
+        return [issue for issue in issues if matches(issue)]
+
+
+def _all_of(predicates: List[IssuePredicate]) -> IssuePredicate:
+    """判定関数を順に評価し、すべて満たすか判定する関数（不一致の時点で打ち切る）"""
+    if not predicates:
+        return lambda issue: True
+    if len(predicates) == 1:
+        return predicates[0]
+    if len(predicates) == 2:
+        first, second = predicates
+        return lambda issue: first(issue) and second(issue)
+    
+    def matches(issue: IssueModel) -> bool:
+        for predicate in predicates:
+            if not predicate(issue):
+                return False
+        return True
+    return matches
+
+
+@lru_cache(maxsize=128)
+def compile_filter_plan(
+    min_point: Optional[float] = None,
+    max_point: Optional[float] = None,
+    search: Optional[str] = None,
+    kanban_status: Optional[str] = None,
+    is_epic: Optional[str] = None,
+    state: Optional[str] = None,
+    created_after: Optional[date] = None,
+    created_before: Optional[date] = None,
+    completed_after: Optional[date] = None,
+    completed_before: Optional[date] = None,
+    assignee: Optional[str] = None,
+    service: Optional[str] = None,
+    milestone: Optional[str] = None,
+    quarter: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> FilterPlan:
+    """
+    フィルタ条件をFilterPlanにコンパイル
+    
+    条件は評価コストの低い順、同程度なら絞り込みやすい順に並べる:
+    1. 値の一致（マイルストーン・アサイニー・サービス・四半期・かんばんステータス・Epic・状態）
+    2. Point範囲
+    3. 作成日・完了日の範囲（日付に変換せず、境界値をUTCのdatetimeにして比較）
+    4. テキスト検索（空白区切りの検索語すべてを含む）
+    
+    各条件は値を閉じ込めた判定関数にする。同じ条件のコンパイル結果は再利用する
+    
+    Args:
+        apply_advanced_filtersと同じ条件に加えて
+        quarter: 四半期
+        created_from: 作成日時以降（日時で比較、timezone-naiveはUTCとして扱う）
+        created_to: 作成日時以前（日時で比較、timezone-naiveはUTCとして扱う）
+    
+    Returns:
+        FilterPlan
+    """
+    clauses: List[Tuple[str, IssuePredicate]] = []
+    
+    # 値の一致
+    for name, value in (
+        ('milestone', milestone),
+        ('assignee', assignee),
+        ('service', service),
+        ('quarter', quarter),
+        ('kanban_status', kanban_status)
+    ):
+        if value:
+            clauses.append((name, _equals_clause(name, value)))
+    
+    if is_epic == 'epic':
+        # is_epic が True の場合のみ
+        clauses.append(('is_epic', lambda issue: issue.is_epic is True))
+    elif is_epic == 'normal':
+        # is_epic が False または None の場合
+        clauses.append(('is_epic', lambda issue: issue.is_epic is not True))
+    
+    if state and state != 'all':
+        clauses.append(('state', _equals_clause('state', state)))
+    
+    # Point範囲
+    if min_point is not None or max_point is not None:
+        low_point = min_point if min_point is not None else float('-inf')
+        high_point = max_point if max_point is not None else float('inf')
+        clauses.append(('point', lambda issue: issue.point is not None and low_point <= issue.point <= high_point))
+    
+    # 作成日（UTCの日付単位）
+    if created_after or created_before:
+        created_in_days = _datetime_range_clause(
+            'created_at', _utc_day_start(created_after), _utc_day_end(created_before)
+        )
+        clauses.append(('created_at', lambda issue: issue.created_at is not None and created_in_days(issue)))
+    
+    # 作成日時（日時単位）
+    if created_from or created_to:
+        clauses.append(('created_at', _datetime_range_clause(
+            'created_at',
+            _as_utc(created_from) if created_from else None,
+            _as_utc(created_to) + timedelta(microseconds=1) if created_to else None
+        )))
+    
+    # 完了日: completed_afterが指定されていれば未完了を除外、
+    # completed_beforeのみなら含める（未完了は完了日前と見なす）
+    if completed_after or completed_before:
+        incomplete = not completed_after
+        completed_in_days = _datetime_range_clause(
+            'completed_at', _utc_day_start(completed_after), _utc_day_end(completed_before)
+        )
+        clauses.append((
+            'completed_at',
+            lambda issue: completed_in_days(issue) if issue.completed_at else incomplete
+        ))
+    
+    # テキスト検索（空白区切りの検索語をすべてタイトルまたは説明文に含む）
+    terms = split_search_terms(search)
+    if terms:
+        clauses.append(('search', lambda issue: contains_all_terms(terms, issue.title, issue.description)))
+    
+    return FilterPlan(clauses)
+
+
+def _equals_clause(field: str, value: Any) -> IssuePredicate:
+    """項目の値の一致判定"""
+    getter = attrgetter(field)
+    return lambda issue: getter(issue) == value
+
+
+def _datetime_range_clause(
+    field: str,
+    low: Optional[datetime],
+    high: Optional[datetime]
+) -> IssuePredicate:
+    """
+    datetime項目の範囲判定（low以上、high未満）
+    
+    日付に変換せずdatetimeのまま比較する。timezone-naiveな値はUTCとして扱うため、
+    naive用にtzinfoを外した境界値も用意する
+    """
+    getter = attrgetter(field)
+    low_naive = low.replace(tzinfo=None) if low is not None else None
+    high_naive = high.replace(tzinfo=None) if high is not None else None
+    
+    def in_range(issue: IssueModel) -> bool:
+        value = getter(issue)
+        if value.tzinfo:
+            return (low is None or low <= value) and (high is None or value < high)
+        return (low_naive is None or low_naive <= value) and (high_naive is None or value < high_naive)
+    return in_range
+
+
+def _utc_day_start(value: Optional[date]) -> Optional[datetime]:
+    """日付の開始時刻（UTC）"""
+    if value is None:
+        return None
+    return datetime.combine(value, time.min, tzinfo=timezone.utc)
+
+
+def _utc_day_end(value: Optional[date]) -> Optional[datetime]:
+    """日付の翌日の開始時刻（UTC、date.maxの場合は上限なし）"""
+    if value is None or value == date.max:
+        return None
+    return datetime.combine(value + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """timezone-naiveなdatetimeはUTCとして扱う"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
@@ -0,0 +1,97 @@
+"""
+Issue一覧のカーソル（キーセットページネーション）
+
+ページ末尾のissueのソート位置（ソートキーの値・作成日時・issue ID）を、検索条件のフィンガープリントと
+発行時のストアのデータバージョンとともにbase64で符号化した不透明なトークンにする。
+次ページはソート位置がカーソルより後のissueだけを対象にするため、ページ取得の間にissueが
+追加・更新・削除されても、取得済みのページとの重複・欠落が起きない
+"""
+from typing import Any, Optional, Tuple
+from datetime import datetime
+import base64
+import binascii
+import hashlib
+import json
+from pydantic import BaseModel, ValidationError
+
+# フィンガープリントに含めない検索条件（ページの指定）
+CURSOR_EXCLUDED_FIELDS = {'cursor', 'page', 'per_page'}
+
+
+class IssueCursor(BaseModel):
+    """デコード済みのカーソル"""
+    sort_by: str
+    sort_order: str
+    position: Tuple[Any, float, int]  # shared_filters.sort_positionの値
+    version: int  # 発行時のストアのデータバージョン
+    fingerprint: str  # 発行時の検索条件のフィンガープリント
+
+
+def query_fingerprint(query: BaseModel) -> str:
+    """検索条件のフィンガープリント（ページの指定は含めない）"""
+    payload = query.model_dump_json(exclude=CURSOR_EXCLUDED_FIELDS)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def encode_cursor(query: BaseModel, position: Tuple[Any, float, int], version: int) -> str:
+    """カーソルのトークン生成
+    
+    Args:
+        query: 検索条件（IssueQuery）
+        position: ページ末尾のissueのソート位置
+        version: ストアのデータバージョン
+    """
+    key, created, issue_id = position
+    payload = {
+        's': query.sort_by,
+        'o': query.sort_order,
+        'p': [_encode_key(key), created, issue_id],
+        'v': version,
+        'f': query_fingerprint(query)
+    }
+    token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+    return token.decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str, query: BaseModel) -> IssueCursor:
+    """カーソルのトークンをデコードし、検索条件と一致するか検証
+    
+    Raises:
+        ValueError: トークンが不正、または発行時とソート条件・検索条件が異なる場合
+    """
+    if query.sort_by is None or query.sort_by == 'relevance':
+        raise ValueError("cursorはsort_by（relevance以外）と同時に指定してください")
+    
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        key, created, issue_id = payload['p']
+        cursor = IssueCursor(
+            sort_by=payload['s'],
+            sort_order=payload['o'],
+            position=(_decode_key(key), created, issue_id),
+            version=payload['v'],
+            fingerprint=payload['f']
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError, ValidationError):
+        raise ValueError("cursorが不正です")
+    
+    if (
+        cursor.sort_by != query.sort_by
+        or cursor.sort_order != query.sort_order
+        or cursor.fingerprint != query_fingerprint(query)
+    ):
+        raise ValueError("cursorの発行時とソート条件・検索条件が異なります")
+    return cursor
+
+
+def _encode_key(key: Any) -> Any:
+    """ソートキーの値をJSONの値に変換（datetimeはISO 8601形式）"""
+    if isinstance(key, datetime):
+        return {'datetime': key.isoformat()}
+    return key
+
+
+def _decode_key(value: Any) -> Any:
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value['datetime'])
+    return value
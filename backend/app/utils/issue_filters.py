@@ -13,6 +13,13 @@ EXCLUDED_KANBAN_STATUSES = [
     "不要"
 ]
 
+# 除外対象のKanban Statusの警告理由（apply_scope_filtersの警告情報）
+EXCLUDED_STATUS_REASONS = {
+    'テンプレート': 'template',
+    'ゴール/アナウンス': 'goal',
+    '不要': 'unnecessary'
+}
+
 def apply_exclusion_filter(issues: List[IssueModel]) -> List[IssueModel]:
     """Apply unified exclusion rules to filter out template and non-relevant issues"""
     return [
@@ -92,7 +99,8 @@ def apply_unified_filters(issues: List[IssueModel], start_date=None) -> List[Iss
 def apply_scope_filters(
     issues: List[IssueModel], 
     start_date: date, 
-    end_date: date
+    end_date: date,
+    index=None
 ) -> Tuple[List[IssueModel], List[Dict[str, Any]]]:
     """
     統合スコープフィルタ（バックエンド版）
@@ -104,6 +112,10 @@ def apply_scope_filters(
     4. スコープ判定（期間前後完了除外）
     5. Due date未設定の完了Issue検出（警告用）
     
+    Args:
+        index: issuesのストアの転置インデックス（IssueIndex）。指定時はスコープ判定を
+            日付インデックスの二分探索で求めた除外対象で行う
+    
     Returns:
         Tuple[List[IssueModel], List[Dict[str, Any]]]: (フィルタ済みIssue, 警告情報リスト)
     """
@@ -128,14 +140,9 @@ def apply_scope_filters(
     exclusion_filtered = []
     for issue in quarter_filtered:
         if issue.kanban_status in EXCLUDED_KANBAN_STATUSES:
-            reason_map = {
-                'テンプレート': 'template',
-                'ゴール/アナウンス': 'goal',
-                '不要': 'unnecessary'
-            }
             warnings.append({
                 'issue': issue,
-                'reason': reason_map.get(issue.kanban_status, 'excluded')
+                'reason': EXCLUDED_STATUS_REASONS.get(issue.kanban_status, 'excluded')
             })
         else:
             exclusion_filtered.append(issue)
@@ -144,8 +151,20 @@ def apply_scope_filters(
     corrected_issues = [apply_date_correction(issue, start_date) for issue in exclusion_filtered]
     
     # 4. スコープ判定（期間前後完了除外、created_at > end_date除外）
+    violations = index.scope_violations(start_date, end_date) if index is not None else None
     scope_filtered = []
     for issue in corrected_issues:
+        if violations is not None:
+            reason = violations.get(issue.id)
+            if reason:
+                warnings.append({
+                    'issue': issue,
+                    'reason': reason
+                })
+            else:
+                scope_filtered.append(issue)
+            continue
+        
         # created_at > end_dateの場合は警告除外
         if issue.created_at:
             # datetimeとdateの比較のために変換
@@ -173,7 +192,7 @@ def apply_scope_filters(
                 start_datetime = datetime.combine(start_date, datetime.min.time()).replace(tzinfo=timezone.utc)
             else:
                 start_datetime = start_date
-                
+            
             if isinstance(end_date, date) and not isinstance(end_date, datetime):
                 end_datetime = datetime.combine(end_date, datetime.max.time()).replace(tzinfo=timezone.utc)
             else:
@@ -212,4 +231,36 @@ def apply_scope_filters(
         else:
             final_filtered.append(issue)
     
-    return final_filtered, warnings
\ No newline at end of file
+    return final_filtered, warnings
+
+
+def apply_chart_filters(
+    issues: List[IssueModel],
+    start_date: date,
+    end_date: date,
+    filters: Dict[str, Any],
+    index=None
+) -> Tuple[List[IssueModel], List[Dict[str, Any]]]:
+    """
+    チャート用フィルタリングパイプライン（Issueクエリエンジンで実行）
+    
+    処理順序:
+    1. 統一フィルタ（テンプレート等は警告なしで除外）
+    2. スコープフィルタ
+    3. 追加フィルタ（apply_advanced_filtersの引数形式）
+    
+    Args:
+        index: issuesのストアの転置インデックス（スコープ判定のみに使用し、警告情報は全issue分）
+    
+    Returns:
+        Tuple[List[IssueModel], List[Dict[str, Any]]]: (フィルタ済みIssue, 警告情報リスト)
+    """
+    from app.utils.issue_query import IssueQuery, execute_issue_query
+    result = execute_issue_query(issues, IssueQuery.from_filters(
+        filters,
+        chart_start_date=start_date,
+        chart_end_date=end_date,
+        warn_excluded_statuses=False,
+        warn_unmatched=True
+    ), index)
+    return result.matched, result.warnings
@@ -0,0 +1,295 @@
+"""
+Issueクエリエンジン
+
+Issues API・高度検索API・Chart APIで共通のIssue絞り込みを、宣言的な検索条件（IssueQuery）
+から実行する。処理順序:
+1. 値の一致・日付範囲・テキスト検索条件の解決（転置インデックス指定時のみ、インデックスの積集合で対象issueを絞り込む）
+2. スコープ（期間指定時はapply_scope_filters、未指定時はapply_unified_filters）
+   転置インデックス指定時、スコープ判定は日付インデックスの二分探索で行う
+3. 追加フィルタ（FilterPlanにコンパイルし1回の走査で適用）
+4. ソート（sort_by='relevance' の場合は転置インデックスのBM25スコア順）
+   ページネーション時は表示ページまでの上位のみを求める（転置インデックスに事前に並べた順序がある
+   ソートキーはその順序から該当issueを拾い、それ以外はヒープで部分ソート）
+5. ページネーション（ページ番号、またはカーソル指定時はカーソルのソート位置より後の1ページ分）
+"""
+from typing import List, Optional, Dict, Any, Callable, Iterable, Tuple
+from datetime import date, datetime
+from pydantic import BaseModel
+import heapq
+import logging
+from app.models.issue import IssueModel
+from app.utils.issue_cursor import IssueCursor, decode_cursor, encode_cursor
+from app.utils.filter_plan import FilterPlan, compile_filter_plan
+from app.utils.issue_filters import apply_exclusion_filter, apply_scope_filters, apply_unified_filters
+from app.utils.shared_filters import sort_issues, sort_position, top_issues, paginate_issues
+
+logger = logging.getLogger(__name__)
+
+# FilterPlanにコンパイルする条件（compile_filter_planの引数）
+FILTER_FIELDS = [
+    'min_point', 'max_point', 'search', 'kanban_status', 'is_epic', 'state',
+    'created_after', 'created_before', 'completed_after', 'completed_before',
+    'assignee', 'service', 'milestone', 'quarter', 'created_from', 'created_to'
+]
+
+
+class IssueQuery(BaseModel):
+    """宣言的なIssue検索条件"""
+    # 追加フィルタ（apply_advanced_filtersと同じ意味）
+    min_point: Optional[float] = None
+    max_point: Optional[float] = None
+    search: Optional[str] = None
+    kanban_status: Optional[str] = None
+    is_epic: Optional[str] = None
+    state: Optional[str] = None
+    created_after: Optional[date] = None
+    created_before: Optional[date] = None
+    completed_after: Optional[date] = None
+    completed_before: Optional[date] = None
+    assignee: Optional[str] = None
+    service: Optional[str] = None
+    milestone: Optional[str] = None
+    quarter: Optional[str] = None
+    created_from: Optional[datetime] = None  # 作成日時以降（日時で比較）
+    created_to: Optional[datetime] = None  # 作成日時以前（日時で比較）
+    fuzzy: bool = False  # テキスト検索で編集距離の近い語も該当とする（転置インデックス指定時のみ）
+    
+    # スコープ（両方指定時のみスコープ判定、開始日のみの場合は日付補正に使用）
+    chart_start_date: Optional[date] = None
+    chart_end_date: Optional[date] = None
+    warn_excluded_statuses: bool = True  # 除外対象のKanban Status（テンプレート等）を警告に含める
+    warn_unmatched: bool = False  # 追加フィルタに該当しないissueの警告も含める（インデックスで事前に絞り込まない）
+    
+    # ソート・ページネーション（未指定時は行わない、'relevance'は検索語との関連度順）
+    sort_by: Optional[str] = None
+    sort_order: str = 'desc'
+    page: Optional[int] = None
+    per_page: Optional[int] = None
+    cursor: Optional[str] = None  # 前ページのnext_cursor（指定時はpageを無視）
+    
+    @classmethod
+    def from_filters(cls, filters: Dict[str, Any], **kwargs) -> 'IssueQuery':
+        """apply_advanced_filtersの引数形式のフィルタから生成"""
+        return cls(**filters, **kwargs)
+    
+    @property
+    def has_scope(self) -> bool:
+        return self.chart_start_date is not None and self.chart_end_date is not None
+    
+    def compile(self, resolved: Iterable[str] = ()) -> FilterPlan:
+        """追加フィルタをFilterPlanにコンパイル
+        
+        Args:
+            resolved: インデックスで解決済みのため判定しない条件
+        """
+        return compile_filter_plan(**{
+            field: None if field in resolved else getattr(self, field)
+            for field in FILTER_FIELDS
+        })
+    
+    def decode_cursor(self) -> Optional[IssueCursor]:
+        """カーソルのデコード（未指定時はNone、不正な場合はValueError）"""
+        if not self.cursor:
+            return None
+        return decode_cursor(self.cursor, self)
+    
+    def equality_conditions(self, fields: Iterable[str]) -> Dict[str, Any]:
+        """値の一致条件（state='all'は条件なし）"""
+        conditions = {field: getattr(self, field) for field in fields}
+        if conditions.get('state') == 'all':
+            conditions['state'] = None
+        return {field: value for field, value in conditions.items() if value}
+
+
+class IssueQueryResult(BaseModel):
+    """Issueクエリの実行結果"""
+    issues: List[IssueModel]  # ソート・ページネーション後
+    matched: List[IssueModel]  # スコープ・追加フィルタ適用後（ソート済み、sort_byとページネーションを指定し関連度順以外の場合は未ソート）
+    warnings: List[Dict[str, Any]] = []  # スコープ判定の警告情報
+    scores: Dict[int, float] = {}  # issue ID → 検索語との関連度（sort_by='relevance'の場合のみ）
+    total_count: int
+    total_pages: int = 1
+    next_cursor: Optional[str] = None  # 次ページのカーソル（ソート・ページネーション指定時、次ページがある場合のみ）
+    data_changed: bool = False  # カーソルの発行後にストアのissueが変更された
+
+
+def execute_issue_query(
+    issues: List[IssueModel],
+    query: IssueQuery,
+    index=None
+) -> IssueQueryResult:
+    """
+    Issueクエリ実行
+    
+    Args:
+        issues: 分析済みIssue
+        query: 検索条件
+        index: issuesのストアの転置インデックス（IssueIndex）。指定時は値の一致条件・作成日・
+            完了日の範囲・テキスト検索をインデックスの積集合で解決し、該当issueのみをスコープ判定・追加フィルタの
+            対象にする（スコープの警告情報も該当issueのみになる。warn_unmatched指定時は解決しない）
+    
+    Returns:
+        IssueQueryResult
+    
+    Raises:
+        ValueError: カーソルが不正な場合
+    """
+    cursor = query.decode_cursor()
+    resolved: List[str] = []
+    if index is not None and not query.warn_unmatched:
+        conditions = query.equality_conditions(index.fields)
+        selected = index.select(conditions)
+        resolved = list(conditions)
+        
+        # 日付範囲（作成日はスコープの日付補正後の値で判定）
+        ranges = []
+        if query.created_after or query.created_before:
+            ranges.append(index.select_created(query.created_after, query.created_before, query.chart_start_date))
+            resolved += ['created_after', 'created_before']
+        if query.completed_after or query.completed_before:
+            # completed_beforeのみの場合は未完了を含める
+            ranges.append(index.select_completed(
+                query.completed_after,
+                query.completed_before,
+                include_incomplete=not query.completed_after
+            ))
+            resolved += ['completed_after', 'completed_before']
+        
+        # テキスト検索（n-gramインデックスで候補を絞り込み）
+        matched_ids = index.text.search(query.search, fuzzy=query.fuzzy)
+        if matched_ids is not None:
+            ranges.append(matched_ids)
+            resolved.append('search')
+        
+        for issue_ids in ranges:
+            selected = issue_ids if selected is None else selected & issue_ids
+        
+        if selected is not None:
+            # ストアと同じ作成日時の降順
+            issues = sorted(
+                index.get_issues(selected),
+                key=lambda issue: (issue.created_at, issue.id),
+                reverse=True
+            )
+    
+    source = issues  # 日付補正前（カーソルのソート位置の算出に使う）
+    warnings: List[Dict[str, Any]] = []
+    if query.has_scope:
+        if not query.warn_excluded_statuses:
+            issues = apply_exclusion_filter(issues)
+        issues, warnings = apply_scope_filters(issues, query.chart_start_date, query.chart_end_date, index)
+    else:
+        # 期間指定がない場合は統一フィルタのみ適用
+        issues = apply_unified_filters(issues, query.chart_start_date)
+    
+    matched = query.compile(tuple(resolved)).apply(issues)
+    scores: Dict[int, float] = {}
+    ranked: Optional[List[IssueModel]] = None  # 表示ページまでのソート済みissue
+    if query.sort_by == 'relevance':
+        # 関連度の降順（同点は作成日時の降順、インデックスがない場合は作成日時の降順のみ）
+        matched = sort_issues(matched, 'created_at', 'desc')
+        if index is not None and query.search:
+            scores = index.text.score({issue.id for issue in matched}, query.search, fuzzy=query.fuzzy)
+            matched = sorted(matched, key=lambda issue: scores[issue.id], reverse=True)
+    elif query.sort_by and query.per_page and cursor is not None:
+        # 次ページの有無を判定するため1件多く取得
+        ranked = _top_matched(matched, query, query.per_page + 1, index, cursor.position, source)
+    elif query.sort_by and query.page and query.per_page:
+        ranked = _top_matched(matched, query, query.page * query.per_page, index)
+    elif query.sort_by:
+        matched = sort_issues(matched, query.sort_by, query.sort_order)
+    
+    page_issues = matched
+    total_pages = 1
+    has_next = False
+    if ranked is not None and cursor is not None:
+        page_issues = ranked[:query.per_page]
+        has_next = len(ranked) > query.per_page
+    elif query.page and query.per_page:
+        page_issues = paginate_issues(ranked if ranked is not None else matched, query.page, query.per_page)
+        has_next = query.page * query.per_page < len(matched)
+    if query.per_page and (query.page or cursor is not None):
+        total_pages = (len(matched) + query.per_page - 1) // query.per_page
+    
+    # 次ページのカーソル（ページ末尾のissueのソート位置）
+    version = index.store.version if index is not None else 0
+    next_cursor = None
+    if has_next and page_issues and query.sort_by != 'relevance':
+        position = _sort_position(page_issues[-1], query, _stored_issue_getter(source, index))
+        next_cursor = encode_cursor(query.model_copy(update={'cursor': None}), position, version)
+    
+    return IssueQueryResult(
+        issues=page_issues,
+        matched=matched,
+        warnings=warnings,
+        scores=scores,
+        total_count=len(matched),
+        total_pages=total_pages,
+        next_cursor=next_cursor,
+        data_changed=cursor is not None and cursor.version != version
+    )
+
+
+def _top_matched(
+    matched: List[IssueModel],
+    query: IssueQuery,
+    limit: int,
+    index=None,
+    after: Optional[Tuple[Any, float, int]] = None,
+    source: Iterable[IssueModel] = ()
+) -> List[IssueModel]:
+    """ソート順の先頭limit件（sort_issuesで全件を並べた先頭と同じ）
+    
+    転置インデックスに事前に並べた順序があるソートキーは、その順序を先頭（after指定時はその位置）から
+    走査して該当issueを拾う。それ以外はヒープで上位のみを求める
+    
+    Args:
+        after: ソート位置（sort_position）。指定時はこの位置より後のissueのみを対象にする
+        source: 日付補正前のissue（転置インデックスがない場合のソート位置の算出に使う）
+    """
+    ordered_ids = index.ordered_ids(query.sort_by, query.sort_order, after) if index is not None else None
+    if ordered_ids is None:
+        if after is None:
+            return top_issues(matched, query.sort_by, query.sort_order, limit)
+        
+        descending = query.sort_order == 'desc'
+        stored_issue = _stored_issue_getter(source, index)
+        positions = {issue.id: _sort_position(issue, query, stored_issue) for issue in matched}
+        following = [
+            issue for issue in matched
+            if (positions[issue.id] < after if descending else positions[issue.id] > after)
+        ]
+        select = heapq.nlargest if descending else heapq.nsmallest
+        return select(limit, following, key=lambda issue: positions[issue.id])
+    
+    matched_by_id = {issue.id: issue for issue in matched}
+    ranked = []
+    for issue_id in ordered_ids:
+        if len(ranked) >= limit or len(ranked) == len(matched_by_id):
+            break
+        issue = matched_by_id.get(issue_id)
+        if issue is not None:
+            ranked.append(issue)
+    return ranked
+
+
+def _stored_issue_getter(source: Iterable[IssueModel], index=None) -> Callable[[int], Optional[IssueModel]]:
+    """日付補正前のissueの取得関数（転置インデックス指定時はストア、それ以外はsourceから）"""
+    if index is not None:
+        return index.store.get_issue
+    return {issue.id: issue for issue in source}.get
+
+
+def _sort_position(
+    issue: IssueModel,
+    query: IssueQuery,
+    stored_issue: Callable[[int], Optional[IssueModel]]
+) -> Tuple[Any, float, int]:
+    """issueのソート位置（同じ値の順序はストアでの作成日時で決まるため、日付補正前の作成日時を使う）"""
+    stored = stored_issue(issue.id)
+    return sort_position(
+        issue,
+        query.sort_by,
+        query.sort_order == 'desc',
+        stored.created_at if stored is not None else None
+    )
@@ -0,0 +1,157 @@
+"""複数期間チャート用の日別インデックス
+
+一度取得・分析したissueを四半期・日付序数で索引化し、期間ごとのスコープ判定
+（apply_unified_filters + apply_scope_filters + apply_advanced_filters と同じ判定）を
+issueのコピーやタイムゾーン変換なしで行う
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date, datetime, timezone
+from app.models.issue import IssueModel
+from app.utils.quarter_utils import get_overlapping_quarters, normalize_quarter_label
+from app.utils.issue_query import IssueQuery
+
+# 期間によって判定が変わる追加フィルタ（作成日は期間開始日で補正した値で判定する）
+PERIOD_DEPENDENT_FILTERS = ('created_after', 'created_before')
+
+# 期間ごとの集計レコード: (補正後の作成日序数, 完了日序数, ポイント)
+PeriodRecord = Tuple[Optional[int], Optional[int], Optional[float]]
+
+
+def _to_utc_datetime(value: Optional[datetime]) -> Optional[datetime]:
+    """timezone-naiveなdatetimeはUTCとして扱う"""
+    if value is None:
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _to_utc_ordinal(value: Optional[datetime]) -> Optional[int]:
+    """UTCの日付序数（date.toordinal）"""
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).date().toordinal()
+
+
+class PeriodIssueIndex:
+    """期間横断のissueインデックス
+    
+    各issueの作成日時・完了日時・日付序数・ポイント・警告判定用フラグを一度だけ算出し、
+    正規化した四半期ラベルごと・マイルストーンごとにまとめる。期間ごとの判定は
+    対象四半期（マイルストーン指定時はそのマイルストーン）のissueのみ走査する
+    """
+    
+    def __init__(self, issues: List[IssueModel], filters: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            issues: 分析済み・除外ルール適用済みのissue
+            filters: apply_advanced_filtersの引数形式のフィルタ
+        """
+        filters = filters or {}
+        self.created_after: Optional[date] = filters.get('created_after')
+        self.created_before: Optional[date] = filters.get('created_before')
+        
+        # 期間に依存しない追加フィルタは一度だけ判定
+        static_filters = {
+            key: value for key, value in filters.items() if key not in PERIOD_DEPENDENT_FILTERS
+        }
+        matched_ids = {id(issue) for issue in IssueQuery.from_filters(static_filters).compile().apply(issues)}
+        
+        self.total_issues = len(issues)
+        self._buckets: Dict[str, List[Tuple[Any, ...]]] = {}
+        self._milestone_buckets: Dict[str, List[Tuple[Any, ...]]] = {}
+        for issue in issues:
+            quarter = normalize_quarter_label(issue.quarter or '')
+            if not quarter and not issue.milestone:
+                continue
+            created_at = _to_utc_datetime(issue.created_at)
+            completed_at = _to_utc_datetime(issue.completed_at)
+            entry = (
+                created_at,
+                _to_utc_ordinal(created_at),
+                completed_at,
+                _to_utc_ordinal(completed_at),
+                issue.point,
+                issue.kanban_status in ['完了', '共有待ち'] and not issue.due_date,
+                id(issue) in matched_ids
+            )
+            if quarter:
+                self._buckets.setdefault(quarter, []).append(entry)
+            if issue.milestone:
+                self._milestone_buckets.setdefault(issue.milestone, []).append(entry)
+    
+    def select(
+        self,
+        start_date: date,
+        end_date: date,
+        milestone: Optional[str] = None
+    ) -> Tuple[List[PeriodRecord], Dict[str, int]]:
+        """期間のスコープ内issueを選択
+        
+        Args:
+            milestone: 指定時は四半期ではなくマイルストーンでスコープを決める
+                （四半期の警告件数は集計しない）
+        
+        Returns:
+            Tuple[List[PeriodRecord], Dict[str, int]]: (集計レコード, 警告理由別の件数)
+        """
+        start_datetime = datetime.combine(start_date, datetime.min.time()).replace(tzinfo=timezone.utc)
+        end_datetime = datetime.combine(end_date, datetime.max.time()).replace(tzinfo=timezone.utc)
+        start_ordinal = start_date.toordinal()
+        created_after = self.created_after.toordinal() if self.created_after else None
+        created_before = self.created_before.toordinal() if self.created_before else None
+        
+        if milestone is not None:
+            candidates = [self._milestone_buckets.get(milestone, [])]
+            warning_counts: Dict[str, int] = {}
+        else:
+            target_quarters = {
+                normalize_quarter_label(q) for q in get_overlapping_quarters(start_date, end_date)
+            }
+            candidates = [self._buckets.get(quarter, []) for quarter in target_quarters]
+            warning_counts = {
+                'quarter': self.total_issues - sum(len(bucket) for bucket in candidates)
+            }
+        records: List[PeriodRecord] = []
+        
+        for bucket in candidates:
+            for created_at, created_ordinal, completed_at, completed_ordinal, point, no_due_date, matched in bucket:
+                # 日付補正（apply_date_correctionと同じ順序）
+                corrected_ordinal = created_ordinal
+                if created_at is not None:
+                    corrected_at = created_at
+                    if completed_at is not None and created_at > completed_at:
+                        corrected_at, corrected_ordinal = completed_at, completed_ordinal
+                    if created_at < start_datetime:
+                        corrected_at, corrected_ordinal = start_datetime, start_ordinal
+                    
+                    if corrected_at > end_datetime:
+                        warning_counts['created-after-period'] = warning_counts.get('created-after-period', 0) + 1
+                        continue
+                
+                if completed_at is not None:
+                    if completed_at > end_datetime:
+                        warning_counts['post-period'] = warning_counts.get('post-period', 0) + 1
+                        continue
+                    if completed_at < start_datetime:
+                        warning_counts['pre-period'] = warning_counts.get('pre-period', 0) + 1
+                        continue
+                
+                if no_due_date:
+                    warning_counts['no-due-date'] = warning_counts.get('no-due-date', 0) + 1
+                    continue
+                
+                if not matched:
+                    continue
+                
+                # 作成日フィルタは補正後の作成日で判定
+                if created_after is not None or created_before is not None:
+                    if corrected_ordinal is None:
+                        continue
+                    if created_after is not None and corrected_ordinal < created_after:
+                        continue
+                    if created_before is not None and corrected_ordinal > created_before:
+                        continue
+                
+                records.append((corrected_ordinal, completed_ordinal, point))
+        
+        return records, warning_counts
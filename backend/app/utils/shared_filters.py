@@ -1,6 +1,8 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Callable, Tuple
 from datetime import datetime, timezone, date
+import heapq
 from app.models.issue import IssueModel
+from app.utils.filter_plan import compile_filter_plan
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,6 +27,7 @@ def apply_advanced_filters(
     """
     共通の高度フィルタ適用関数
     Issues API、Chart APIの両方で使用される
+    条件をFilterPlanにコンパイルし、1回の走査で適用する
     
     Args:
         issues: フィルタ対象のIssue一覧
@@ -41,99 +44,70 @@ def apply_advanced_filters(
         assignee: アサイニー
         service: サービス
         milestone: マイルストーン
-        
+    
     Returns:
         フィルタリング済みIssue一覧
     """
-    filtered = issues
-    
-    # Point範囲フィルタ
-    if min_point is not None:
-        filtered = [i for i in filtered if i.point is not None and i.point >= min_point]
-    
-    if max_point is not None:
-        filtered = [i for i in filtered if i.point is not None and i.point <= max_point]
-    
-    # テキスト検索
-    if search:
-        search_lower = search.lower()
-        filtered = [
-            i for i in filtered 
-            if search_lower in i.title.lower() or 
-               (i.description and search_lower in i.description.lower())
-        ]
-    
-    # Kanbanステータスフィルタ
-    if kanban_status:
-        filtered = [i for i in filtered if i.kanban_status == kanban_status]
-    
-    # Epicフィルタ
-    if is_epic:
-        if is_epic == 'epic':
-            # is_epic が True の場合のみ
-            filtered = [i for i in filtered if i.is_epic is True]
-        elif is_epic == 'normal':
-            # is_epic が False または None の場合
-            filtered = [i for i in filtered if i.is_epic is not True]
-    
-    # 状態フィルタ
-    if state and state != 'all':
-        filtered = [i for i in filtered if i.state == state]
-    
-    # 作成日フィルタ
-    if created_after or created_before:
-        date_filtered = []
-        for issue in filtered:
-            if not issue.created_at:
-                continue
-                
-            # timezone-awareなdatetimeから、UTCのdateを取得
-            issue_date = issue.created_at.astimezone(timezone.utc).date() if issue.created_at.tzinfo else issue.created_at.date()
-            
-            if created_after and issue_date < created_after:
-                continue
-            if created_before and issue_date > created_before:
-                continue
-                
-            date_filtered.append(issue)
-        filtered = date_filtered
-    
-    # 完了日フィルタ
-    if completed_after or completed_before:
-        date_filtered = []
-        for issue in filtered:
-            if not issue.completed_at:
-                # completed_atがNoneの場合、completed_afterが指定されていれば除外
-                if completed_after:
-                    continue
-                # completed_beforeが指定されていれば含める（未完了は完了日前と見なす）
-                date_filtered.append(issue)
-                continue
-                
-            # timezone-awareなdatetimeから、UTCのdateを取得
-            issue_date = issue.completed_at.astimezone(timezone.utc).date() if issue.completed_at.tzinfo else issue.completed_at.date()
-            
-            if completed_after and issue_date < completed_after:
-                continue
-            if completed_before and issue_date > completed_before:
-                continue
-                
-            date_filtered.append(issue)
-        filtered = date_filtered
-    
-    # アサイニーフィルタ
-    if assignee:
-        filtered = [i for i in filtered if i.assignee == assignee]
-    
-    # サービスフィルタ
-    if service:
-        filtered = [i for i in filtered if i.service == service]
+    return compile_filter_plan(
+        min_point=min_point,
+        max_point=max_point,
+        search=search,
+        kanban_status=kanban_status,
+        is_epic=is_epic,
+        state=state,
+        created_after=created_after,
+        created_before=created_before,
+        completed_after=completed_after,
+        completed_before=completed_before,
+        assignee=assignee,
+        service=service,
+        milestone=milestone
+    ).apply(issues)
+
+
+def _min_datetime() -> datetime:
+    return datetime.min.replace(tzinfo=timezone.utc)
+
+
+# ソートキー（未設定の値は最小値として扱う）
+SORT_KEYS: Dict[str, Callable[[IssueModel], Any]] = {
+    'created_at': lambda x: x.created_at,
+    'updated_at': lambda x: x.updated_at or x.created_at,
+    'point': lambda x: x.point or 0,
+    'title': lambda x: x.title.lower(),
+    'state': lambda x: x.state,
+    'completed_at': lambda x: x.completed_at or _min_datetime(),
+    'due_date': lambda x: x.due_date or _min_datetime(),
+    'milestone': lambda x: x.milestone or '',
+    'assignee': lambda x: x.assignee or ''
+}
+
+
+def get_sort_key(sort_by: str) -> Callable[[IssueModel], Any]:
+    """ソートキー取得（未対応の項目は作成日順）"""
+    return SORT_KEYS.get(sort_by, SORT_KEYS['created_at'])
+
+
+def sort_position(
+    issue: IssueModel,
+    sort_by: str,
+    descending: bool,
+    created_at: Optional[datetime] = None
+) -> Tuple[Any, float, int]:
+    """
+    ソート位置（sort_issuesでストアの順序のissueを並べた順を、タプルの比較で表す）
     
-    # マイルストーンフィルタ
-    if milestone:
-        filtered = [i for i in filtered if i.milestone == milestone]
+    同じ値のissueはストアの順序（作成日時・IDの降順）に並ぶため、降順は (値, 作成日時, ID) の降順、
+    昇順は (値, -作成日時, -ID) の昇順がsort_issuesの順序になる
     
-    return filtered
+    Args:
+        created_at: ストアでの作成日時（日付補正前、未指定時はissue.created_at）
+    """
+    key = get_sort_key(sort_by)(issue)
+    created = (created_at or issue.created_at).timestamp()
+    if descending:
+        return (key, created, issue.id)
+    return (key, -created, -issue.id)
 
 
 def sort_issues(issues: List[IssueModel], sort_by: str, sort_order: str) -> List[IssueModel]:
@@ -142,29 +116,23 @@ def sort_issues(issues: List[IssueModel], sort_by: str, sort_order: str) -> List
     
     Args:
         issues: ソート対象のIssue一覧
-        sort_by: ソートキー ('created_at', 'updated_at', 'point', 'title', 'state')
+        sort_by: ソートキー ('created_at', 'updated_at', 'point', 'title', 'state', 'completed_at', 'due_date', 'milestone', 'assignee')
         sort_order: ソート順序 ('asc', 'desc')
-        
+    
     Returns:
-        ソート済みIssue一覧
+        ソート済みIssue一覧（同じ値のIssueは元の順序を保つ）
     """
-    reverse = sort_order == 'desc'
-    
-    if sort_by == 'created_at':
-        return sorted(issues, key=lambda x: x.created_at, reverse=reverse)
-    elif sort_by == 'updated_at':
-        return sorted(issues, key=lambda x: x.updated_at or x.created_at, reverse=reverse)
-    elif sort_by == 'point':
-        return sorted(issues, key=lambda x: x.point or 0, reverse=reverse)
-    elif sort_by == 'title':
-        return sorted(issues, key=lambda x: x.title.lower(), reverse=reverse)
-    elif sort_by == 'state':
-        return sorted(issues, key=lambda x: x.state, reverse=reverse)
-    elif sort_by == 'completed_at':
-        return sorted(issues, key=lambda x: x.completed_at or datetime.min.replace(tzinfo=timezone.utc), reverse=reverse)
-    else:
-        # デフォルトは作成日順
-        return sorted(issues, key=lambda x: x.created_at, reverse=reverse)
+    return sorted(issues, key=get_sort_key(sort_by), reverse=sort_order == 'desc')
+
+
+def top_issues(issues: List[IssueModel], sort_by: str, sort_order: str, limit: int) -> List[IssueModel]:
+    """
+    ソート順の先頭limit件（sort_issues(...)[:limit] と同じ結果をheapqの部分ソートで求める）
+    """
+    if limit >= len(issues):
+        return sort_issues(issues, sort_by, sort_order)
+    select = heapq.nlargest if sort_order == 'desc' else heapq.nsmallest
+    return select(limit, issues, key=get_sort_key(sort_by))
 
 
 def paginate_issues(issues: List[IssueModel], page: int, per_page: int) -> List[IssueModel]:
@@ -175,7 +143,7 @@ def paginate_issues(issues: List[IssueModel], page: int, per_page: int) -> List[
         issues: ページネーション対象のIssue一覧
         page: ページ番号（1から開始）
         per_page: 1ページあたりの件数
-        
+    
     Returns:
         ページネーション済みIssue一覧
     """
@@ -0,0 +1,213 @@
+from typing import List, Optional, Set, Tuple
+from functools import lru_cache
+from itertools import chain
+import re
+import unicodedata
+
+# 小文字化後の文字の統一: カタカナ → ひらがな（ァ〜ヶ・ヽヾ）、語末のシグマ ς → σ
+# （str.lower()は前後の文字によってΣをςにするため、部分ごとに正規化しても結果が変わらないようにする）
+TEXT_FOLDING = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+TEXT_FOLDING.update({0x30FD: 0x309D, 0x30FE: 0x309E, 0x03C2: 0x03C3})
+
+# CJKとして2文字ずつのn-gramを作る文字の範囲（ひらがな・カタカナ・CJK統合漢字・拡張A・々〆）
+CJK_RANGES = [
+    (0x3005, 0x3006),
+    (0x3040, 0x30FF),
+    (0x3400, 0x4DBF),
+    (0x4E00, 0x9FFF)
+]
+
+# 前の文字と合成されうる文字（結合文字に加えて、半角・結合用の濁点・半濁点とハングル字母）
+COMPOSING_RANGES = [
+    (0x1100, 0x11FF),
+    (0x3099, 0x309A),
+    (0x3131, 0x318E),
+    (0xFF9E, 0xFF9F)
+]
+
+_CJK_CLASS = ''.join(f"\\u{low:04x}-\\u{high:04x}" for low, high in CJK_RANGES)
+
+# CJK文字が2文字以上続く部分
+CJK_RUN_PATTERN = re.compile(f"[{_CJK_CLASS}]{{2,}}")
+
+# 検索順位・ハイライト用のトークン（英数字は単語、CJK文字の連続部分は2文字ずつ）
+TOKEN_PATTERN = re.compile(f"(?P<cjk>[{_CJK_CLASS}]+)|[^\\W{_CJK_CLASS}]+")
+
+# 正規化済みテキストの位置 → 元のテキストの位置（開始位置のリスト, 終了位置のリスト）、1対1の場合はNone
+OffsetMap = Optional[Tuple[List[int], List[int]]]
+
+
+@lru_cache(maxsize=16384)
+def normalize_text(text: Optional[str]) -> str:
+    """
+    検索用のテキスト正規化
+    
+    NFKC正規化（全角英数字・半角カタカナの幅の統一）、小文字化（語末のシグマもσに統一）、カタカナのひらがな化を行う。
+    同じ文字列（issueの同じ版のタイトル・説明文）の正規化結果は再利用する
+    
+    Args:
+        text: タイトル・説明文・検索キーワード（Noneは空文字列）
+    
+    Returns:
+        str: 正規化済みテキスト
+    """
+    return normalize_with_offsets(text)[0]
+
+
+def normalize_with_offsets(text: Optional[str]) -> Tuple[str, OffsetMap]:
+    """
+    検索用のテキスト正規化（ハイライト位置の変換用に元のテキストの位置も返す）
+    
+    正規化で文字数が変わる文字・前の文字と合成される文字を含む部分だけを個別に正規化し、
+    それ以外は1文字ずつ対応させる
+    
+    Returns:
+        Tuple[str, OffsetMap]: (正規化済みテキスト, 元のテキストの位置)
+    """
+    if not text:
+        return '', None
+    if text.isascii():
+        return text.lower(), None
+    
+    pattern = _offset_sensitive_pattern()
+    if pattern.search(text) is None:
+        return _fold(text), None
+    
+    pieces: List[str] = []
+    starts: List[int] = []
+    ends: List[int] = []
+    
+    def append(begin: int, end: int, grouped: bool) -> None:
+        folded = _fold(text[begin:end])
+        if not grouped and len(folded) != end - begin:
+            grouped = True
+        pieces.append(folded)
+        if grouped:
+            starts.extend([begin] * len(folded))
+            ends.extend([end] * len(folded))
+        else:
+            starts.extend(range(begin, end))
+            ends.extend(range(begin + 1, end + 1))
+    
+    position = 0
+    for match in pattern.finditer(text):
+        if position < match.start():
+            append(position, match.start(), False)
+        append(match.start(), match.end(), True)
+        position = match.end()
+    if position < len(text):
+        append(position, len(text), False)
+    
+    return ''.join(pieces), (starts, ends)
+
+
+def _fold(text: str) -> str:
+    return unicodedata.normalize('NFKC', text).lower().translate(TEXT_FOLDING)
+
+
+@lru_cache(maxsize=1)
+def _offset_sensitive_pattern() -> 're.Pattern':
+    """正規化で文字数が変わる文字、または前の文字と合成される文字（と直前の1文字）のパターン"""
+    composing = []
+    changing = []
+    for code in chain(range(0x80, 0xD800), range(0xE000, 0x10000), range(0x1F100, 0x1F300)):
+        char = chr(code)
+        if unicodedata.combining(char) or any(low <= code <= high for low, high in COMPOSING_RANGES):
+            composing.append(code)
+        elif len(_fold(char)) != 1:
+            changing.append(code)
+    composing_class = _char_class(composing)
+    return re.compile(f"[^{composing_class}]?[{composing_class}]+|[{_char_class(changing)}]")
+
+
+def _char_class(codes: List[int]) -> str:
+    """文字コードのリスト（昇順）を正規表現の文字クラスの中身に変換"""
+    ranges: List[List[int]] = []
+    for code in codes:
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return ''.join(
+        re.escape(chr(low)) if low == high else f"{re.escape(chr(low))}-{re.escape(chr(high))}"
+        for low, high in ranges
+    )
+
+
+def is_cjk(char: str) -> bool:
+    """CJK文字（正規化済みテキストの1文字）か"""
+    code = ord(char)
+    return any(low <= code <= high for low, high in CJK_RANGES)
+
+
+def cjk_bigrams(text: str) -> Set[str]:
+    """正規化済みテキストの、CJK文字が2文字続く部分の2-gram"""
+    bigrams = set()
+    for match in CJK_RUN_PATTERN.finditer(text):
+        run = match.group()
+        bigrams.update(run[i:i + 2] for i in range(len(run) - 1))
+    return bigrams
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """
+    正規化済みテキストのトークン分割（英数字は単語、CJK文字の連続部分は2文字ずつの2-gram）
+    
+    Returns:
+        List[Tuple[str, int, int]]: (トークン, 開始位置, 終了位置) のリスト
+    """
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text):
+        word = match.group()
+        begin = match.start()
+        if len(word) > 1 and match.lastgroup == 'cjk':
+            tokens.extend((word[i:i + 2], begin + i, begin + i + 2) for i in range(len(word) - 1))
+        else:
+            tokens.append((word, begin, match.end()))
+    return tokens
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    編集距離（隣接文字の入れ替えも1回と数える、limitを超える場合はlimit + 1）
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            distance = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                distance = min(distance, before_previous[j - 2] + 1)
+            current.append(distance)
+        if min(current) > limit:
+            return limit + 1
+        before_previous, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def split_search_terms(search: Optional[str]) -> List[str]:
+    """
+    検索キーワードを正規化して空白で分割（重複は除く）
+    
+    Returns:
+        List[str]: 検索語のリスト（すべてを含むissueが該当）
+    """
+    terms = []
+    for term in normalize_text(search).split():
+        if term not in terms:
+            terms.append(term)
+    return terms
+
+
+def contains_all_terms(terms: List[str], title: Optional[str], description: Optional[str]) -> bool:
+    """すべての検索語がタイトルまたは説明文に含まれるか"""
+    title = normalize_text(title)
+    description = normalize_text(description)
+    return all(term in title or term in description for term in terms)
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+import random
+import uuid
+import pytest
+from app.models.issue import IssueModel
+from app.services.issue_analyzer import IssueAnalyzer
+
+STATUSES = ['未着手', '作業中', 'レビュー中', '共有待ち', '完了', 'テンプレート', '不要']
+SERVICES = ['backend', 'frontend', 'infra']
+ASSIGNEES = ['佐藤', 'Suzuki', 'tanaka', None]
+QUARTERS = ['FY24Q1', 'FY24Q2', 'FY24Q3', 'FY23Q4']
+TITLES = ['ログイン画面の修正', 'APIエラー対応', 'Fix login bug', 'Review search index', 'ﾃｽﾄ 半角カナ']
+DESCRIPTIONS = ['', '詳細な説明です。', 'Some english description about the review flow', 'login API timeout']
+
+
+def build_issues(count: int = 200, seed: int = 1):
+    """ラベルから分析済みのランダムなissue（作成日時は2024-03-01から約半年）"""
+    rnd = random.Random(seed)
+    base = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    issues = []
+    for index in range(count):
+        created_at = base + timedelta(days=rnd.randint(0, 180), hours=rnd.randint(0, 23))
+        labels = ['#' + rnd.choice(STATUSES), 's:' + rnd.choice(SERVICES), '@' + rnd.choice(QUARTERS)]
+        if rnd.random() < 0.9:
+            labels.append(f"p:{rnd.choice([0.5, 1, 2, 3, 5, 8])}")
+        if rnd.random() < 0.05:
+            labels.append('epic')
+        issues.append(IssueModel(
+            id=1000 + index,
+            iid=index + 1,
+            title=f"{rnd.choice(TITLES)} {index}",
+            description=rnd.choice(DESCRIPTIONS),
+            state=rnd.choice(['opened', 'closed']),
+            created_at=created_at,
+            updated_at=created_at + timedelta(days=rnd.randint(0, 30)),
+            due_date=created_at + timedelta(days=rnd.randint(-5, 60)) if rnd.random() < 0.8 else None,
+            assignee=rnd.choice(ASSIGNEES),
+            milestone=rnd.choice(['v1', 'v2', None]),
+            labels=labels,
+            web_url=f"http://gitlab.example.com/issues/{index + 1}"
+        ))
+    return IssueAnalyzer().analyze_issues_batch(issues)
+
+
+@pytest.fixture
+def make_issues():
+    return build_issues
+
+
+class FakeProject:
+    id = 42
+
+
+class FakeGitLabClient:
+    """Issueストアの同期にbuild_issues()を返すGitLabクライアントの代わり（トークンごとに別のストア）"""
+    url = 'http://gitlab.example.com'
+    project_id = '42'
+    project = FakeProject()
+    is_connected = True
+    
+    def __init__(self):
+        self.token = uuid.uuid4().hex
+
+
+@pytest.fixture
+def api_client(monkeypatch, tmp_path):
+    """セッション 'test-session' でbuild_issues()のissueを返すAPIクライアントと共通ヘッダー"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services.issue_service import IssueService
+    from app.services.session_manager import session_manager
+    from app.services.chart_snapshot_store import chart_snapshot_store
+    
+    gitlab_client = FakeGitLabClient()
+    issues = build_issues()
+    
+    async def get_all_issues(self, **kwargs):
+        return [issue.model_copy() for issue in issues]
+    
+    monkeypatch.setattr(IssueService, 'get_all_issues', get_all_issues)
+    monkeypatch.setattr(
+        session_manager, 'get_gitlab_client',
+        lambda session_id: gitlab_client if session_id == 'test-session' else None
+    )
+    monkeypatch.setattr(chart_snapshot_store, 'snapshot_dir', str(tmp_path))
+    return TestClient(app), {'X-Session-Id': 'test-session'}
@@ -0,0 +1,173 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+import pytest
+from app.models.issue import IssueModel
+from app.services.chart_analyzer import ChartAnalyzer
+from app.utils.business_days import BusinessDayCalculator
+
+JST = timezone(timedelta(hours=9))
+PERIODS = [
+    (date(2024, 4, 1), date(2024, 6, 30)),
+    (date(2024, 5, 3), date(2024, 5, 6)),
+    (date(2024, 5, 15), date(2024, 5, 15)),
+    (date(2024, 12, 1), date(2025, 1, 31)),
+]
+
+
+def _utc_date(value: datetime) -> date:
+    return value.astimezone(timezone.utc).date() if value.tzinfo else value.date()
+
+
+def _edge_issues() -> List[IssueModel]:
+    """期間の前後にまたがるissue（期間開始前に作成・期間終了後に完了など）"""
+    def issue(issue_id: int, created_at: datetime, completed_at=None, point=None) -> IssueModel:
+        return IssueModel(
+            id=issue_id,
+            iid=issue_id,
+            title=f"edge {issue_id}",
+            description='',
+            state='closed' if completed_at else 'opened',
+            created_at=created_at,
+            completed_at=completed_at,
+            point=point
+        )
+    
+    return [
+        issue(1, datetime(2024, 1, 10, tzinfo=timezone.utc), point=3.0),
+        issue(2, datetime(2024, 1, 10, tzinfo=timezone.utc), datetime(2024, 8, 1, tzinfo=timezone.utc), 5.0),
+        issue(3, datetime(2024, 1, 10, tzinfo=timezone.utc), datetime(2024, 2, 1, tzinfo=timezone.utc), 2.0),
+        issue(4, datetime(2024, 3, 31, 23, tzinfo=timezone.utc), datetime(2024, 7, 1, tzinfo=timezone.utc), 8.0),
+        # 期間終了後に作成（完了済み）
+        issue(5, datetime(2024, 9, 1, tzinfo=timezone.utc), datetime(2024, 9, 2, tzinfo=timezone.utc), 1.0),
+        # JSTの日付とUTCの日付が異なる
+        issue(6, datetime(2024, 4, 1, 8, tzinfo=JST), datetime(2024, 5, 16, 8, tzinfo=JST), 0.5),
+        # timezone-naiveはそのままの日付
+        issue(7, datetime(2024, 4, 10, 23), datetime(2024, 5, 15, 23), 2.0),
+        # ポイントなし
+        issue(8, datetime(2024, 4, 2, tzinfo=timezone.utc), datetime(2024, 4, 20, tzinfo=timezone.utc)),
+        issue(9, datetime(2024, 4, 2, tzinfo=timezone.utc)),
+    ]
+
+
+def _baseline_columns(issues: List[IssueModel], start_date: date, end_date: date, chart_type: str) -> Dict[str, List[Any]]:
+    """従来の日別ループ（日付ごとに全issueを走査）で算出したチャートデータ"""
+    calculator = BusinessDayCalculator()
+    columns = {name: [] for name in (
+        'dates', 'planned', 'actual', 'remaining', 'completed', 'total', 'completed_issues', 'total_issues'
+    )}
+    total_points = sum(issue.point for issue in issues if issue.point)
+    current_date = start_date
+    while current_date <= end_date:
+        completed_points = sum(
+            issue.point for issue in issues
+            if issue.completed_at and issue.point and _utc_date(issue.completed_at) <= current_date
+        )
+        completed_issues = sum(
+            1 for issue in issues
+            if issue.completed_at and _utc_date(issue.completed_at) <= current_date
+        )
+        progress = calculator.calculate_business_day_progress(start_date, end_date, current_date)
+        if chart_type == 'burn_down':
+            total = total_points
+            planned = total_points * (1 - progress)
+            actual = total_points - completed_points
+        else:
+            total = sum(
+                issue.point for issue in issues
+                if issue.created_at and issue.point and _utc_date(issue.created_at) <= current_date
+            )
+            planned = total * progress
+            actual = completed_points
+        columns['dates'].append(current_date)
+        columns['planned'].append(planned)
+        columns['actual'].append(actual)
+        columns['remaining'].append(total - completed_points)
+        columns['completed'].append(completed_points)
+        columns['total'].append(total)
+        columns['completed_issues'].append(completed_issues)
+        columns['total_issues'].append(len(issues))
+        current_date += timedelta(days=1)
+    return columns
+
+
+def _assert_columns_equal(actual: Dict[str, List[Any]], expected: Dict[str, List[Any]]) -> None:
+    assert actual.keys() == expected.keys()
+    for name, values in expected.items():
+        assert actual[name] == pytest.approx(values), name
+
+
+@pytest.mark.parametrize('start_date, end_date', PERIODS)
+@pytest.mark.parametrize('seed', [1, 2])
+def test_burn_chart_columns_match_baseline_daily_loop(make_issues, start_date, end_date, seed):
+    issues = make_issues(seed=seed) + _edge_issues()
+    analyzer = ChartAnalyzer()
+    
+    burn_down = analyzer.generate_burn_down_columns(issues, start_date, end_date)
+    burn_up = analyzer.generate_burn_up_columns(issues, start_date, end_date)
+    combined = analyzer.generate_burn_chart_columns(issues, start_date, end_date)
+    
+    expected_burn_down = _baseline_columns(issues, start_date, end_date, 'burn_down')
+    expected_burn_up = _baseline_columns(issues, start_date, end_date, 'burn_up')
+    _assert_columns_equal(burn_down, expected_burn_down)
+    _assert_columns_equal(burn_up, expected_burn_up)
+    _assert_columns_equal(combined[0], expected_burn_down)
+    _assert_columns_equal(combined[1], expected_burn_up)
+
+
+@pytest.mark.parametrize('start_date, end_date', PERIODS + [
+    (date(2024, 5, 4), date(2024, 5, 5)),
+    (date(2024, 12, 28), date(2025, 1, 5)),
+])
+def test_business_day_progress_series_matches_per_day(start_date, end_date):
+    calculator = BusinessDayCalculator()
+    dates = [start_date + timedelta(days=offset) for offset in range(-3, (end_date - start_date).days + 4)]
+    
+    assert calculator.calculate_business_day_progress_series(start_date, end_date, dates) == [
+        calculator.calculate_business_day_progress(start_date, end_date, current_date)
+        for current_date in dates
+    ]
+
+
+@pytest.mark.parametrize('group_by', ['service', 'assignee', 'milestone'])
+@pytest.mark.parametrize('chart_type', ['burn_down', 'burn_up'])
+def test_grouped_columns_match_baseline_per_group(make_issues, group_by, chart_type):
+    issues = make_issues() + _edge_issues()
+    start_date, end_date = PERIODS[0]
+    
+    total, groups = ChartAnalyzer().generate_grouped_chart_columns(
+        issues, start_date, end_date, group_by, chart_type
+    )
+    
+    _assert_columns_equal(total, _baseline_columns(issues, start_date, end_date, chart_type))
+    keys = {getattr(issue, group_by) for issue in issues}
+    assert set(groups) == keys
+    for key in keys:
+        members = [issue for issue in issues if getattr(issue, group_by) == key]
+        _assert_columns_equal(groups[key], _baseline_columns(members, start_date, end_date, chart_type))
+
+
+@pytest.mark.parametrize('granularity, max_points', [
+    ('week', None),
+    ('month', None),
+    ('auto', None),
+    ('day', 10),
+    ('week', 5),
+])
+def test_sampled_columns_match_baseline_on_selected_dates(make_issues, granularity, max_points):
+    issues = make_issues() + _edge_issues()
+    start_date, end_date = PERIODS[0]
+    
+    burn_down, burn_up = ChartAnalyzer().generate_burn_chart_columns(
+        issues, start_date, end_date, granularity, max_points
+    )
+    
+    for columns, chart_type in ((burn_down, 'burn_down'), (burn_up, 'burn_up')):
+        daily = _baseline_columns(issues, start_date, end_date, chart_type)
+        assert columns['dates'][-1] == end_date
+        assert columns['dates'] == sorted(set(columns['dates']))
+        if max_points:
+            assert len(columns['dates']) <= max_points
+        indices = [daily['dates'].index(day) for day in columns['dates']]
+        _assert_columns_equal(columns, {
+            name: [values[index] for index in indices] for name, values in daily.items()
+        })
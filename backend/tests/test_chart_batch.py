@@ -0,0 +1,44 @@
+from collections import Counter
+from typing import Any, Dict
+import pytest
+
+PERIODS = [
+    {'start_date': '2024-01-01', 'end_date': '2024-03-31', 'label': 'Q4'},
+    {'start_date': '2024-04-01', 'end_date': '2024-06-30', 'label': 'Q1'},
+    {'start_date': '2024-07-01', 'end_date': '2024-09-30', 'label': 'Q2'},
+    {'start_date': '2024-05-15', 'end_date': '2024-08-15'},
+    {'start_date': '2024-06-10', 'end_date': '2024-06-14'},
+]
+
+
+@pytest.mark.parametrize('params', [
+    {},
+    {'service': 'backend'},
+    {'milestone': 'v1', 'assignee': '佐藤'},
+    {'kanban_status': '作業中'},
+    {'point_min': 2, 'search': 'login'},
+    {'created_after': '2024-05-01', 'created_before': '2024-07-31'},
+    {'completed_after': '2024-05-01'},
+    {'granularity': 'week'},
+])
+def test_batch_matches_individual_charts(api_client, params: Dict[str, Any]):
+    client, headers = api_client
+    response = client.post('/api/charts/batch', params=params, json={'periods': PERIODS}, headers=headers)
+    assert response.status_code == 200, response.text
+    periods = response.json()['periods']
+    assert [period.get('label') for period in periods] == [period.get('label') for period in PERIODS]
+    assert any(period['total_issues'] for period in periods)
+    
+    for period, batch in zip(PERIODS, periods):
+        query = {**params, 'start_date': period['start_date'], 'end_date': period['end_date']}
+        burn_down = client.get('/api/charts/burn-down', params=query, headers=headers).json()
+        burn_up = client.get('/api/charts/burn-up', params=query, headers=headers).json()
+        
+        assert batch['burn_down'] == burn_down['chart_data'], period
+        assert batch['burn_up'] == burn_up['chart_data'], period
+        assert batch['total_issues'] == burn_down['metadata']['total_issues']
+        assert batch['total_points'] == pytest.approx(burn_down['metadata']['total_points'])
+        assert batch['statistics']['burn_down'] == burn_down['statistics']
+        assert batch['statistics']['burn_up'] == burn_up['statistics']
+        warning_counts = {reason: count for reason, count in batch['warning_counts'].items() if count}
+        assert warning_counts == Counter(warning['reason'] for warning in burn_down['warnings'])
@@ -0,0 +1,82 @@
+from typing import Any, Dict, List
+import pytest
+
+PERIOD = {'start_date': '2024-04-01', 'end_date': '2024-06-30'}
+ROW_FIELDS = {
+    'date': 'dates',
+    'planned_points': 'planned',
+    'actual_points': 'actual',
+    'remaining_points': 'remaining',
+    'completed_points': 'completed',
+    'total_points': 'total',
+    'completed_issues': 'completed_issues',
+    'total_issues': 'total_issues',
+}
+
+
+def _to_rows(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    return [
+        {field: columns[column][index] for field, column in ROW_FIELDS.items()}
+        for index in range(len(columns['dates']))
+    ]
+
+
+def _get(client, headers, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    response = client.get(path, params={**PERIOD, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.parametrize('path', ['/api/charts/burn-down', '/api/charts/burn-up'])
+@pytest.mark.parametrize('params', [
+    {},
+    {'service': 'backend'},
+    {'group_by': 'service'},
+    {'max_points': 20},
+])
+def test_columnar_matches_rows(api_client, path, params):
+    client, headers = api_client
+    rows = _get(client, headers, path, params)
+    columnar = _get(client, headers, path, {**params, 'format': 'columnar'})
+    
+    assert rows['columns'] is None
+    assert columnar['chart_data'] == []
+    assert len(columnar['columns']['dates']) == len(rows['chart_data']) > 0
+    assert _to_rows(columnar['columns']) == rows['chart_data']
+    assert columnar['statistics'] == rows['statistics']
+    assert columnar['warnings'] == rows['warnings']
+    assert columnar['metadata'].pop('format') == 'columnar'
+    assert rows['metadata'].pop('format') == 'rows'
+    # 2回目は終了済み期間のスナップショットから返る（group_by指定時を除く）
+    for metadata in (rows['metadata'], columnar['metadata']):
+        metadata.pop('source', None)
+        metadata.pop('computed_at', None)
+    assert columnar['metadata'] == rows['metadata']
+    
+    if 'group_by' in params:
+        assert [group['key'] for group in columnar['groups']] == [group['key'] for group in rows['groups']]
+        for row_group, column_group in zip(rows['groups'], columnar['groups']):
+            assert column_group['chart_data'] == []
+            assert _to_rows(column_group['columns']) == row_group['chart_data']
+            assert column_group['statistics'] == row_group['statistics']
+
+
+def test_dashboard_columnar_matches_rows(api_client):
+    client, headers = api_client
+    rows = _get(client, headers, '/api/charts/dashboard', {})
+    columnar = _get(client, headers, '/api/charts/dashboard', {'format': 'columnar'})
+    
+    assert (rows['burn_down_columns'], rows['burn_up_columns']) == (None, None)
+    assert (columnar['burn_down'], columnar['burn_up']) == ([], [])
+    assert _to_rows(columnar['burn_down_columns']) == rows['burn_down']
+    assert _to_rows(columnar['burn_up_columns']) == rows['burn_up']
+    assert columnar['velocity'] == rows['velocity']
+    assert columnar['statistics'] == rows['statistics']
+
+
+def test_unknown_format_is_rejected(api_client):
+    client, headers = api_client
+    response = client.get('/api/charts/burn-down', params={**PERIOD, 'format': 'csv'}, headers=headers)
+    
+    assert response.status_code == 400
+    assert 'rows, columnar' in response.json()['detail']
@@ -0,0 +1,101 @@
+from urllib.parse import parse_qsl, urlsplit
+import pytest
+from app.services.chart_image_token import ChartImageTokenService, image_scope
+
+PARAMS = [('start_date', '2024-04-01'), ('end_date', '2024-06-30'), ('service', 'backend')]
+QUERY = 'start_date=2024-04-01&end_date=2024-06-30'
+
+
+def test_token_resolves_only_for_its_scope():
+    tokens = ChartImageTokenService(ttl_seconds=300, secret='secret')
+    scope = image_scope('burn_down', 'svg', PARAMS)
+    token, _ = tokens.issue('session-1', scope)
+    
+    assert tokens.resolve(token, scope) == 'session-1'
+    # パラメータの順序とtokenパラメータは対象画像に影響しない
+    assert tokens.resolve(token, image_scope('burn_down', 'svg', list(reversed(PARAMS)) + [('token', token)])) == 'session-1'
+    
+    assert tokens.resolve(token, image_scope('burn_up', 'svg', PARAMS)) is None
+    assert tokens.resolve(token, image_scope('burn_down', 'png', PARAMS)) is None
+    assert tokens.resolve(token, image_scope('burn_down', 'svg', PARAMS[:2])) is None
+    assert tokens.resolve(token, image_scope('burn_down', 'svg', PARAMS[:2] + [('service', 'frontend')])) is None
+
+
+def test_expired_token_is_rejected_and_purged():
+    tokens = ChartImageTokenService(ttl_seconds=-1, secret='secret')
+    scope = image_scope('burn_down', 'svg', PARAMS)
+    token, _ = tokens.issue('session-1', scope)
+    
+    assert tokens.resolve(token, scope) is None
+    
+    tokens.ttl = -tokens.ttl
+    tokens.issue('session-2', scope)
+    assert token.partition('.')[0] not in tokens._grants
+
+
+@pytest.mark.parametrize('tamper', [
+    lambda token: token[:-1] + ('A' if token[-1] != 'A' else 'B'),
+    lambda token: token.partition('.')[0] + '.',
+    lambda token: token.partition('.')[0],
+    lambda token: 'unknown' + token,
+    lambda token: '',
+])
+def test_tampered_token_is_rejected(tamper):
+    tokens = ChartImageTokenService(ttl_seconds=300, secret='secret')
+    scope = image_scope('burn_down', 'svg', PARAMS)
+    token, _ = tokens.issue('session-1', scope)
+    
+    assert tokens.resolve(tamper(token), scope) is None
+
+
+def test_token_is_not_valid_with_another_secret():
+    scope = image_scope('burn_down', 'svg', PARAMS)
+    tokens = ChartImageTokenService(ttl_seconds=300, secret='secret')
+    token, _ = tokens.issue('session-1', scope)
+    
+    other = ChartImageTokenService(ttl_seconds=300, secret='other')
+    other._grants = dict(tokens._grants)
+    assert other.resolve(token, scope) is None
+
+
+def test_image_etag_returns_not_modified(api_client):
+    client, headers = api_client
+    response = client.get(f'/api/charts/burn-down.svg?{QUERY}', headers=headers)
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('image/svg+xml')
+    etag = response.headers['etag']
+    
+    cached = client.get(f'/api/charts/burn-down.svg?{QUERY}', headers={**headers, 'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.headers['etag'] == etag
+    assert cached.content == b''
+    
+    stale = client.get(f'/api/charts/burn-down.svg?{QUERY}', headers={**headers, 'If-None-Match': '"stale"'})
+    assert stale.status_code == 200
+    assert stale.headers['etag'] == etag
+    
+    resized = client.get(f'/api/charts/burn-down.svg?{QUERY}&width=800', headers={**headers, 'If-None-Match': etag})
+    assert resized.status_code == 200
+    assert resized.headers['etag'] != etag
+    
+    other_chart = client.get(f'/api/charts/burn-up.svg?{QUERY}', headers={**headers, 'If-None-Match': etag})
+    assert other_chart.status_code == 200
+    assert other_chart.headers['etag'] != etag
+
+
+def test_image_token_url_is_limited_to_issued_image(api_client):
+    client, headers = api_client
+    issued = client.post(f'/api/charts/burn-up.png/token?{QUERY}', headers=headers)
+    assert issued.status_code == 200
+    url = issued.json()['url']
+    token = dict(parse_qsl(urlsplit(url).query))['token']
+    
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'image/png'
+    
+    assert client.get(f'{url}&service=backend').status_code == 401
+    assert client.get(f'/api/charts/burn-down.png?{QUERY}&token={token}').status_code == 401
+    assert client.get(f'/api/charts/burn-up.svg?{QUERY}&token={token}').status_code == 401
+    assert client.get(f'/api/charts/burn-up.png?{QUERY}').status_code == 401
+    assert client.post(f'/api/charts/burn-up.png/token?{QUERY}').status_code == 401
@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+import math
+import random
+from app.utils.chart_sampling import downsample_indices, resolve_granularity, select_granularity_indices
+
+
+def _reference_lttb(points, threshold):
+    """Largest-Triangle-Three-Bucketsの素朴な実装（(x, y)の点列、選択した点を返す）"""
+    if threshold >= len(points) or threshold < 3:
+        return list(points)
+    
+    sampled = [points[0]]
+    every = (len(points) - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        avg_start = int(math.floor((i + 1) * every)) + 1
+        avg_end = min(int(math.floor((i + 2) * every)) + 1, len(points))
+        avg_points = points[avg_start:avg_end] or [points[-1]]
+        avg_x = sum(x for x, _ in avg_points) / len(avg_points)
+        avg_y = sum(y for _, y in avg_points) / len(avg_points)
+        
+        range_start = int(math.floor(i * every)) + 1
+        range_end = int(math.floor((i + 1) * every)) + 1
+        ax, ay = points[a]
+        max_area = -1.0
+        next_a = range_start
+        for j in range(range_start, range_end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay)) * 0.5
+            if area > max_area:
+                max_area = area
+                next_a = j
+        sampled.append(points[next_a])
+        a = next_a
+    
+    sampled.append(points[-1])
+    return sampled
+
+
+def _random_walk(length, seed):
+    rnd = random.Random(seed)
+    values = [0.0]
+    for _ in range(length - 1):
+        values.append(values[-1] + rnd.choice([0.0, 0.0, 1.0, 2.0, 3.0, -1.0]))
+    return values
+
+
+def test_single_series_matches_reference_lttb():
+    for length, max_points in [(10, 3), (100, 20), (365, 60), (731, 100), (1000, 999)]:
+        series = _random_walk(length, seed=length)
+        indices = list(range(length))
+        
+        selected = downsample_indices(indices, [series], max_points)
+        
+        expected = [x for x, _ in _reference_lttb([(i, series[i]) for i in indices], max_points)]
+        assert selected == expected
+        assert len(selected) == max_points
+        assert selected[0] == 0 and selected[-1] == length - 1
+
+
+def test_sparse_candidate_indices_are_preserved_in_order():
+    series = _random_walk(400, seed=4)
+    indices = list(range(0, 400, 3)) + [399]
+    
+    selected = downsample_indices(indices, [series], 30)
+    
+    assert len(selected) == 30
+    assert selected == sorted(selected)
+    assert set(selected) <= set(indices)
+    assert selected[0] == indices[0] and selected[-1] == indices[-1]
+
+
+def test_no_downsampling_when_within_limit():
+    indices = list(range(10))
+    series = [float(i) for i in indices]
+    
+    assert downsample_indices(indices, [series], None) == indices
+    assert downsample_indices(indices, [series], 10) == indices
+    assert downsample_indices(indices, [series], 2) == indices
+
+
+def test_multiple_series_keep_change_points_of_any_series():
+    length = 200
+    flat = [10.0] * length
+    spike = [0.0] * length
+    spike[137] = 50.0
+    
+    selected = downsample_indices(list(range(length)), [flat, spike], 12)
+    
+    assert 137 in selected
+    assert downsample_indices(list(range(length)), [flat], 12) != selected
+
+
+def test_granularity_indices_match_brute_force():
+    start = date(2024, 1, 3)
+    date_range = [start + timedelta(days=i) for i in range(400)]
+    last = len(date_range) - 1
+    
+    weekly = select_granularity_indices(date_range, 'week')
+    assert weekly == [0] + [i for i in range(1, last) if date_range[i].weekday() == 6] + [last]
+    
+    monthly = select_granularity_indices(date_range, 'month')
+    assert monthly == [0] + [i for i in range(1, last) if date_range[i + 1].day == 1] + [last]
+    
+    assert select_granularity_indices(date_range, 'day') == list(range(len(date_range)))
+
+
+def test_resolve_granularity_auto_thresholds():
+    start = date(2024, 1, 1)
+    assert resolve_granularity(start, start + timedelta(days=91), 'auto') == 'day'
+    assert resolve_granularity(start, start + timedelta(days=92), 'auto') == 'week'
+    assert resolve_granularity(start, start + timedelta(days=730), 'auto') == 'week'
+    assert resolve_granularity(start, start + timedelta(days=731), 'auto') == 'month'
+    assert resolve_granularity(start, start + timedelta(days=731), 'day') == 'day'
@@ -0,0 +1,70 @@
+from datetime import date, datetime, timezone
+from typing import Any, Dict
+import pytest
+from app.services.chart_analyzer import ChartAnalyzer
+from app.services.chart_snapshot_store import ChartSnapshotStore
+
+PERIOD = {'start_date': '2024-04-01', 'end_date': '2024-06-30'}
+
+
+def _without_source(response: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = dict(response['metadata'])
+    metadata.pop('source')
+    metadata.pop('computed_at')
+    return {**response, 'metadata': metadata}
+
+
+@pytest.mark.parametrize('path', ['/api/charts/burn-down', '/api/charts/burn-up', '/api/charts/dashboard'])
+@pytest.mark.parametrize('params', [
+    {},
+    {'service': 'backend', 'kanban_status': '作業中'},
+    {'created_after': '2024-05-01', 'point_min': 2},
+])
+def test_snapshot_matches_live(api_client, path, params):
+    client, headers = api_client
+    live = client.get(path, params={**PERIOD, **params}, headers=headers).json()
+    assert live['metadata']['source'] == 'live'
+    
+    # 粒度・最大点数・形式はスナップショットの読み込み後に適用する
+    for view in [{}, {'granularity': 'week'}, {'max_points': 15}, {'format': 'columnar'}]:
+        query = {**PERIOD, **params, **view}
+        snapshot = client.get(path, params=query, headers=headers).json()
+        recomputed = client.get(path, params={**query, 'recompute': True}, headers=headers).json()
+        
+        assert snapshot['metadata']['source'] == 'snapshot'
+        assert recomputed['metadata']['source'] == 'live'
+        assert _without_source(snapshot) == _without_source(recomputed), view
+        if not view:
+            assert _without_source(snapshot) == _without_source(live)
+
+
+def test_snapshot_round_trip(tmp_path, make_issues):
+    issues = make_issues()
+    counters = ChartAnalyzer()._build_daily_counters(issues, date(2024, 4, 1), 91)
+    snapshot = {
+        'counters': counters,
+        'velocity': [
+            {'week_start': date(2024, 4, 1), 'week_end': date(2024, 4, 7), 'completed_points': 3.5, 'completed_issues': 2},
+            {'week_start': date(2024, 4, 8), 'week_end': date(2024, 4, 14), 'completed_points': 0.0, 'completed_issues': 0},
+        ],
+        'warnings': [{'reason': 'post-period', 'issue': {'id': 1, 'title': 'ログイン画面の修正'}}],
+        'created_at': datetime(2024, 7, 1, 12, tzinfo=timezone.utc)
+    }
+    store = ChartSnapshotStore(str(tmp_path))
+    key = store.make_key('project', date(2024, 4, 1), date(2024, 6, 30), {'service': 'backend', 'milestone': None})
+    
+    store.save(key, snapshot)
+    
+    assert store.load(key) == snapshot
+    assert list(tmp_path.iterdir()) == [tmp_path / f"{key}.npz"]
+    # 値がNoneのフィルタはキーに影響しない
+    assert key == store.make_key('project', date(2024, 4, 1), date(2024, 6, 30), {'service': 'backend'})
+    assert key != store.make_key('project', date(2024, 4, 1), date(2024, 6, 30), {'service': 'frontend'})
+
+
+def test_unreadable_snapshot_is_ignored(tmp_path):
+    store = ChartSnapshotStore(str(tmp_path))
+    (tmp_path / 'broken.npz').write_bytes(b'not a snapshot')
+    
+    assert store.load('broken') is None
+    assert store.load('missing') is None
@@ -0,0 +1,133 @@
+from datetime import datetime, timezone
+from typing import Dict, List
+import asyncio
+import random
+import pytest
+from app.models.issue import IssueModel
+from app.services.epic_rollup_service import EpicRollupService
+from app.services.issue_service import IssueService
+
+CREATED_AT = datetime(2024, 4, 1, tzinfo=timezone.utc)
+
+
+def _issue(issue_id: int, is_epic: bool = False, point: float = 1.0, completed: bool = False) -> IssueModel:
+    return IssueModel(
+        id=issue_id,
+        iid=issue_id,
+        title=f"issue {issue_id}",
+        description='',
+        state='closed' if completed else 'opened',
+        created_at=CREATED_AT,
+        updated_at=CREATED_AT,
+        labels=['epic'] if is_epic else [],
+        point=point,
+        is_epic=is_epic,
+        completed_at=CREATED_AT if completed else None
+    )
+
+
+def _reachable_leaves(adjacency: Dict[int, List[int]], issues_by_id: Dict[int, IssueModel]) -> Dict[int, frozenset]:
+    """エピックから子エピックを辿って到達できるすべての子issue（総当たり）"""
+    result = {}
+    for epic_id in adjacency:
+        seen = {epic_id}
+        pending = [epic_id]
+        leaves = set()
+        while pending:
+            for child_id in adjacency.get(pending.pop(), []):
+                if not issues_by_id[child_id].is_epic:
+                    leaves.add(child_id)
+                elif child_id not in seen:
+                    seen.add(child_id)
+                    pending.append(child_id)
+        result[epic_id] = frozenset(leaves)
+    return result
+
+
+@pytest.mark.parametrize('order', [[1, 2, 3, 4], [2, 1, 3, 4], [3, 4, 1, 2], [4, 3, 2, 1]])
+def test_two_epic_cycle_shares_leaves_from_both_ends(order):
+    # 1 ⇄ 2 の循環、3 → 1、4 → 2、2 → 5（循環外の子エピック）
+    issues = [_issue(epic_id, is_epic=True) for epic_id in (1, 2, 3, 4, 5)]
+    issues += [_issue(leaf_id) for leaf_id in (11, 12, 13, 14, 15)]
+    issues_by_id = {issue.id: issue for issue in issues}
+    edges = {1: [11, 2], 2: [12, 1, 5], 3: [13, 1], 4: [14, 2], 5: [15]}
+    adjacency = {epic_id: edges[epic_id] for epic_id in order}
+    adjacency[5] = edges[5]
+    
+    leaves = EpicRollupService.collect_leaves(adjacency, issues_by_id)
+    
+    cycle = frozenset({11, 12, 15})
+    assert leaves[1] == cycle
+    assert leaves[2] == cycle
+    assert leaves[3] == cycle | {13}
+    assert leaves[4] == cycle | {14}
+    assert leaves[5] == frozenset({15})
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_collect_leaves_matches_reachability(seed):
+    rnd = random.Random(seed)
+    epic_ids = list(range(1, 16))
+    leaf_ids = list(range(100, 140))
+    issues_by_id = {epic_id: _issue(epic_id, is_epic=True) for epic_id in epic_ids}
+    issues_by_id.update({leaf_id: _issue(leaf_id) for leaf_id in leaf_ids})
+    adjacency = {
+        epic_id: rnd.sample(leaf_ids, rnd.randint(0, 4)) + rnd.sample(epic_ids, rnd.randint(0, 3))
+        for epic_id in rnd.sample(epic_ids, len(epic_ids))
+    }
+    
+    assert EpicRollupService.collect_leaves(adjacency, issues_by_id) == _reachable_leaves(adjacency, issues_by_id)
+
+
+def test_deep_epic_chain_does_not_recurse():
+    depth = 5000
+    issues_by_id = {epic_id: _issue(epic_id, is_epic=True) for epic_id in range(depth)}
+    issues_by_id[-1] = _issue(-1)
+    adjacency = {epic_id: [epic_id + 1] for epic_id in range(depth - 1)}
+    adjacency[depth - 1] = [-1, 0]
+    
+    leaves = EpicRollupService.collect_leaves(adjacency, issues_by_id)
+    
+    assert set(leaves) == set(range(depth))
+    assert all(epic_leaves == frozenset({-1}) for epic_leaves in leaves.values())
+
+
+class FakeGitLabClient:
+    url = 'http://gitlab.example.com'
+    project_id = '42'
+    project = None
+    
+    def __init__(self, token: str):
+        self.token = token
+
+
+def test_link_cache_evicts_least_recently_used(monkeypatch):
+    fetched = []
+    
+    def fetch_issue_links(self, issue_iid):
+        fetched.append((self.client.token, issue_iid))
+        return []
+    
+    monkeypatch.setattr(IssueService, 'fetch_issue_links', fetch_issue_links)
+    service = EpicRollupService(max_projects=1, max_issues_per_project=2)
+    epics = [_issue(epic_id, is_epic=True) for epic_id in (1, 2, 3)]
+    client_a = FakeGitLabClient('a')
+    client_b = FakeGitLabClient('b')
+    
+    _, count = asyncio.run(service.get_links(client_a, epics[:2]))
+    assert count == 2
+    _, count = asyncio.run(service.get_links(client_a, epics[:2]))
+    assert count == 0
+    
+    # エピック数の上限を超えると最も古く使われたエピックから破棄
+    asyncio.run(service.get_links(client_a, [epics[2]]))
+    _, count = asyncio.run(service.get_links(client_a, [epics[1], epics[2]]))
+    assert count == 0
+    _, count = asyncio.run(service.get_links(client_a, [epics[0]]))
+    assert count == 1
+    
+    # プロジェクト数の上限を超えると別の認証情報のキャッシュは破棄
+    asyncio.run(service.get_links(client_b, [epics[0]]))
+    fetched.clear()
+    asyncio.run(service.get_links(client_a, [epics[0]]))
+    assert fetched == [('a', 1)]
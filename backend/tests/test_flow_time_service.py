@@ -0,0 +1,123 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+import pytest
+from app.models.issue import IssueModel
+from app.services.flow_time_service import FlowTimeAnalyzer
+
+JST = timezone(timedelta(hours=9))
+CREATED_AT = datetime(2024, 4, 1, 10, tzinfo=timezone.utc)
+
+
+def _issue(
+    issue_id: int,
+    created_at: datetime = CREATED_AT,
+    completed_at: Optional[datetime] = None,
+    service: Optional[str] = None
+) -> IssueModel:
+    return IssueModel(
+        id=issue_id,
+        iid=issue_id,
+        title=f"issue {issue_id}",
+        description='',
+        state='closed',
+        created_at=created_at,
+        completed_at=completed_at,
+        service=service
+    )
+
+
+@pytest.mark.parametrize('created_at, completed_at, expected', [
+    (datetime(2024, 4, 1, 10, tzinfo=timezone.utc), datetime(2024, 4, 1, 23, tzinfo=timezone.utc), 0.0),
+    (datetime(2024, 4, 1, 23, tzinfo=timezone.utc), datetime(2024, 4, 2, 1, tzinfo=timezone.utc), 1.0),
+    # JSTの日付ではなくUTCの日付で比較する（2024-04-01 14:00 UTC → 2024-04-02 16:00 UTC）
+    (datetime(2024, 4, 1, 23, tzinfo=JST), datetime(2024, 4, 3, 1, tzinfo=JST), 1.0),
+    # timezone-naiveはUTCとして扱う
+    (datetime(2024, 4, 1, 10), datetime(2024, 4, 11, 9, tzinfo=timezone.utc), 10.0),
+    (datetime(2024, 4, 5, tzinfo=timezone.utc), datetime(2024, 4, 1, tzinfo=timezone.utc), 0.0),
+    (datetime(2024, 4, 1, tzinfo=timezone.utc), None, None),
+])
+def test_lead_time_days(created_at, completed_at, expected):
+    assert FlowTimeAnalyzer.lead_time_days(_issue(1, created_at, completed_at)) == expected
+
+
+@pytest.mark.parametrize('transitions, expected', [
+    ([
+        (datetime(2024, 4, 1, 8, tzinfo=timezone.utc), '未着手'),
+        (datetime(2024, 4, 2, 12, tzinfo=timezone.utc), '作業中'),
+        (datetime(2024, 4, 3, tzinfo=timezone.utc), 'レビュー中'),
+        (datetime(2024, 4, 4, tzinfo=timezone.utc), '作業中'),
+        (datetime(2024, 4, 5, 18, tzinfo=timezone.utc), '完了'),
+        (datetime(2024, 4, 9, tzinfo=timezone.utc), '完了'),
+    ], 3.25),
+    # 最初の#作業中より前の#完了は対象外
+    ([
+        (datetime(2024, 4, 1, tzinfo=timezone.utc), '完了'),
+        (datetime(2024, 4, 2, tzinfo=timezone.utc), '作業中'),
+        (datetime(2024, 4, 2, 6, tzinfo=timezone.utc), None),
+        (datetime(2024, 4, 3, tzinfo=timezone.utc), '完了'),
+    ], 1.0),
+    ([(datetime(2024, 4, 2, tzinfo=timezone.utc), '作業中')], None),
+    ([(datetime(2024, 4, 2, tzinfo=timezone.utc), '完了')], None),
+    ([], None),
+])
+def test_cycle_time_days(transitions, expected):
+    assert FlowTimeAnalyzer.cycle_time_days(transitions) == expected
+
+
+def test_select_completed_by_utc_date():
+    issues = [
+        _issue(1, completed_at=datetime(2024, 4, 1, 8, tzinfo=JST)),
+        _issue(2, completed_at=datetime(2024, 4, 1, 9, tzinfo=JST)),
+        _issue(3, completed_at=datetime(2024, 4, 30, 23, tzinfo=timezone.utc)),
+        _issue(4, completed_at=datetime(2024, 5, 1, 8, tzinfo=JST)),
+        _issue(5, completed_at=datetime(2024, 5, 1, 9, tzinfo=JST)),
+        _issue(6),
+    ]
+    
+    selected = FlowTimeAnalyzer.select_completed(issues, date(2024, 4, 1), date(2024, 4, 30))
+    assert [issue.id for issue in selected] == [2, 3, 4]
+
+
+def test_analyze_percentiles_and_histogram():
+    # リードタイム1〜10日（1〜6日: backend、7〜9日: frontend、10日: service未設定）
+    services = ['backend'] * 6 + ['frontend'] * 3 + [None]
+    issues = [
+        _issue(days, completed_at=CREATED_AT + timedelta(days=days), service=service)
+        for days, service in zip(range(10, 0, -1), reversed(services))
+    ]
+    # サイクルタイムは3件のみ（遷移履歴のないissueは集計しない）
+    transitions = {
+        days: [(CREATED_AT, '作業中'), (CREATED_AT + timedelta(days=days, hours=12), '完了')]
+        for days in (2, 4, 9)
+    }
+    
+    result = FlowTimeAnalyzer().analyze(issues, transitions, bin_days=3, percentiles=[50, 85, 95, 100])
+    
+    lead_time = result['lead_time']['overall']
+    assert lead_time['count'] == 10
+    assert lead_time['mean_days'] == 5.5
+    assert (lead_time['min_days'], lead_time['max_days']) == (1.0, 10.0)
+    assert [p['days'] for p in lead_time['percentiles']] == [5.0, 9.0, 10.0, 10.0]
+    assert lead_time['histogram'] == [2, 3, 3, 2]
+    
+    by_service = result['lead_time']['by_service']
+    assert [group['key'] for group in by_service] == ['backend', 'frontend', None]
+    assert [group['count'] for group in by_service] == [6, 3, 1]
+    assert [p['days'] for p in by_service[0]['percentiles']] == [3.0, 6.0, 6.0, 6.0]
+    assert [p['days'] for p in by_service[1]['percentiles']] == [8.0, 9.0, 9.0, 9.0]
+    assert by_service[1]['histogram'] == [0, 0, 2, 1]
+    
+    cycle_time = result['cycle_time']['overall']
+    assert cycle_time['count'] == 3
+    assert [p['days'] for p in cycle_time['percentiles']] == [4.5, 9.5, 9.5, 9.5]
+    assert cycle_time['histogram'] == [1, 1, 0, 1]
+    assert [group['key'] for group in result['cycle_time']['by_service']] == ['backend', 'frontend']
+
+
+def test_summarize_without_values():
+    summary = FlowTimeAnalyzer.summarize('backend', [], 1, [50, 85])
+    
+    assert summary['count'] == 0
+    assert summary['mean_days'] is None
+    assert summary['percentiles'] == [{'percentile': 50, 'days': None}, {'percentile': 85, 'days': None}]
+    assert summary['histogram'] == []
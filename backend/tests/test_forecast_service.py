@@ -0,0 +1,117 @@
+from datetime import date, datetime, timedelta, timezone
+import math
+import numpy as np
+import pytest
+from app.models.issue import IssueModel
+from app.services.forecast_service import CompletionForecaster
+
+
+def _issue(issue_id: int, point: float, completed: date) -> IssueModel:
+    completed_at = datetime.combine(completed, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=12)
+    return IssueModel(
+        id=issue_id,
+        iid=issue_id,
+        title=f"issue {issue_id}",
+        description='',
+        state='closed',
+        created_at=completed_at - timedelta(days=3),
+        point=point,
+        completed_at=completed_at
+    )
+
+
+def _weekly_history(as_of: date, weeks: int, point: float):
+    """as_ofを末日とする週ごとに1件ずつ完了したissue"""
+    return [_issue(index + 1, point, as_of - timedelta(weeks=index, days=2)) for index in range(weeks)]
+
+
+def _naive_steps(rng: np.random.Generator, samples: np.ndarray, remaining: float, trials: int, max_steps: int) -> np.ndarray:
+    """1試行ずつ1ステップずつ抽出する素朴なシミュレーション"""
+    steps = np.full(trials, max_steps + 1, dtype=np.int64)
+    for trial in range(trials):
+        completed = 0.0
+        for step in range(1, max_steps + 1):
+            completed += rng.choice(samples)
+            if completed >= remaining:
+                steps[trial] = step
+                break
+    return steps
+
+
+def test_constant_throughput_gives_exact_completion_week():
+    forecaster = CompletionForecaster()
+    as_of = date(2024, 6, 30)
+    result = forecaster.forecast(
+        _weekly_history(as_of, 12, 5.0), 23.0, as_of, as_of + timedelta(weeks=5), unit='week', trials=500, seed=1
+    )
+    
+    assert result['history']['samples'] == 12
+    assert result['history']['mean_throughput'] == 5.0
+    for entry in result['percentiles']:
+        assert entry['steps'] == 5
+        assert entry['completion_date'] == as_of + timedelta(weeks=5)
+    assert result['probability_by_end_date'] == 1.0
+    
+    earlier = forecaster.forecast(
+        _weekly_history(as_of, 12, 5.0), 23.0, as_of, as_of + timedelta(weeks=4), unit='week', trials=500, seed=1
+    )
+    assert earlier['probability_by_end_date'] == 0.0
+
+
+def test_simulation_crosses_block_boundary_and_limit():
+    forecaster = CompletionForecaster()
+    samples = np.ones(10)
+    rng = np.random.default_rng(0)
+    
+    steps = forecaster._simulate(rng, samples, forecaster.BLOCK_STEPS * 2 + 5, 50, 1000)
+    assert (steps == forecaster.BLOCK_STEPS * 2 + 5).all()
+    
+    steps = forecaster._simulate(rng, samples, 1000.5, 50, 1000)
+    assert (steps == 1001).all()
+
+
+def test_vectorized_simulation_matches_naive_distribution():
+    forecaster = CompletionForecaster()
+    samples = np.array([0.0, 1.0, 2.0, 3.0, 5.0])
+    trials = 4000
+    
+    fast = forecaster._simulate(np.random.default_rng(7), samples, 60.0, trials, 200)
+    naive = _naive_steps(np.random.default_rng(8), samples, 60.0, trials, 200)
+    
+    assert fast.mean() == pytest.approx(naive.mean(), rel=0.02)
+    for p in (50, 85, 95):
+        assert abs(np.percentile(fast, p) - np.percentile(naive, p)) <= 1
+
+
+def test_percentiles_use_nearest_rank_of_simulated_steps():
+    forecaster = CompletionForecaster()
+    as_of = date(2024, 6, 30)
+    history = [
+        _issue(index + 1, float(index % 4), as_of - timedelta(weeks=index, days=1)) for index in range(12)
+    ]
+    trials = 999
+    result = forecaster.forecast(
+        history, 20.0, as_of, as_of + timedelta(weeks=8), unit='week', trials=trials, percentiles=[10, 50, 85, 95], seed=3
+    )
+    
+    samples, _ = forecaster._sample_throughput(history, as_of, 'week', 12)
+    steps = np.sort(forecaster._simulate(np.random.default_rng(3), samples, 20.0, trials, forecaster.MAX_STEPS['week']))
+    for entry in result['percentiles']:
+        expected = int(steps[math.ceil(entry['percentile'] / 100 * trials) - 1])
+        assert entry['steps'] == expected
+        assert entry['steps'] == int(np.percentile(steps, entry['percentile'], method='inverted_cdf'))
+        assert entry['completion_date'] == as_of + timedelta(weeks=expected)
+    assert result['probability_by_end_date'] == pytest.approx(float(np.mean(steps <= 8)))
+
+
+def test_no_history_or_no_remaining_points():
+    forecaster = CompletionForecaster()
+    as_of = date(2024, 6, 30)
+    
+    done = forecaster.forecast([], 0.0, as_of, as_of, unit='day', seed=1)
+    assert all(entry['completion_date'] == as_of for entry in done['percentiles'])
+    assert done['probability_by_end_date'] == 1.0
+    
+    unknown = forecaster.forecast([], 10.0, as_of, as_of, unit='day', seed=1)
+    assert all(entry['completion_date'] is None for entry in unknown['percentiles'])
+    assert unknown['probability_by_end_date'] == 0.0
@@ -0,0 +1,111 @@
+from datetime import date, datetime, timedelta, timezone
+import random
+import pytest
+from app.services.chart_analyzer import ChartAnalyzer
+from app.services.incremental_chart_service import IncrementalChartState, ProjectChartStates
+from app.services.issue_store import ProjectIssueStore
+from app.utils.issue_filters import apply_chart_filters
+
+START = date(2024, 4, 1)
+END = date(2024, 6, 30)
+
+
+def _mutate(rnd: random.Random, store: ProjectIssueStore, next_id: int) -> int:
+    """ストアのissueをランダムに追加・更新・削除"""
+    issues = store.get_issues(include_excluded=True)
+    action = rnd.random()
+    if action < 0.15 and issues:
+        store.remove(rnd.choice(issues).id)
+        return next_id
+    
+    issue = rnd.choice(issues)
+    if action < 0.3:
+        store.upsert(issue.model_copy(update={
+            'id': next_id,
+            'iid': next_id,
+            'created_at': datetime(2024, 5, 1, tzinfo=timezone.utc) + timedelta(days=rnd.randint(-60, 60))
+        }))
+        return next_id + 1
+    
+    update = {}
+    if rnd.random() < 0.5:
+        update['point'] = rnd.choice([None, 1.0, 2.0, 3.0, 8.0])
+    if rnd.random() < 0.5:
+        completed_at = datetime(2024, 5, 1, tzinfo=timezone.utc) + timedelta(days=rnd.randint(-45, 75))
+        update['completed_at'] = rnd.choice([None, completed_at])
+    if rnd.random() < 0.3:
+        update['kanban_status'] = rnd.choice(['作業中', '完了', 'テンプレート', '不要'])
+    if rnd.random() < 0.3:
+        update['service'] = rnd.choice(['backend', 'frontend'])
+    store.upsert(issue.model_copy(update=update))
+    return next_id
+
+
+def _assert_same_state(state: IncrementalChartState, expected: IncrementalChartState) -> None:
+    counters = state.counters()
+    expected_counters = expected.counters()
+    for key in ('created_points', 'completed_points'):
+        assert counters[key] == pytest.approx(expected_counters[key])
+    assert counters['completed_issues'] == expected_counters['completed_issues']
+    assert counters['total_points'] == pytest.approx(expected_counters['total_points'])
+    assert counters['total_issues'] == expected_counters['total_issues']
+    assert state.velocity() == pytest.approx(expected.velocity())
+    assert [(w['issue'].id, w['reason']) for w in state.warnings()] == \
+        [(w['issue'].id, w['reason']) for w in expected.warnings()]
+
+
+@pytest.mark.parametrize('filters', [{}, {'service': 'backend'}, {'milestone': 'v1', 'min_point': 2.0}])
+def test_suffix_delta_updates_match_full_rebuild(make_issues, filters):
+    store = ProjectIssueStore('test')
+    store.replace_all(make_issues(200, seed=11), datetime.now(timezone.utc))
+    states = ProjectChartStates()
+    store.add_listener(states)
+    state = states.get_state(store.get_issues(), START, END, filters)
+    
+    rnd = random.Random(5)
+    next_id = 5000
+    for step in range(120):
+        next_id = _mutate(rnd, store, next_id)
+        if step % 20 == 19:
+            rebuilt = IncrementalChartState(START, END, filters)
+            rebuilt.build(store.get_issues())
+            _assert_same_state(state, rebuilt)
+    
+    rebuilt = IncrementalChartState(START, END, filters)
+    rebuilt.build(store.get_issues())
+    _assert_same_state(state, rebuilt)
+
+
+def test_state_matches_chart_analyzer_baseline(make_issues):
+    store = ProjectIssueStore('test')
+    store.replace_all(make_issues(200, seed=12), datetime.now(timezone.utc))
+    issues = store.get_issues()
+    state = IncrementalChartState(START, END, {})
+    state.build(issues)
+    
+    analyzer = ChartAnalyzer()
+    included, warnings = apply_chart_filters(issues, START, END, {})
+    days = (END - START).days + 1
+    expected = analyzer._build_daily_counters(included, START, days)
+    
+    counters = state.counters()
+    for key in ('created_points', 'completed_points'):
+        assert counters[key] == pytest.approx(list(expected[key]))
+    assert counters['completed_issues'] == list(expected['completed_issues'])
+    assert counters['total_points'] == pytest.approx(expected['total_points'])
+    assert counters['total_issues'] == expected['total_issues']
+    assert state.velocity() == pytest.approx(analyzer.generate_velocity_data(included, weeks=state.weeks, end_date=END))
+    assert [(w['issue'].id, w['reason']) for w in state.warnings()] == \
+        [(w['issue'].id, w['reason']) for w in warnings]
+
+
+def test_states_are_evicted_least_recently_used(make_issues):
+    issues = make_issues(20, seed=13)
+    states = ProjectChartStates(max_states=2)
+    first = states.get_state(issues, START, END, {})
+    states.get_state(issues, START, END, {'service': 'backend'})
+    assert states.get_state(issues, START, END, {}) is first
+    
+    states.get_state(issues, START, END, {'service': 'infra'})
+    assert states.get_state(issues, START, END, {}) is first
+    assert len(states._states) == 2
@@ -0,0 +1,115 @@
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from app.services.issue_store import ProjectIssueStore
+from app.utils.issue_cursor import decode_cursor, encode_cursor, query_fingerprint
+from app.utils.issue_query import IssueQuery, execute_issue_query
+
+SCOPE = {'chart_start_date': date(2024, 4, 1), 'chart_end_date': date(2024, 6, 30)}
+
+
+@pytest.fixture
+def store(make_issues):
+    store = ProjectIssueStore('test')
+    issues = make_issues(200, seed=51)
+    # 作成日時が同じissue（スコープの日付補正でも同じ作成日時になるissueを含む）
+    issues = [
+        issue.model_copy(update={'created_at': datetime(2024, 3, 10, tzinfo=timezone.utc)}) if position % 4 == 0 else issue
+        for position, issue in enumerate(issues)
+    ]
+    store.replace_all(issues, datetime.now(timezone.utc))
+    return store
+
+
+def _walk(store, conditions, use_index=True, limit=100):
+    """next_cursorをたどって全ページのissue IDを取得"""
+    index = store.get_index() if use_index else None
+    query = IssueQuery(**conditions)
+    ids = []
+    for _ in range(limit):
+        result = execute_issue_query(store.get_issues(), query, index)
+        ids += [issue.id for issue in result.issues]
+        if result.next_cursor is None:
+            return ids
+        query = query.model_copy(update={'cursor': result.next_cursor})
+    raise AssertionError('cursor walk did not finish')
+
+
+def test_fingerprint_ignores_paging_only():
+    base = IssueQuery(service='backend', sort_by='point', sort_order='desc', page=1, per_page=20)
+    assert query_fingerprint(base) == query_fingerprint(base.model_copy(update={'page': 3, 'per_page': 50, 'cursor': 'x'}))
+    assert query_fingerprint(base) != query_fingerprint(base.model_copy(update={'service': 'frontend'}))
+    assert query_fingerprint(base) != query_fingerprint(base.model_copy(update={'search': 'login'}))
+
+
+def test_cursor_round_trip_and_validation():
+    query = IssueQuery(service='backend', sort_by='completed_at', sort_order='asc', per_page=20)
+    position = (datetime(2024, 5, 1, 12, tzinfo=timezone.utc), -1714000000.0, -1001)
+    token = encode_cursor(query, position, 7)
+    
+    cursor = decode_cursor(token, query.model_copy(update={'page': 2}))
+    assert cursor.position == position
+    assert cursor.version == 7
+    assert cursor.fingerprint == query_fingerprint(query)
+    
+    for changed in (
+        query.model_copy(update={'service': 'frontend'}),
+        query.model_copy(update={'sort_order': 'desc'}),
+        query.model_copy(update={'sort_by': 'point'})
+    ):
+        with pytest.raises(ValueError):
+            decode_cursor(token, changed)
+    for broken in ('', 'not-base64!', token[:-4], 'eyJmb28iOjF9'):
+        with pytest.raises(ValueError):
+            decode_cursor(broken, query)
+    with pytest.raises(ValueError):
+        decode_cursor(token, query.model_copy(update={'sort_by': 'relevance'}))
+
+
+@pytest.mark.parametrize('sort_by', ['created_at', 'point', 'title', 'completed_at', 'due_date'])
+@pytest.mark.parametrize('sort_order', ['desc', 'asc'])
+@pytest.mark.parametrize('scope', [{}, SCOPE])
+def test_cursor_walk_matches_full_sort(store, sort_by, sort_order, scope):
+    conditions = {'state': 'all', 'sort_by': sort_by, 'sort_order': sort_order, **scope}
+    expected = [issue.id for issue in execute_issue_query(store.get_issues(), IssueQuery(**conditions)).matched]
+    
+    paged = {**conditions, 'page': 1, 'per_page': 13}
+    assert _walk(store, paged) == expected
+    assert _walk(store, paged, use_index=False) == expected
+
+
+def test_version_change_is_reported_without_duplicates(store):
+    index = store.get_index()
+    query = IssueQuery(state='all', sort_by='point', sort_order='desc', page=1, per_page=10)
+    first = execute_issue_query(store.get_issues(), query, index)
+    assert first.data_changed is False
+    seen = [issue.id for issue in first.issues]
+    
+    # 取得済みのissueの更新と新しいissueの追加
+    changed = store.get_issue(seen[0]).model_copy(update={'point': 0.5})
+    store.upsert(changed)
+    added = changed.model_copy(update={
+        'id': 99999,
+        'iid': 99999,
+        'point': 1.0,
+        'created_at': datetime(2024, 5, 1, tzinfo=timezone.utc) + timedelta(hours=1)
+    })
+    store.upsert(added)
+    
+    query = query.model_copy(update={'cursor': first.next_cursor})
+    unchanged = set(seen) - {changed.id}
+    resumed = True
+    while True:
+        result = execute_issue_query(store.get_issues(), query, index)
+        # 変更後に発行されたカーソルの続きは変更なし
+        assert result.data_changed is resumed
+        resumed = False
+        page_ids = [issue.id for issue in result.issues]
+        assert not unchanged & set(page_ids)
+        seen += page_ids
+        if result.next_cursor is None:
+            break
+        query = query.model_copy(update={'cursor': result.next_cursor})
+    
+    stored = {issue.id for issue in execute_issue_query(store.get_issues(), IssueQuery(state='all')).matched}
+    assert stored <= set(seen)
+    assert added.id in seen
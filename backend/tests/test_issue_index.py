@@ -0,0 +1,144 @@
+from datetime import date, datetime, timedelta, timezone
+import itertools
+import random
+import pytest
+from app.services.issue_index import INDEXED_FIELDS
+from app.services.issue_store import ProjectIssueStore
+from app.utils.issue_filters import apply_date_correction, apply_scope_filters
+
+JST = timezone(timedelta(hours=9))
+
+RANGES = [
+    (None, None),
+    (date(2024, 4, 1), None),
+    (None, date(2024, 5, 15)),
+    (date(2024, 4, 10), date(2024, 6, 20)),
+    (date(2024, 5, 1), date(2024, 5, 1)),
+    (date(2024, 9, 1), date(2024, 8, 1))
+]
+
+
+def _utc_date(value: datetime) -> date:
+    return value.astimezone(timezone.utc).date()
+
+
+def _jst_issues(issues):
+    """一部のissueの日時をJST表記にする（同じ時刻、UTCの日付が変わる時間帯を含む）"""
+    converted = []
+    for position, issue in enumerate(issues):
+        if position % 3 == 0:
+            update = {'created_at': issue.created_at.astimezone(JST)}
+            if issue.completed_at:
+                update['completed_at'] = issue.completed_at.astimezone(JST)
+            issue = issue.model_copy(update=update)
+        converted.append(issue)
+    return converted
+
+
+@pytest.fixture
+def store(make_issues):
+    store = ProjectIssueStore('test')
+    store.replace_all(_jst_issues(make_issues(300, seed=21)), datetime.now(timezone.utc))
+    return store
+
+
+def _mutate(store: ProjectIssueStore, seed: int) -> None:
+    rnd = random.Random(seed)
+    for step in range(60):
+        issues = store.get_issues(include_excluded=True)
+        issue = rnd.choice(issues)
+        if step % 7 == 0:
+            store.remove(issue.id)
+            continue
+        hours = rnd.randint(-24 * 40, 24 * 40)
+        completed_at = datetime(2024, 5, 1, 20, tzinfo=timezone.utc) + timedelta(hours=hours)
+        store.upsert(issue.model_copy(update={
+            'milestone': rnd.choice(['v1', 'v2', None]),
+            'assignee': rnd.choice(['佐藤', 'Suzuki', None]),
+            'state': rnd.choice(['opened', 'closed']),
+            'completed_at': rnd.choice([None, completed_at, completed_at.astimezone(JST)])
+        }))
+
+
+def _brute_select(issues, conditions):
+    return {
+        issue.id for issue in issues
+        if all(getattr(issue, field) == value for field, value in conditions.items())
+    }
+
+
+def _effective_day(issue, start_date):
+    return _utc_date(apply_date_correction(issue, start_date).created_at)
+
+
+def _in_range(day, low, high):
+    return (low is None or low <= day) and (high is None or day <= high)
+
+
+def _check_postings(store):
+    index = store.get_index()
+    issues = store.get_issues()
+    assert index.select({}) is None
+    for field in INDEXED_FIELDS:
+        for value in {getattr(issue, field) for issue in issues if getattr(issue, field)}:
+            assert index.select({field: value}) == _brute_select(issues, {field: value})
+    for milestone, assignee, state in itertools.product(['v1', 'v2'], ['佐藤', 'Suzuki'], ['opened', 'closed']):
+        conditions = {'milestone': milestone, 'assignee': assignee, 'state': state}
+        assert index.select(conditions) == _brute_select(issues, conditions)
+    assert index.select({'milestone': 'no-such-milestone'}) == set()
+
+
+def _check_day_bisects(store):
+    index = store.get_index()
+    issues = store.get_issues()
+    for low, high in RANGES:
+        for start_date in (None, date(2024, 4, 15)):
+            assert index.select_created(low, high, start_date) == {
+                issue.id for issue in issues if _in_range(_effective_day(issue, start_date), low, high)
+            }
+        assert index.select_completed(low, high) == {
+            issue.id for issue in issues
+            if issue.completed_at and _in_range(_utc_date(issue.completed_at), low, high)
+        }
+        assert index.select_completed(low, high, include_incomplete=True) == {
+            issue.id for issue in issues
+            if not issue.completed_at or _in_range(_utc_date(issue.completed_at), low, high)
+        }
+
+
+def _check_scope(store):
+    index = store.get_index()
+    issues = store.get_issues()
+    for start_date, end_date in [(date(2024, 4, 1), date(2024, 6, 30)), (date(2024, 5, 10), date(2024, 5, 20))]:
+        indexed, indexed_warnings = apply_scope_filters(issues, start_date, end_date, index)
+        scanned, scanned_warnings = apply_scope_filters(issues, start_date, end_date)
+        assert [issue.id for issue in indexed] == [issue.id for issue in scanned]
+        assert [(w['issue'].id, w['reason']) for w in indexed_warnings] == \
+            [(w['issue'].id, w['reason']) for w in scanned_warnings]
+    assert index.scope_violations(date(2024, 6, 1), date(2024, 5, 1)) is None
+
+
+def test_postings_match_brute_force(store):
+    _check_postings(store)
+    _mutate(store, seed=1)
+    _check_postings(store)
+
+
+def test_day_bisects_match_brute_force(store):
+    _check_day_bisects(store)
+    _mutate(store, seed=2)
+    _check_day_bisects(store)
+
+
+def test_scope_violations_match_scope_scan(store):
+    _check_scope(store)
+    _mutate(store, seed=3)
+    _check_scope(store)
+
+
+def test_full_refresh_rebuilds_index(store, make_issues):
+    index = store.get_index()
+    store.replace_all(make_issues(50, seed=22), datetime.now(timezone.utc))
+    assert store.get_index() is index
+    _check_postings(store)
+    _check_day_bisects(store)
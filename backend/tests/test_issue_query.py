@@ -0,0 +1,171 @@
+from datetime import date, datetime, timedelta, timezone
+import random
+import pytest
+from app.services.issue_index import PRESORTED_KEYS
+from app.services.issue_store import ProjectIssueStore
+from app.utils.issue_query import IssueQuery, execute_issue_query
+from app.utils.shared_filters import SORT_KEYS, sort_issues, sort_position, top_issues
+
+SORT_ORDERS = ['desc', 'asc']
+
+
+def _with_ties(issues):
+    """ソートキーの値が重複するissue（同じ作成日時・ポイント・タイトルの大文字小文字違い）"""
+    tied = []
+    for position, issue in enumerate(issues):
+        update = {}
+        if position % 5 == 0:
+            update['created_at'] = datetime(2024, 5, 1, 9, tzinfo=timezone.utc)
+        if position % 7 == 0:
+            update['title'] = 'Same Title' if position % 2 else 'same title'
+        if position % 11 == 0:
+            update['updated_at'] = None
+        tied.append(issue.model_copy(update=update))
+    return tied
+
+
+@pytest.fixture
+def store(make_issues):
+    store = ProjectIssueStore('test')
+    store.replace_all(_with_ties(make_issues(250, seed=41)), datetime.now(timezone.utc))
+    return store
+
+
+def _ids(issues):
+    return [issue.id for issue in issues]
+
+
+@pytest.mark.parametrize('sort_by', list(SORT_KEYS))
+@pytest.mark.parametrize('sort_order', SORT_ORDERS)
+def test_top_issues_matches_sorted_prefix(store, sort_by, sort_order):
+    issues = store.get_issues()
+    expected = sort_issues(issues, sort_by, sort_order)
+    for limit in (1, 7, 50, len(issues) - 1, len(issues), len(issues) + 5):
+        assert _ids(top_issues(issues, sort_by, sort_order, limit)) == _ids(expected[:limit])
+
+
+@pytest.mark.parametrize('sort_by', PRESORTED_KEYS)
+@pytest.mark.parametrize('sort_order', SORT_ORDERS)
+def test_presorted_orders_match_sorted_after_changes(store, sort_by, sort_order):
+    index = store.get_index()
+    assert list(index.ordered_ids(sort_by, sort_order)) == _ids(sort_issues(store.get_issues(), sort_by, sort_order))
+    
+    rnd = random.Random(7)
+    for step in range(40):
+        issue = rnd.choice(store.get_issues())
+        if step % 6 == 0:
+            store.remove(issue.id)
+        else:
+            completed_at = datetime(2024, 6, 1, tzinfo=timezone.utc) + timedelta(days=rnd.randint(-30, 30))
+            store.upsert(issue.model_copy(update={
+                'point': rnd.choice([None, 1.0, 3.0]),
+                'title': rnd.choice(['Alpha', 'alpha', 'Beta']),
+                'state': rnd.choice(['opened', 'closed']),
+                'completed_at': rnd.choice([None, completed_at])
+            }))
+    
+    expected = sort_issues(store.get_issues(), sort_by, sort_order)
+    assert list(index.ordered_ids(sort_by, sort_order)) == _ids(expected)
+    
+    # 途中のソート位置から再開
+    descending = sort_order == 'desc'
+    for middle in (0, 17, len(expected) - 1):
+        after = sort_position(expected[middle], sort_by, descending)
+        assert list(index.ordered_ids(sort_by, sort_order, after)) == _ids(expected[middle + 1:])
+
+
+@pytest.mark.parametrize('sort_by', ['created_at', 'updated_at', 'point', 'title', 'completed_at', 'due_date'])
+@pytest.mark.parametrize('sort_order', SORT_ORDERS)
+@pytest.mark.parametrize('scope', [{}, {'chart_start_date': date(2024, 4, 1), 'chart_end_date': date(2024, 6, 30)}])
+def test_paged_query_matches_full_sort(store, sort_by, sort_order, scope):
+    index = store.get_index()
+    issues = store.get_issues()
+    conditions = {'state': 'all', 'service': 'backend', **scope}
+    full = execute_issue_query(issues, IssueQuery(**conditions, sort_by=sort_by, sort_order=sort_order))
+    expected = _ids(full.matched)
+    
+    per_page = 9
+    pages = (len(expected) + per_page - 1) // per_page
+    for page in range(1, pages + 2):
+        query = IssueQuery(**conditions, sort_by=sort_by, sort_order=sort_order, page=page, per_page=per_page)
+        for result in (execute_issue_query(issues, query), execute_issue_query(issues, query, index)):
+            assert _ids(result.issues) == expected[(page - 1) * per_page:page * per_page]
+            assert result.total_count == len(expected)
+            assert result.total_pages == pages
+
+
+def _corrected(issues):
+    """ID・日付補正後の作成日時・完了日時・ポイント（順序を含めて比較する）"""
+    return [(issue.id, issue.created_at, issue.completed_at, issue.point) for issue in issues]
+
+
+def _warning_reasons(warnings):
+    return sorted((warning['issue'].id, warning['reason']) for warning in warnings)
+
+
+CHART_FILTERS = [
+    {},
+    {'service': 'backend', 'kanban_status': '作業中'},
+    {'min_point': 2, 'max_point': 5, 'state': 'opened'},
+    {'milestone': 'v1', 'assignee': '佐藤', 'is_epic': 'normal'},
+    {'search': 'login', 'created_after': date(2024, 4, 20), 'created_before': date(2024, 6, 10)},
+    {'completed_after': date(2024, 5, 1), 'completed_before': date(2024, 6, 15)},
+]
+
+
+@pytest.mark.parametrize('filters', CHART_FILTERS)
+@pytest.mark.parametrize('start_date, end_date', [
+    (date(2024, 4, 1), date(2024, 6, 30)),
+    (date(2024, 5, 15), date(2024, 8, 15)),
+])
+def test_chart_filters_match_legacy_pipeline(make_issues, filters, start_date, end_date):
+    from app.utils.issue_filters import apply_chart_filters, apply_scope_filters, apply_unified_filters
+    from app.utils.shared_filters import apply_advanced_filters
+    issues = make_issues(250, seed=42)
+    
+    matched, warnings = apply_chart_filters(issues, start_date, end_date, filters)
+    
+    # 従来のチャートのパイプライン（統一フィルタ → スコープフィルタ → 追加フィルタ）
+    legacy = apply_unified_filters(issues, start_date)
+    legacy, legacy_warnings = apply_scope_filters(legacy, start_date, end_date)
+    legacy = apply_advanced_filters(legacy, **filters)
+    assert _corrected(matched) == _corrected(legacy)
+    assert _warning_reasons(warnings) == _warning_reasons(legacy_warnings)
+
+
+# 従来のIssue一覧のソートキー
+LEGACY_SORT_KEYS = {
+    'created_at': lambda issue: issue.created_at,
+    'updated_at': lambda issue: issue.updated_at or issue.created_at,
+    'point': lambda issue: issue.point or 0,
+    'title': lambda issue: issue.title.lower(),
+    'state': lambda issue: issue.state,
+}
+
+
+@pytest.mark.parametrize('filters', CHART_FILTERS[:4] + [{'search': 'ﾃｽﾄ', 'state': 'closed'}])
+@pytest.mark.parametrize('sort_by', list(LEGACY_SORT_KEYS))
+@pytest.mark.parametrize('scope', [{}, {'chart_start_date': date(2024, 4, 1), 'chart_end_date': date(2024, 6, 30)}])
+def test_issue_list_query_matches_legacy_list(make_issues, filters, sort_by, scope):
+    from app.utils.filter_plan import compile_filter_plan
+    from app.utils.issue_filters import apply_scope_filters, apply_unified_filters
+    issues = make_issues(250, seed=43)
+    
+    result = execute_issue_query(issues, IssueQuery(
+        **filters, **scope, sort_by=sort_by, sort_order='desc', page=2, per_page=20
+    ))
+    
+    # 従来のIssue一覧（期間指定時はスコープフィルタ、それ以外は統一フィルタ → 追加フィルタ → ソート）
+    if scope:
+        legacy, legacy_warnings = apply_scope_filters(issues, scope['chart_start_date'], scope['chart_end_date'])
+    else:
+        legacy, legacy_warnings = apply_unified_filters(issues), []
+    legacy = compile_filter_plan(**filters).apply(legacy)
+    legacy = sorted(legacy, key=LEGACY_SORT_KEYS[sort_by], reverse=True)
+    
+    assert sorted(_ids(result.matched)) == sorted(_ids(legacy))
+    assert result.total_count == len(legacy)
+    assert _warning_reasons(result.warnings) == _warning_reasons(legacy_warnings)
+    # 同じ値の並びは作成日時の降順に統一したため、ページ内のソートキーの値で比較
+    sort_key = LEGACY_SORT_KEYS[sort_by]
+    assert [sort_key(issue) for issue in result.issues] == [sort_key(issue) for issue in legacy[20:40]]
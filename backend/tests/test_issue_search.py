@@ -0,0 +1,72 @@
+from typing import Any, Dict, List, Set
+import unicodedata
+import pytest
+
+PER_PAGE = 1000
+
+
+def _fold(text: str) -> str:
+    """NFKC・小文字化・カタカナのひらがな化（期待値の算出用）"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    return ''.join(chr(ord(char) - 0x60) if 'ァ' <= char <= 'ヶ' else char for char in text)
+
+
+def _expected_ids(issues: List[Dict[str, Any]], search: str) -> Set[int]:
+    """空白区切りのすべての語をタイトルまたは説明文に含むissue"""
+    terms = _fold(search).split()
+    return {
+        issue['id'] for issue in issues
+        if all(term in _fold(issue['title']) or term in _fold(issue['description']) for term in terms)
+    }
+
+
+def _list_issues(client, headers, search: str = None) -> List[Dict[str, Any]]:
+    params = {'per_page': PER_PAGE}
+    if search is not None:
+        params['search'] = search
+    response = client.get('/api/issues/', params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()['issues']
+
+
+def _search_ids(client, headers, query: str) -> Set[int]:
+    response = client.post('/api/issues/search', json={'query': query, 'per_page': PER_PAGE}, headers=headers)
+    assert response.status_code == 200, response.text
+    return {issue['id'] for issue in response.json()['issues']}
+
+
+@pytest.mark.parametrize('search', [
+    # 語の順序・クエリ全体の部分一致に関わらず、すべての語を含むissue
+    'login bug',
+    'bug fix',
+    'BUG   Login',
+    'login timeout',
+    'review 説明',
+    # 全角・半角、カタカナ・ひらがなは同一視
+    'ﾃｽﾄ',
+    'てすと',
+    'ｶﾅ ﾃｽﾄ',
+    'ＡＰＩ エラー',
+    'ろぐいん 修正',
+    'login zzz',
+])
+def test_multi_term_and_kana_folding(api_client, search):
+    client, headers = api_client
+    all_issues = _list_issues(client, headers)
+    expected = _expected_ids(all_issues, search)
+    assert expected or search == 'login zzz'
+    
+    assert {issue['id'] for issue in _list_issues(client, headers, search)} == expected
+    assert _search_ids(client, headers, search) == expected
+
+
+def test_folded_queries_match_the_same_issues(api_client):
+    client, headers = api_client
+    katakana = {issue['id'] for issue in _list_issues(client, headers, 'テスト')}
+    
+    assert katakana
+    assert {issue['id'] for issue in _list_issues(client, headers, 'ﾃｽﾄ')} == katakana
+    assert {issue['id'] for issue in _list_issues(client, headers, 'てすと')} == katakana
+    # 1語のクエリ全体の部分一致ではなく、語ごとの一致
+    assert 'bug fix' not in ' '.join(issue['title'].lower() for issue in _list_issues(client, headers))
+    assert _search_ids(client, headers, 'bug fix') == _search_ids(client, headers, 'fix bug') != set()
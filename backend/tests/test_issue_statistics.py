@@ -0,0 +1,57 @@
+from typing import Any, Dict, List, Optional
+import pytest
+from fastapi.encoders import jsonable_encoder
+from app.models.issue import IssueModel
+from app.services.issue_service import IssueService
+from app.utils.issue_filters import apply_exclusion_filter
+
+
+def _baseline_statistics_issues(
+    issues: List[IssueModel],
+    milestone: Optional[str] = None,
+    assignee: Optional[str] = None,
+    service: Optional[str] = None,
+    quarter: Optional[str] = None,
+    kanban_status: Optional[str] = None
+) -> List[IssueModel]:
+    """従来の集計対象（GitLab APIのmilestone・assignee・labels指定で全状態を取得し、除外ルールを適用）"""
+    labels = []
+    if service:
+        labels.append(f"s:{service}")
+    if quarter:
+        labels.append(f"@{quarter}")
+    if kanban_status:
+        labels.append(f"#{kanban_status}")
+    selected = [
+        issue for issue in issues
+        if (milestone is None or issue.milestone == milestone)
+        and (assignee is None or issue.assignee == assignee)
+        and set(labels) <= set(issue.labels)
+    ]
+    return apply_exclusion_filter(selected)
+
+
+@pytest.mark.parametrize('params, extra', [
+    ({}, {}),
+    ({'milestone': 'v1'}, {}),
+    ({'assignee': '佐藤'}, {}),
+    ({'service': 'backend', 'quarter': 'FY24Q2'}, {}),
+    ({'kanban_status': '作業中'}, {}),
+    ({'milestone': 'v2', 'service': 'frontend', 'kanban_status': '完了'}, {}),
+    # state・スコープ・ポイント・検索語・ページは統計情報に影響しない
+    ({'service': 'infra'}, {'state': 'opened', 'min_point': 2, 'search': 'login', 'page': 2, 'per_page': 5}),
+    ({'milestone': 'v1'}, {'chart_start_date': '2024-04-01', 'chart_end_date': '2024-06-30', 'is_epic': 'normal'}),
+    ({'kanban_status': 'テンプレート'}, {}),
+])
+def test_statistics_match_baseline_label_filtering(api_client, make_issues, params: Dict[str, Any], extra: Dict[str, Any]):
+    client, headers = api_client
+    response = client.get('/api/issues/', params={**params, **extra}, headers=headers)
+    assert response.status_code == 200
+    
+    expected = jsonable_encoder(
+        IssueService().generate_statistics(_baseline_statistics_issues(make_issues(), **params))
+    )
+    statistics = response.json()['statistics']
+    assert statistics['total_points'] == pytest.approx(expected.pop('total_points'))
+    statistics.pop('total_points')
+    assert statistics == expected
@@ -0,0 +1,174 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+import asyncio
+import pytest
+from app.models.issue import IssueModel
+from app.services.issue_analyzer import issue_analyzer
+from app.services.issue_service import IssueService
+from app.services.label_event_service import LabelEvent, LabelEventService
+
+PAGE_SIZE = 2
+
+
+def _at(day: int, hour: int = 0) -> datetime:
+    return datetime(2024, 4, day, hour, tzinfo=timezone.utc)
+
+
+def _issue(issue_id: int, labels: List[str], created_at: datetime, updated_at: datetime) -> IssueModel:
+    return issue_analyzer.analyze_issue(IssueModel(
+        id=issue_id,
+        iid=issue_id,
+        title=f"issue {issue_id}",
+        description='',
+        state='opened',
+        created_at=created_at,
+        updated_at=updated_at,
+        labels=labels
+    ))
+
+
+class FakeGitLabClient:
+    url = 'http://gitlab.example.com'
+    project_id = '42'
+    project = None
+    token = 'token'
+
+
+@pytest.fixture
+def server_events(monkeypatch):
+    """GitLab側のissue IID別ラベルイベントと、取得時の (IID, known_count) の記録"""
+    events: Dict[int, List[LabelEvent]] = {}
+    calls = []
+    
+    def fetch_label_events(self, issue_iid, known_count=0):
+        calls.append((issue_iid, known_count))
+        # 取得済みの件数を含むページから返す（ページ内の取得済みイベントも重複して返る）
+        return list(events.get(issue_iid, [])[known_count // PAGE_SIZE * PAGE_SIZE:])
+    
+    monkeypatch.setattr(IssueService, 'fetch_label_events', fetch_label_events)
+    return events, calls
+
+
+def test_updated_issue_fetches_only_after_known_events(server_events):
+    events, calls = server_events
+    events[1] = [
+        (101, _at(2), 'add', '#作業中'),
+        (102, _at(3), 'add', 's:backend'),
+        (103, _at(4), 'remove', '#作業中'),
+    ]
+    service = LabelEventService()
+    gitlab_client = FakeGitLabClient()
+    issue = _issue(1, ['s:backend'], _at(1), _at(4))
+    
+    label_events, fetched = asyncio.run(service.get_label_events(gitlab_client, [issue]))
+    assert fetched == 1
+    assert calls == [(1, 0)]
+    assert label_events[1] == events[1]
+    
+    # 更新日時が変わらなければ取得しない
+    label_events, fetched = asyncio.run(service.get_label_events(gitlab_client, [issue]))
+    assert fetched == 0
+    assert calls == [(1, 0)]
+    assert label_events[1] == events[1]
+    
+    # 更新されたissueは取得済みの件数以降のみ取得し、イベントIDでマージする
+    events[1] = events[1] + [
+        (104, _at(6), 'add', '#完了'),
+        (105, _at(5), 'add', '#レビュー中'),
+    ]
+    updated = issue.model_copy(update={'updated_at': _at(6)})
+    label_events, fetched = asyncio.run(service.get_label_events(gitlab_client, [updated]))
+    assert fetched == 1
+    assert calls == [(1, 0), (1, 3)]
+    assert label_events[1] == sorted(events[1], key=lambda event: (event[1], event[0]))
+
+
+def test_issues_as_of_reconstructs_only_changed_issues(server_events):
+    events, calls = server_events
+    events[2] = [
+        (201, _at(5), 'add', '#作業中'),
+        (202, _at(20), 'remove', '#作業中'),
+        (203, _at(20), 'add', '#完了'),
+    ]
+    unchanged = _issue(1, ['#作業中', 's:frontend'], _at(1), _at(3))
+    changed = _issue(2, ['#完了', 's:backend'], _at(1), _at(20))
+    created_later = _issue(3, ['#未着手'], _at(11), _at(11))
+    
+    issues, fetched = asyncio.run(LabelEventService().get_issues_as_of(
+        FakeGitLabClient(), [unchanged, changed, created_later], date(2024, 4, 10)
+    ))
+    
+    assert fetched == 1
+    assert calls == [(2, 0)]
+    assert [issue.id for issue in issues] == [1, 2]
+    assert issues[0] is unchanged
+    assert issues[1].labels == ['s:backend', '#作業中']
+    assert issues[1].kanban_status == '作業中'
+    assert issues[1].service == 'backend'
+
+
+RECONSTRUCT_EVENTS = [
+    (1, _at(2), 'remove', 'p:1'),
+    (2, _at(2), 'add', 'p:3'),
+    (3, _at(3), 'add', '#作業中'),
+    (4, _at(4), 'remove', '#作業中'),
+    (5, _at(4), 'add', '#完了'),
+    (6, _at(5), 'remove', None),
+]
+
+
+@pytest.mark.parametrize('as_of, expected', [
+    (_at(1), ['s:backend', 'p:1']),
+    (_at(2), ['s:backend', 'p:3']),
+    (_at(3, 12), ['s:backend', 'p:3', '#作業中']),
+    (_at(4), ['s:backend', 'p:3', '#完了']),
+    (_at(30), ['s:backend', 'p:3', '#完了']),
+])
+def test_reconstruct_labels(as_of, expected):
+    issue = _issue(1, ['#完了', 's:backend', 'p:3'], _at(1), _at(5))
+    
+    assert LabelEventService.reconstruct_labels(issue, RECONSTRUCT_EVENTS, as_of) == expected
+
+
+STATUS_EVENTS = [
+    (1, _at(2), 'add', '#作業中'),
+    (2, _at(2), 'remove', '#未着手'),
+    (3, _at(2, 1), 'add', 's:backend'),
+    (4, _at(3), 'add', '#レビュー中'),
+    (5, _at(4), 'remove', '#作業中'),
+    (6, _at(5), 'add', '#完了'),
+    (7, _at(5), 'remove', '#レビュー中'),
+    (8, _at(6), 'remove', None),
+]
+
+
+@pytest.mark.parametrize('labels, events, expected', [
+    # #ラベルのイベントがない場合は作成時点から現在のKanban Status
+    (['#作業中', 's:backend'], [], [(_at(1), '作業中')]),
+    (['s:backend'], [], []),
+    # 最初のイベントがremoveの#ラベルは作成時から付与されていたもの、複数ある間は最後に付与されたもの
+    (['#完了', 's:backend'], STATUS_EVENTS, [
+        (_at(1), '未着手'), (_at(2), '作業中'), (_at(3), 'レビュー中'), (_at(5), '完了')
+    ]),
+    # すべての#ラベルが外された期間はNone
+    (['#完了'], [
+        (1, _at(2), 'remove', '#未着手'),
+        (2, _at(4), 'add', '#完了'),
+    ], [(_at(1), '未着手'), (_at(2), None), (_at(4), '完了')]),
+    # 作成日時より前のイベント（移行したissueなど）がある場合は最初のイベントの日時から
+    (['#作業中'], [
+        (1, _at(1) - timedelta(days=1), 'remove', '#未着手'),
+        (2, _at(3), 'add', '#作業中'),
+    ], [(_at(1) - timedelta(days=1), '未着手'), (_at(1) - timedelta(days=1), None), (_at(3), '作業中')]),
+])
+def test_build_status_transitions(labels, events, expected):
+    issue = _issue(1, labels, _at(1), _at(6))
+    
+    assert LabelEventService.build_status_transitions(issue, events) == expected
+
+
+def test_initial_labels_from_first_events():
+    issue = _issue(1, ['#完了', 's:backend'], _at(1), _at(6))
+    
+    assert LabelEventService.initial_labels(issue, STATUS_EVENTS) == ['#未着手']
+    assert LabelEventService.initial_labels(issue, []) == ['#完了', 's:backend']
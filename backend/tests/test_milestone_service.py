@@ -0,0 +1,50 @@
+import asyncio
+from app.services.milestone_service import MilestoneService
+
+
+class FakeGitLabClient:
+    url = 'http://gitlab.example.com'
+    project_id = '42'
+    project = None
+    
+    def __init__(self, token: str):
+        self.token = token
+
+
+def test_milestone_cache_is_bounded_by_project_count(monkeypatch):
+    fetched = []
+    service = MilestoneService(cache_seconds=300, max_projects=2)
+    
+    def fetch_milestones(gitlab_client):
+        fetched.append(gitlab_client.token)
+        return [{'title': gitlab_client.token, 'start_date': None, 'due_date': None}]
+    
+    monkeypatch.setattr(service, '_fetch_milestones', fetch_milestones)
+    clients = {token: FakeGitLabClient(token) for token in 'abc'}
+    
+    for token in 'aba':
+        assert asyncio.run(service.get_active_milestones(clients[token]))[0]['title'] == token
+    assert fetched == ['a', 'b']
+    
+    # 上限を超えると最も古く使われたプロジェクトのキャッシュから破棄
+    asyncio.run(service.get_active_milestones(clients['c']))
+    assert len(service._cache) == 2
+    asyncio.run(service.get_active_milestones(clients['a']))
+    asyncio.run(service.get_active_milestones(clients['b']))
+    assert fetched == ['a', 'b', 'c', 'b']
+
+
+def test_expired_milestones_are_fetched_again(monkeypatch):
+    fetched = []
+    service = MilestoneService(cache_seconds=0)
+    
+    def fetch_milestones(gitlab_client):
+        fetched.append(gitlab_client.token)
+        return []
+    
+    monkeypatch.setattr(service, '_fetch_milestones', fetch_milestones)
+    client = FakeGitLabClient('a')
+    
+    asyncio.run(service.get_active_milestones(client))
+    asyncio.run(service.get_active_milestones(client))
+    assert len(fetched) == 2
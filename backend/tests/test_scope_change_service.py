@@ -0,0 +1,115 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List
+import asyncio
+import random
+import uuid
+import pytest
+from app.models.issue import IssueModel
+from app.services.chart_analyzer import ChartAnalyzer
+from app.services.issue_analyzer import issue_analyzer
+from app.services.issue_service import IssueService
+from app.services.label_event_service import LabelEvent, LabelEventService
+from app.services.scope_change_service import ScopeChangeService
+from app.utils.issue_filters import apply_chart_filters
+
+START_DATE = date(2024, 4, 1)
+END_DATE = date(2024, 6, 30)
+LABEL_CHOICES = {
+    '#': ['未着手', '作業中', 'レビュー中', '完了', '不要', 'テンプレート'],
+    's:': ['backend', 'frontend'],
+    '@': ['FY24Q1', 'FY24Q2', 'FY23Q4'],
+    'p:': ['1', '2', '3', '5'],
+}
+
+
+class FakeGitLabClient:
+    url = 'http://gitlab.example.com'
+    project_id = '42'
+    project = None
+    
+    def __init__(self):
+        self.token = uuid.uuid4().hex
+
+
+def _history(issue: IssueModel, rnd: random.Random) -> List[LabelEvent]:
+    """作成時のラベルからランダムにラベルを付け替えたイベント（最後の状態が現在のラベル）"""
+    labels = {prefix: rnd.choice(values) for prefix, values in LABEL_CHOICES.items()}
+    events: List[LabelEvent] = []
+    at = issue.created_at
+    for _ in range(rnd.randint(0, 5)):
+        at += timedelta(days=rnd.randint(0, 20), hours=rnd.randint(0, 23))
+        prefix = rnd.choice(list(LABEL_CHOICES))
+        value = rnd.choice(LABEL_CHOICES[prefix])
+        if value == labels[prefix]:
+            continue
+        events.append((issue.id * 100 + len(events), at, 'remove', prefix + labels[prefix]))
+        events.append((issue.id * 100 + len(events), at, 'add', prefix + value))
+        labels[prefix] = value
+    issue.labels = [prefix + value for prefix, value in labels.items()]
+    issue.updated_at = at
+    return events
+
+
+@pytest.fixture
+def history(monkeypatch, make_issues):
+    rnd = random.Random(5)
+    issues = []
+    events: Dict[int, List[LabelEvent]] = {}
+    for issue in make_issues(80, seed=4):
+        issue = issue.model_copy()
+        events[issue.iid] = _history(issue, rnd)
+        issues.append(issue_analyzer.analyze_issue(issue))
+    
+    monkeypatch.setattr(
+        IssueService, 'fetch_label_events',
+        lambda self, issue_iid, known_count=0: list(events[issue_iid])
+    )
+    return issues, events
+
+
+def _baseline_scope(
+    issues: List[IssueModel],
+    events: Dict[int, List[LabelEvent]],
+    day: date,
+    filters: Dict[str, Any]
+) -> float:
+    """日末時点のラベルで再分析したissueのうち、チャートのスコープ内のポイント合計"""
+    end_of_day = datetime.combine(day, time.max).replace(tzinfo=timezone.utc)
+    scope = 0.0
+    for issue in issues:
+        if issue.created_at > end_of_day:
+            continue
+        labels = LabelEventService.reconstruct_labels(issue, events[issue.iid], end_of_day)
+        state = issue_analyzer.analyze_issue(issue.model_copy(update={'labels': labels}))
+        included, _ = apply_chart_filters([state], START_DATE, END_DATE, filters)
+        if included:
+            scope += included[0].point or 0.0
+    return scope
+
+
+@pytest.mark.parametrize('filters', [{}, {'service': 'backend'}, {'min_point': 2}])
+def test_scope_changes_match_per_day_replay(history, filters):
+    issues, events = history
+    
+    scope_events, fetched = asyncio.run(ScopeChangeService().analyze(
+        FakeGitLabClient(), issues, START_DATE, END_DATE, filters
+    ))
+    columns, summary = ChartAnalyzer().generate_scope_change_columns(scope_events, START_DATE, END_DATE)
+    
+    assert fetched == sum(1 for issue in issues if issue.updated_at >= datetime.combine(START_DATE, time.min, timezone.utc))
+    expected = [_baseline_scope(issues, events, day, filters) for day in columns['dates']]
+    assert columns['scope'] == pytest.approx(expected)
+    assert summary['initial_points'] == pytest.approx(
+        _baseline_scope(issues, events, START_DATE - timedelta(days=1), filters)
+    )
+    
+    # 日別の追加・削除・再見積もりはスコープの増減と一致する
+    previous = summary['initial_points']
+    for added, removed, reestimated, scope in zip(
+        columns['added'], columns['removed'], columns['reestimated'], columns['scope']
+    ):
+        assert added - removed + reestimated == pytest.approx(scope - previous)
+        previous = scope
+    assert summary['final_points'] == pytest.approx(columns['scope'][-1])
+    assert sum(summary['removed_by_reason'].values()) == pytest.approx(summary['removed_points'])
+    assert summary['added_points'] > 0 and summary['removed_points'] > 0
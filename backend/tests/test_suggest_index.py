@@ -0,0 +1,126 @@
+from typing import Any, Dict, List, Tuple
+import random
+import pytest
+from app.models.issue import IssueModel
+from app.services.suggest_index import SuggestIndex, TITLE_KEY_LENGTH
+from app.utils.text_search import normalize_text, TOKEN_PATTERN
+
+LONG_TITLES = [
+    'ログイン画面のセッション管理とリフレッシュトークンの有効期限切れ時の再認証フローを見直す',
+    'ログイン画面のセッション管理とリフレッシュトークンの有効期限切れ時のエラー表示を改善する',
+    'Investigate intermittent timeout in the login API when the session store is under heavy load',
+]
+
+
+def _title_starts(title: str) -> List[int]:
+    starts = set()
+    for match in TOKEN_PATTERN.finditer(title):
+        if match.lastgroup == 'cjk':
+            starts.update(range(match.start(), match.end()))
+        else:
+            starts.add(match.start())
+    return sorted(starts)
+
+
+def _brute_force(issues: List[IssueModel], field: str, prefix: str, limit: int) -> List[Tuple[Any, int]]:
+    """全issueの値・タイトルの開始位置を走査して前方一致する候補を求める"""
+    prefix = normalize_text(prefix)
+    if field == 'title':
+        matches = []
+        for issue in issues:
+            title = normalize_text(issue.title)
+            for start in _title_starts(title):
+                if title.startswith(prefix, start):
+                    matches.append((title[start:start + TITLE_KEY_LENGTH], issue.id, start))
+        suggestions = []
+        for _, issue_id, _ in sorted(matches):
+            if issue_id not in [value for value, _ in suggestions]:
+                suggestions.append((issue_id, 1))
+        return suggestions[:limit]
+    
+    counts: Dict[Tuple[str, Any], int] = {}
+    for issue in issues:
+        values = set(issue.labels) if field == 'label' else [getattr(issue, field)]
+        for value in values:
+            if value and normalize_text(value).startswith(prefix):
+                key = (normalize_text(value), value)
+                counts[key] = counts.get(key, 0) + 1
+    return [(value, count) for (_, value), count in sorted(counts.items())][:limit]
+
+
+def _issues(make_issues) -> List[IssueModel]:
+    issues = make_issues(120, seed=3)
+    for offset, title in enumerate(LONG_TITLES * 2):
+        issues[offset] = issues[offset].model_copy(update={'title': f"{title} {offset}"})
+    return issues
+
+
+def _prefixes(issues: List[IssueModel]) -> List[Tuple[str, str]]:
+    rnd = random.Random(7)
+    prefixes = [
+        ('title', ''), ('title', 'ログ'), ('title', 'ﾛｸﾞｲﾝ'), ('title', 'ろぐいん'), ('title', 'セッション管理'),
+        ('title', 'login'), ('title', 'LOGIN API'), ('title', 'zzz'),
+        ('label', '#'), ('label', 's:'), ('label', '@fy24'), ('service', 'b'), ('assignee', 'ｓ'),
+        ('milestone', 'v'), ('quarter', 'FY'), ('kanban_status', '作'), ('kanban_status', 'さぎょう'),
+    ]
+    # キーの最大長より長い入力（キーの範囲では同じで、それ以降が異なるタイトルを含む）
+    for title in LONG_TITLES:
+        for start in (0, 4, 10):
+            for length in (TITLE_KEY_LENGTH - 1, TITLE_KEY_LENGTH, TITLE_KEY_LENGTH + 1, TITLE_KEY_LENGTH + 12, 200):
+                prefixes.append(('title', title[start:start + length]))
+    for _ in range(40):
+        title = normalize_text(rnd.choice(issues).title)
+        start = rnd.choice(_title_starts(title))
+        prefixes.append(('title', title[start:start + rnd.randint(1, 50)]))
+    return prefixes
+
+
+@pytest.mark.parametrize('limit', [1, 5, 1000])
+def test_suggest_matches_brute_force(make_issues, limit):
+    issues = _issues(make_issues)
+    index = SuggestIndex()
+    for issue in issues:
+        index.add(issue, sort=False)
+    index.sort()
+    
+    for field, prefix in _prefixes(issues):
+        assert index.suggest(field, prefix, limit) == _brute_force(issues, field, prefix, limit), (field, prefix)
+
+
+def test_suggest_follows_updates_and_removals(make_issues):
+    issues = _issues(make_issues)
+    index = SuggestIndex()
+    for issue in issues:
+        index.add(issue)
+    
+    rnd = random.Random(11)
+    current = {issue.id: issue for issue in issues}
+    for step in range(60):
+        issue = current[rnd.choice(list(current))]
+        index.remove(issue)
+        if step % 4 == 0:
+            del current[issue.id]
+            continue
+        updated = issue.model_copy(update={
+            'title': rnd.choice(LONG_TITLES) + f" {step}",
+            'assignee': rnd.choice(['佐藤', 'Suzuki', None]),
+            'labels': rnd.sample(issue.labels, len(issue.labels) - 1)
+        })
+        index.add(updated)
+        current[updated.id] = updated
+    
+    for field, prefix in _prefixes(list(current.values())):
+        assert index.suggest(field, prefix, 1000) == _brute_force(list(current.values()), field, prefix, 1000), (field, prefix)
+
+
+def test_title_keys_are_bounded():
+    title = 'あ' * 2000
+    index = SuggestIndex()
+    index.add(IssueModel(id=1, iid=1, title=title, description='', state='opened', created_at='2024-04-01T00:00:00Z'))
+    
+    keys = index._fields['title']._keys
+    assert len(keys) == len(title)
+    assert max(len(key) for key, _ in keys) == TITLE_KEY_LENGTH
+    assert index.suggest('title', 'あ' * 1500) == [(1, 1)]
+    assert index.suggest('title', 'あ' * 2001) == []
+
@@ -0,0 +1,214 @@
+from datetime import datetime, timezone
+import math
+import pytest
+from app.models.issue import IssueModel
+from app.services.text_index import (
+    BM25_B,
+    BM25_K1,
+    FUZZY_MIN_TOKEN_LENGTH,
+    FUZZY_MIN_TOKEN_RATIO,
+    FUZZY_SCORE_WEIGHT,
+    TITLE_WEIGHT,
+    TextIndex
+)
+from app.utils.text_search import contains_all_terms, edit_distance, normalize_text, split_search_terms, tokenize
+
+QUERIES = [
+    'login', 'LOGIN api', 'ログイン', 'ろぐいん', 'api エラー', 'fix bug', 'review', 'ﾃｽﾄ', 'テスト',
+    '半角', '画', 'o', 'in', 'descr', 'データ', '設計 データ', 'xyz', 'search index flow'
+]
+FUZZY_QUERIES = ['reveiw', 'logn', 'serch indx', 'descripton', 'englsh descriptoin', 'timout api']
+
+
+def _extra_issues():
+    created_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    texts = [
+        ('ﾃﾞｰﾀ 設計の見直し', 'データ設計レビュー'),
+        ('Search index review', 'review the search index and review flow'),
+        ('ＡＰＩ timeout', 'APIのtimeoutを延長する')
+    ]
+    return [
+        IssueModel(id=9000 + i, iid=9000 + i, title=title, description=description, state='opened', created_at=created_at)
+        for i, (title, description) in enumerate(texts)
+    ]
+
+
+def _build(issues, cjk_bigrams=True):
+    index = TextIndex(cjk_bigrams=cjk_bigrams)
+    for issue in issues:
+        index.add(issue)
+    return index
+
+
+def _doc_tokens(issue):
+    """issueのトークン → 出現位置 (項目, 開始位置, 終了位置) のリスト（正規化済みテキスト上）"""
+    positions = {}
+    for field, text in enumerate((normalize_text(issue.title), normalize_text(issue.description))):
+        for token, begin, end in tokenize(text):
+            positions.setdefault(token, []).append((field, begin, end))
+    return positions
+
+
+def _trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def _is_similar(token, candidate):
+    if candidate == token:
+        return True
+    if len(token) < FUZZY_MIN_TOKEN_LENGTH or not _trigrams(token) & _trigrams(candidate):
+        return False
+    limit = 1 if len(token) <= 5 else 2
+    return edit_distance(token, candidate, limit) <= limit
+
+
+def _brute_fuzzy_search(issues, search):
+    selected = set()
+    for issue in issues:
+        tokens = _doc_tokens(issue)
+        matched = True
+        for term in split_search_terms(search):
+            if contains_all_terms([term], issue.title, issue.description):
+                continue
+            term_tokens = {token for token, _, _ in tokenize(term)}
+            hits = sum(1 for token in term_tokens if any(_is_similar(token, other) for other in tokens))
+            if not term_tokens or hits < math.ceil(len(term_tokens) * FUZZY_MIN_TOKEN_RATIO):
+                matched = False
+                break
+        if matched:
+            selected.add(issue.id)
+    return selected
+
+
+def _expansions(issues, token, fuzzy):
+    """検索語のトークンに一致するトークン → 重み（部分一致は3文字以上のトークンのみ）"""
+    vocabulary = {other for issue in issues for other in _doc_tokens(issue)}
+    weights = {other: FUZZY_SCORE_WEIGHT for other in vocabulary if fuzzy and _is_similar(token, other)}
+    weights.update({other: 1.0 for other in vocabulary if token == other or (len(token) >= 3 and token in other)})
+    return weights
+
+
+def _brute_scores(issues, search, fuzzy):
+    """BM25を全issueのトークンから素朴に計算"""
+    docs = {issue.id: _doc_tokens(issue) for issue in issues}
+    lengths = {
+        issue_id: sum(TITLE_WEIGHT if field == 0 else 1.0 for entries in tokens.values() for field, _, _ in entries)
+        for issue_id, tokens in docs.items()
+    }
+    average_length = sum(lengths.values()) / len(docs) or 1.0
+    
+    scores = {issue_id: 0.0 for issue_id in docs}
+    for term in split_search_terms(search):
+        for query_token in {token for token, _, _ in tokenize(term)}:
+            best = {}
+            for token, weight in _expansions(issues, query_token, fuzzy).items():
+                containing = [issue_id for issue_id, tokens in docs.items() if token in tokens]
+                idf = math.log(1 + (len(docs) - len(containing) + 0.5) / (len(containing) + 0.5))
+                for issue_id in containing:
+                    frequency = sum(TITLE_WEIGHT if field == 0 else 1.0 for field, _, _ in docs[issue_id][token])
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[issue_id] / average_length)
+                    value = weight * idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                    best[issue_id] = max(best.get(issue_id, 0.0), value)
+            for issue_id, value in best.items():
+                scores[issue_id] += value
+    return scores
+
+
+@pytest.fixture
+def issues(make_issues):
+    return make_issues(150, seed=31) + _extra_issues()
+
+
+@pytest.mark.parametrize('cjk_bigrams', [True, False])
+def test_search_matches_substring_scan(issues, cjk_bigrams):
+    index = _build(issues, cjk_bigrams)
+    for query in QUERIES:
+        expected = {
+            issue.id for issue in issues
+            if contains_all_terms(split_search_terms(query), issue.title, issue.description)
+        }
+        assert index.search(query) == expected, query
+    assert index.search('  ') is None
+    
+    # 更新・削除後も同じ結果
+    for issue in issues[::4]:
+        index.remove(issue.id)
+    renamed = [issue.model_copy(update={'title': 'ログイン review'}) for issue in issues[1::4]]
+    for issue in renamed:
+        index.remove(issue.id)
+        index.add(issue)
+    renamed_ids = {issue.id for issue in renamed}
+    remaining = [issue for issue in issues[1:] if issue.id not in renamed_ids and issue not in issues[::4]] + renamed
+    for query in QUERIES:
+        expected = {
+            issue.id for issue in remaining
+            if contains_all_terms(split_search_terms(query), issue.title, issue.description)
+        }
+        assert index.search(query) == expected, query
+
+
+def test_fuzzy_search_matches_brute_force(issues):
+    index = _build(issues)
+    for query in FUZZY_QUERIES + QUERIES:
+        assert index.search(query, fuzzy=True) == _brute_fuzzy_search(issues, query), query
+    assert 9001 in index.search('reveiw', fuzzy=True)
+    assert index.search('reveiw') == set()
+
+
+@pytest.mark.parametrize('fuzzy', [False, True])
+def test_bm25_scores_match_brute_force(issues, fuzzy):
+    index = _build(issues)
+    all_ids = {issue.id for issue in issues}
+    for query in QUERIES + FUZZY_QUERIES:
+        expected = _brute_scores(issues, query, fuzzy)
+        assert index.score(all_ids, query, fuzzy=fuzzy) == pytest.approx(expected), query
+
+
+def test_title_matches_rank_above_description_matches():
+    created_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    issues = [
+        IssueModel(id=1, iid=1, title='review', description='other words here', state='opened', created_at=created_at),
+        IssueModel(id=2, iid=2, title='other words here', description='review', state='opened', created_at=created_at),
+        IssueModel(id=3, iid=3, title='unrelated', description='nothing', state='opened', created_at=created_at)
+    ]
+    scores = _build(issues).score({1, 2, 3}, 'review')
+    assert scores[1] > scores[2] > 0
+    assert scores[3] == 0.0
+
+
+def test_highlights_map_back_to_original_text(issues):
+    index = _build(issues)
+    for query in QUERIES + FUZZY_QUERIES:
+        fuzzy = query in FUZZY_QUERIES
+        matched = index.search(query, fuzzy=fuzzy)
+        for issue in issues:
+            if issue.id not in matched:
+                continue
+            tokens = _doc_tokens(issue)
+            ranges = []
+            for term in split_search_terms(query):
+                for query_token in {token for token, _, _ in tokenize(term)}:
+                    for token in _expansions(issues, query_token, fuzzy):
+                        ranges.extend(tokens.get(token, ()))
+            merged = []
+            for field, begin, end in sorted(ranges):
+                if merged and merged[-1][0] == field and begin <= merged[-1][2]:
+                    merged[-1][2] = max(merged[-1][2], end)
+                else:
+                    merged.append([field, begin, end])
+            
+            highlights = index.highlights(issue.id, query, fuzzy=fuzzy)
+            assert len(highlights) == len(merged), (query, issue.id)
+            for highlight, (field, begin, end) in zip(highlights, merged):
+                original = issue.title if field == 0 else issue.description
+                normalized = normalize_text(original)
+                assert highlight['field'] == ('title' if field == 0 else 'description')
+                assert normalize_text(original[highlight['start']:highlight['end']]) == normalized[begin:end]
+
+
+def test_highlight_positions_for_width_normalized_kana():
+    index = _build(_extra_issues())
+    highlights = index.highlights(9000, 'データ')
+    assert {'field': 'title', 'start': 0, 'end': 4} in highlights
+    assert 'ﾃﾞｰﾀ 設計の見直し'[0:4] == 'ﾃﾞｰﾀ'
+    assert {'field': 'description', 'start': 0, 'end': 3} in highlights
@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+import random
+import unicodedata
+import pytest
+from app.models.issue import IssueModel
+from app.services.text_index import TextIndex
+from app.utils.text_search import contains_all_terms, normalize_text, normalize_with_offsets, split_search_terms
+
+# 幅・カナの揺れ、合成される濁点、正規化で文字数が変わる文字、文脈で小文字が変わる文字
+PIECES = [
+    'a', 'Z', ' ', 'login', 'ＡＢ', 'ｶﾞ', 'ｶ', 'ﾞ', 'ﾟ', 'ﾊﾟ', 'ガ', 'か', '゙', 'é', 'é',
+    'ﬁ', '㍻', 'Ⅻ', 'ß', 'İ', '①', '㌔', 'ｰ', 'ー', 'ヽ', 'ヾ', 'ヷ', 'ゔ', '漢字', '😀', '　',
+    'ᄀ', 'ᅡ', 'ㄱ', 'ㅏ', '℃', '½', 'Σ', 'σ', 'ς', 'ΟΔΟΣ', 'Å', 'K',
+]
+KATAKANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+KATAKANA.update({0x30FD: 0x309D, 0x30FE: 0x309E})
+
+
+def _reference_fold(text: str) -> str:
+    """テキスト全体を一度に正規化（NFKC・小文字化・カタカナのひらがな化・ς → σ）"""
+    return unicodedata.normalize('NFKC', text).lower().translate(KATAKANA).replace('ς', 'σ')
+
+
+def _random_texts(count: int, seed: int):
+    rnd = random.Random(seed)
+    return [''.join(rnd.choice(PIECES) for _ in range(rnd.randint(1, 12))) for _ in range(count)]
+
+
+def test_normalize_text_matches_whole_text_folding():
+    for text in _random_texts(5000, seed=1):
+        assert normalize_text(text) == _reference_fold(text), repr(text)
+
+
+def test_offsets_map_back_to_original_text():
+    for text in _random_texts(2000, seed=2):
+        normalized, offsets = normalize_with_offsets(text)
+        if offsets is None:
+            assert len(normalized) == len(text)
+            continue
+        
+        starts, ends = offsets
+        assert len(starts) == len(ends) == len(normalized)
+        assert starts == sorted(starts) and ends == sorted(ends)
+        for position, char in enumerate(normalized):
+            assert char in _reference_fold(text[starts[position]:ends[position]]), (repr(text), position)
+
+
+@pytest.mark.parametrize('text, query', [
+    ('ΟΔΟΣ の修正', 'οδοσ'),
+    ('ΟΔΟΣ の修正', 'ΟΔΟΣ'),
+    ('ｶﾞｲﾄﾞ 更新', 'ガイド'),
+    ('ｶﾞｲﾄﾞ 更新', 'がいど'),
+    ('ガイド更新', 'ｶﾞｲﾄﾞ'),
+    ('ＡＰＩ㌔ timeout', 'api きろ'),
+    ('平成の改修', '㍻'),
+])
+def test_width_and_kana_variants_match(text, query):
+    issue = IssueModel(
+        id=1, iid=1, title=text, description='', state='opened',
+        created_at=datetime(2024, 4, 1, tzinfo=timezone.utc)
+    )
+    index = TextIndex()
+    index.add(issue)
+    
+    assert contains_all_terms(split_search_terms(query), issue.title, issue.description)
+    assert index.search(query) == {1}
@@ -109,23 +109,16 @@ export const ChartSection = ({ period, issues, loading, onPeriodChange, issueFil
         completed_before: issueFilters.completed_at_to || undefined
       } : undefined
       
-      const [burnDown, burnUp] = await Promise.all([
-        chartsApi.getBurnDownData(
-          issueFilters?.milestone || undefined,
-          period.start,
-          period.end,
-          chartFilters
-        ),
-        chartsApi.getBurnUpData(
-          issueFilters?.milestone || undefined,
-          period.start,
-          period.end,
-          chartFilters
-        )
-      ])
+      // Burn-down/Burn-upを1リクエストで取得（バックエンドのフィルタ処理は1回）
+      const dashboard = await chartsApi.getDashboardData(
+        issueFilters?.milestone || undefined,
+        period.start,
+        period.end,
+        chartFilters
+      )
       
-      setBurnDownData(burnDown.chart_data)
-      setBurnUpData(burnUp.chart_data)
+      setBurnDownData(dashboard.burn_down)
+      setBurnUpData(dashboard.burn_up)
     } catch (error) {
       console.error('チャートデータ取得エラー:', error)
       setError('チャートデータの取得に失敗しました')
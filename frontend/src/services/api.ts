@@ -1,5 +1,5 @@
 import axios from 'axios'
-import { Issue, BurnChartResponse, VelocityResponse } from '../types/api'
+import { Issue, BurnChartResponse, DashboardChartResponse, VelocityResponse } from '../types/api'
 import { getApiUrl } from '../config/env'
 
 const API_BASE_URL = getApiUrl() ? `${getApiUrl()}/api` : '/api'
@@ -190,6 +190,36 @@ export const chartsApi = {
     return response.data
   },
   
+  getDashboardData: async (
+    milestone: string | undefined,
+    startDate: string,
+    endDate: string,
+    filters?: {
+      service?: string
+      assignee?: string
+      kanban_status?: string
+      state?: string
+      is_epic?: string
+      point_min?: number
+      point_max?: number
+      search?: string
+      created_after?: string
+      created_before?: string
+      completed_after?: string
+      completed_before?: string
+    }
+  ): Promise<DashboardChartResponse> => {
+    const params: any = { start_date: startDate, end_date: endDate }
+    if (milestone) {
+      params.milestone = milestone
+    }
+    if (filters) {
+      Object.assign(params, filters)
+    }
+    const response = await api.get('/charts/dashboard', { params })
+    return response.data
+  },
+  
   getVelocityData: async (weeks: number = 12): Promise<VelocityResponse> => {
     const response = await api.get('/charts/velocity', {
       params: { weeks }
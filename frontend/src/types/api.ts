@@ -74,4 +74,17 @@ export interface VelocityResponse {
   velocity_data: VelocityData[]
   average_velocity: number
   weeks_analyzed: number
-}
\ No newline at end of file
+}
+
+export interface DashboardChartResponse {
+  burn_down: ChartData[]
+  burn_up: ChartData[]
+  velocity: VelocityData[]
+  metadata: BurnChartResponse['metadata']
+  statistics: {
+    burn_down: BurnChartResponse['statistics']
+    burn_up: BurnChartResponse['statistics']
+    average_velocity: number
+  }
+  warnings?: BurnChartResponse['warnings']
+}